@@ -0,0 +1,62 @@
+"""
+Compare phone number validation with and without the E.164 fast path.
+
+Run with `python benchmarks/e164_validation.py [count]`.
+"""
+
+import random
+import sys
+import time
+from collections.abc import Callable, Sequence
+
+import phonenumbers
+
+from contiguity._phone import PhoneNumberNormalizer
+
+
+def phonenumbers_only(number: str) -> bool:
+    try:
+        return phonenumbers.is_valid_number(phonenumbers.parse(number, None))
+    except phonenumbers.NumberParseException:
+        return False
+
+
+def mixed_numbers(count: int, *, seed: int = 0) -> list[str]:
+    """Mostly strict E.164 numbers, with some invalid and some loosely formatted ones."""
+    rng = random.Random(seed)  # noqa: S311
+    examples = [
+        phonenumbers.format_number(example, phonenumbers.PhoneNumberFormat.E164)
+        for region in ("US", "CA", "GB", "DE", "FR", "BR", "IN", "AU")
+        if (example := phonenumbers.example_number_for_type(region, phonenumbers.PhoneNumberType.MOBILE))
+    ]
+    numbers = []
+    for _ in range(count):
+        example = rng.choice(examples)
+        number = example[:-4] + "".join(str(rng.randrange(10)) for _ in range(4))
+        roll = rng.random()
+        if roll < 0.1:  # noqa: PLR2004
+            number = f"{number[:2]} {number[2:5]} {number[5:]}"
+        elif roll < 0.2:  # noqa: PLR2004
+            number = number[:-3]
+        numbers.append(number)
+    return numbers
+
+
+def bench(name: str, validate: Callable[[str], bool], numbers: Sequence[str]) -> None:
+    start = time.perf_counter()
+    valid = sum(map(validate, numbers))
+    elapsed = time.perf_counter() - start
+    print(f"{name:<28} {elapsed:8.2f}s {len(numbers) / elapsed:>12,.0f}/s  valid={valid:,}")
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    numbers = mixed_numbers(count)
+    print(f"{count:,} numbers, {len(set(numbers)):,} unique")
+    bench("phonenumbers only", phonenumbers_only, numbers)
+    bench("fast path, no cache", PhoneNumberNormalizer(maxsize=0).is_valid, numbers)
+    bench("fast path, LRU cache", PhoneNumberNormalizer().is_valid, numbers)
+
+
+if __name__ == "__main__":
+    main()
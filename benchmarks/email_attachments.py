@@ -0,0 +1,69 @@
+"""
+Compare peak memory of streamed and in-memory email attachments.
+
+Run with `python benchmarks/email_attachments.py`.
+The in-memory baseline reads each file, base64-encodes it and encodes the payload as JSON,
+as a caller would without `attachments` support. The streamed body is consumed chunk by chunk,
+as httpx does when sending it.
+"""
+
+import base64
+import os
+import tempfile
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+import msgspec
+
+from contiguity._attachments import StreamingBody
+
+SIZES_MB = (1, 5, 10, 25)
+PREFIX = b'{"to":"user@example.com","from":"Contiguity","subject":"Report","body":{"text":"Attached."},"attachments":'
+SUFFIX = b"}"
+
+
+def in_memory(path: Path) -> int:
+    payload = {
+        "to": "user@example.com",
+        "from": "Contiguity",
+        "subject": "Report",
+        "body": {"text": "Attached."},
+        "attachments": [
+            {
+                "filename": path.name,
+                "content_type": "application/octet-stream",
+                "content": base64.b64encode(path.read_bytes()).decode(),
+            },
+        ],
+    }
+    return len(msgspec.json.encode(payload))
+
+
+def streamed(path: Path) -> int:
+    return sum(len(chunk) for chunk in StreamingBody(PREFIX, [path], SUFFIX))
+
+
+def measure(func: Callable[[Path], int], path: Path) -> tuple[int, int]:
+    tracemalloc.start()
+    size = func(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, peak
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        for size_mb in SIZES_MB:
+            path = Path(directory) / f"attachment-{size_mb}mb.bin"
+            path.write_bytes(os.urandom(size_mb * 1024 * 1024))
+            for func in (in_memory, streamed):
+                body_size, peak = measure(func, path)
+                print(
+                    f"{size_mb:>3} MB {func.__name__:<10} body={body_size / 2**20:>6.1f} MiB "
+                    f"peak={peak / 2**20:>7.2f} MiB",
+                )
+
+
+if __name__ == "__main__":
+    main()
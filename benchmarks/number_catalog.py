@@ -0,0 +1,100 @@
+"""
+Compare filtered lookups in an indexed `NumberCatalog` with scanning the list of available numbers.
+
+Run with `python benchmarks/number_catalog.py [count]`.
+"""
+
+import random
+import sys
+import time
+from collections.abc import Callable
+
+import msgspec
+
+from contiguity.catalog import NumberCatalog
+from contiguity.leases import NumberDetails
+
+REGIONS = {"US": ["CA", "NY", "TX", "WA", "FL"], "CA": ["ON", "BC", "QC"], "GB": ["ENG", "SCT"]}
+CARRIERS = ["T-Mobile", "AT&T", "Verizon", "Twilio"]
+
+
+def make_numbers(count: int, *, seed: int = 0) -> list[NumberDetails]:
+    rng = random.Random(seed)  # noqa: S311
+    numbers = []
+    for i in range(count):
+        country = rng.choice(list(REGIONS))
+        region = rng.choice(REGIONS[country])
+        number = {
+            "id": f"+1{i:010d}",
+            "status": "available",
+            "number": {"e164": f"+1{i:010d}", "formatted": f"+1{i:010d}"},
+            "location": {"country": country, "region": region, "city": f"{region} City {rng.randrange(10)}"},
+            "carrier": rng.choice(CARRIERS),
+            "capabilities": {"intl_sms": rng.random() < 0.5, "channels": rng.sample(["sms", "mms", "imessage"], 2)},  # noqa: PLR2004
+            "health": {"reputation": rng.random(), "previous_owners": rng.randrange(3)},
+            "data": {"requirements": [], "e911_capable": False},
+            "created_at": 0,
+            "pricing": {"currency": "USD", "upfront_fee": 0.0, "monthly_rate": round(rng.uniform(1, 20), 2)},
+            "lease_id": None,
+            "lease_status": None,
+            "billing": None,
+        }
+        numbers.append(msgspec.convert(number, NumberDetails))
+    return numbers
+
+
+def scan(numbers: list[NumberDetails]) -> list[NumberDetails]:
+    matches = [
+        n
+        for n in numbers
+        if n.location.country == "US"
+        and n.location.region == "WA"
+        and n.carrier == "AT&T"
+        and "imessage" in n.capabilities.channels
+        and n.pricing.monthly_rate <= 10  # noqa: PLR2004
+    ]
+    return sorted(matches, key=lambda n: n.pricing.monthly_rate)[:10]
+
+
+def bench(name: str, lookup: Callable[[], list[NumberDetails]], rounds: int = 1000) -> None:
+    found: list[NumberDetails] = []
+    start = time.perf_counter()
+    for _ in range(rounds):
+        found = lookup()
+    elapsed = (time.perf_counter() - start) / rounds
+    print(f"{name:<16} {elapsed * 1e6:10.1f}µs  found={len(found)}")
+
+
+class _StaticLeases:
+    def __init__(self, numbers: list[NumberDetails]) -> None:
+        self.numbers = numbers
+
+    def get_available_numbers(self) -> list[NumberDetails]:
+        return self.numbers
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    numbers = make_numbers(count)
+    catalog = NumberCatalog(_StaticLeases(numbers))  # type: ignore[arg-type]
+    start = time.perf_counter()
+    catalog.refresh()
+    print(f"{count:,} numbers, indexed in {time.perf_counter() - start:.2f}s")
+    bench("scan", lambda: scan(numbers), rounds=20)
+    bench(
+        "catalog",
+        lambda: catalog.find(
+            country="US",
+            region="WA",
+            carrier="AT&T",
+            channels=["imessage"],
+            max_monthly_rate=10,
+            sort_by="monthly_rate",
+            limit=10,
+        ),
+    )
+    bench("catalog, cheap", lambda: catalog.find(sort_by="monthly_rate", limit=10))
+
+
+if __name__ == "__main__":
+    main()
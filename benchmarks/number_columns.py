@@ -0,0 +1,84 @@
+"""
+Compare the memory and aggregation speed of `NumberColumns` with a list of `NumberDetails`.
+
+Run with `python benchmarks/number_columns.py [count]`.
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from collections.abc import Callable
+
+import msgspec
+
+from contiguity.columns import NumberColumns
+from contiguity.leases import NumberDetails
+
+REGIONS = {"US": ["CA", "NY", "TX", "WA", "FL"], "CA": ["ON", "BC", "QC"], "GB": ["ENG", "SCT"]}
+
+
+def make_payload(count: int, *, seed: int = 0) -> bytes:
+    rng = random.Random(seed)  # noqa: S311
+    numbers = []
+    for i in range(count):
+        country = rng.choice(list(REGIONS))
+        region = rng.choice(REGIONS[country])
+        numbers.append(
+            {
+                "id": f"+1{i:010d}",
+                "status": "available",
+                "number": {"e164": f"+1{i:010d}", "formatted": f"+1{i:010d}"},
+                "location": {"country": country, "region": region, "city": f"{region} City {rng.randrange(10)}"},
+                "carrier": rng.choice(["T-Mobile", "AT&T", "Verizon"]),
+                "capabilities": {"intl_sms": False, "channels": ["sms", "mms"]},
+                "health": {"reputation": rng.random(), "previous_owners": rng.randrange(3)},
+                "data": {"requirements": [], "e911_capable": False},
+                "created_at": 0,
+                "pricing": {"currency": "USD", "upfront_fee": 0.0, "monthly_rate": round(rng.uniform(1, 20), 2)},
+                "lease_id": None,
+                "lease_status": None,
+                "billing": None,
+            },
+        )
+    return msgspec.json.encode(numbers)
+
+
+def mean_by_region(numbers: list[NumberDetails]) -> dict[str, float]:
+    totals: defaultdict[str, float] = defaultdict(float)
+    counts: defaultdict[str, int] = defaultdict(int)
+    for number in numbers:
+        if number.health.reputation >= 0.5:  # noqa: PLR2004
+            totals[number.location.region] += number.pricing.monthly_rate
+            counts[number.location.region] += 1
+    return {region: totals[region] / counts[region] for region in totals}
+
+
+def bench(name: str, func: Callable[[], object], rounds: int = 10) -> None:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    print(f"{name:<10} {min(timings) * 1e3:8.2f}ms")
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    payload = make_payload(count)
+
+    tracemalloc.start()
+    numbers = msgspec.json.decode(payload, type=list[NumberDetails])
+    structs_memory = tracemalloc.get_traced_memory()[0]
+    columns = NumberColumns.from_numbers(numbers)
+    columns_memory = tracemalloc.get_traced_memory()[0] - structs_memory
+    tracemalloc.stop()
+    print(f"{count:,} numbers: structs {structs_memory / 2**20:.1f} MiB, columns {columns_memory / 2**20:.1f} MiB")
+
+    bench("structs", lambda: mean_by_region(numbers))
+    bench("columns", lambda: columns.where(min_reputation=0.5).mean_by("monthly_rate", "region"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Compare memory held by phone number metadata with and without an allowed-region set.
+
+Run with `python benchmarks/phone_metadata_memory.py`.
+Each configuration runs in a fresh interpreter so that previously loaded metadata does not skew results.
+"""
+
+import random
+import resource
+import subprocess
+import sys
+import tracemalloc
+
+from phonenumbers import COUNTRY_CODE_TO_REGION_CODE
+
+from contiguity._phone import PhoneNumberNormalizer
+
+ALLOWED_REGIONS = ("US", "CA", "GB")
+
+
+def run(regions: tuple[str, ...] | None) -> None:
+    rng = random.Random(0)  # noqa: S311
+    numbers = [f"+{code}{rng.randrange(10**9, 10**10)}" for code in COUNTRY_CODE_TO_REGION_CODE for _ in range(100)]
+    tracemalloc.start()
+    normalizer = PhoneNumberNormalizer(maxsize=0, regions=regions)
+    valid = sum(map(normalizer.is_valid, numbers))
+    current, _ = tracemalloc.get_traced_memory()
+    loaded = sum(module.startswith("phonenumbers.data.region_") for module in sys.modules)
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    label = ",".join(regions) if regions else "all regions"
+    print(
+        f"{label:<12} valid={valid:<6,} region modules={loaded:<4} "
+        f"traced={current / 1024:>8,.0f} KiB max RSS={max_rss:>8,} KiB",
+    )
+
+
+def main() -> None:
+    if len(sys.argv) > 1:
+        run(tuple(sys.argv[1].split(",")) if sys.argv[1] != "-" else None)
+        return
+    for argument in ("-", ",".join(ALLOWED_REGIONS)):
+        subprocess.run([sys.executable, __file__, argument], check=True)  # noqa: S603
+
+
+if __name__ == "__main__":
+    main()
@@ -1,46 +1,81 @@
+from collections.abc import Collection
 from importlib.metadata import version
 
 from ._auth import get_contiguity_token
 from ._client import ApiClient
+from ._phone import PhoneNumberNormalizer
+from ._template import MessageTemplate
+from .capabilities import CapabilityCache
+from .catalog import CatalogWatcher, NumberCatalog
+from .columns import NumberColumns
+from .dedup import DedupStore
+from .dispatcher import ConversationDispatcher
 from .domains import Domains
 from .email import Email
 from .imessage import IMessage
 from .leases import Leases
 from .otp import OTP
+from .otp_sessions import OTPSessionStore
+from .response_cache import ResponseCache
+from .router import MessageRouter
+from .senders import SenderPool
+from .suppression import SuppressionList
 from .text import Text
+from .verify import Verify
 from .whatsapp import WhatsApp
 
 
 class Contiguity:
     """The Contiguity client."""
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         *,
         token: str | None = None,
         base_url: str = "https://api.contiguity.com",
+        allowed_regions: Collection[str] | None = None,
+        dedup: DedupStore | None = None,
+        suppression: SuppressionList | None = None,
+        capabilities: CapabilityCache | None = None,
+        response_cache: ResponseCache | None = None,
     ) -> None:
         self.token = token or get_contiguity_token()
         self.base_url = base_url
-        self.client = ApiClient(base_url=self.base_url, api_key=self.token.strip())
+        self.client = ApiClient(base_url=self.base_url, api_key=self.token.strip(), response_cache=response_cache)
+        self.phone_numbers = PhoneNumberNormalizer(regions=allowed_regions)
 
-        self.text = Text(client=self.client)
-        self.email = Email(client=self.client)
-        self.otp = OTP(client=self.client)
-        self.imessage = IMessage(client=self.client)
-        self.whatsapp = WhatsApp(client=self.client)
+        self.text = Text(client=self.client, phone_numbers=self.phone_numbers, dedup=dedup, suppression=suppression)
+        self.email = Email(client=self.client, dedup=dedup, suppression=suppression)
+        self.otp = OTP(client=self.client, phone_numbers=self.phone_numbers)
+        self.capabilities = capabilities or CapabilityCache(phone_numbers=self.phone_numbers)
+        self.imessage = IMessage(client=self.client, dedup=dedup, capabilities=self.capabilities)
+        self.whatsapp = WhatsApp(client=self.client, dedup=dedup, capabilities=self.capabilities)
         self.leases = Leases(client=self.client)
         self.domains = Domains(client=self.client)
+        self.verify = Verify(phone_numbers=self.phone_numbers)
 
 
 __all__ = (
     "OTP",
+    "CapabilityCache",
+    "CatalogWatcher",
     "Contiguity",
+    "ConversationDispatcher",
     "Domains",
     "Email",
     "IMessage",
     "Leases",
+    "MessageRouter",
+    "MessageTemplate",
+    "NumberCatalog",
+    "NumberColumns",
+    "OTPSessionStore",
+    "PhoneNumberNormalizer",
+    "ResponseCache",
+    "SenderPool",
+    "SuppressionList",
     "Text",
+    "Verify",
     "WhatsApp",
 )
 __version__ = version("contiguity")
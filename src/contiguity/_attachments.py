@@ -0,0 +1,99 @@
+import base64
+import mimetypes
+import mmap
+from collections.abc import Iterator, Sequence
+from os import PathLike
+from pathlib import Path
+
+import msgspec
+from msgspec import Struct
+
+# A multiple of 3, so that base64-encoded chunks concatenate without padding in between.
+ENCODE_CHUNK_SIZE = 3 * 256 * 1024
+
+
+class EmailAttachment(Struct, frozen=True):
+    path: str | PathLike[str]
+    """Path of the local file to attach."""
+    filename: str | None = None
+    """Name of the attachment. Defaults to the file's name."""
+    content_type: str | None = None
+    """MIME type of the attachment. Guessed from the filename by default."""
+
+
+def _base64_length(size: int) -> int:
+    return 4 * ((size + 2) // 3)
+
+
+class _PreparedAttachment:
+    def __init__(self, attachment: EmailAttachment | str | PathLike[str]) -> None:
+        if not isinstance(attachment, EmailAttachment):
+            attachment = EmailAttachment(path=attachment)
+        self.path = Path(attachment.path)
+        stat = self.path.stat()
+        self.size = stat.st_size
+        filename = attachment.filename or self.path.name
+        content_type = attachment.content_type or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        # Encode the object with an empty "content" string and cut before its closing quote,
+        # so the base64 data can be streamed straight after the header.
+        encoded = msgspec.json.encode({"filename": filename, "content_type": content_type, "content": ""})
+        self.header = encoded[: -len(b'"}')]
+        self.length = len(self.header) + _base64_length(self.size) + len(b'"}')
+        self.fingerprint = b"%s:%s:%d:%d" % (self.header, bytes(self.path.resolve()), self.size, stat.st_mtime_ns)
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield self.header
+        if self.size:
+            with self.path.open("rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if len(mapped) != self.size:
+                    msg = f"attachment {str(self.path)!r} changed while it was being sent"
+                    raise ValueError(msg)
+                view = memoryview(mapped)
+                try:
+                    for start in range(0, self.size, ENCODE_CHUNK_SIZE):
+                        yield base64.b64encode(view[start : start + ENCODE_CHUNK_SIZE])
+                finally:
+                    view.release()
+        yield b'"}'
+
+
+class StreamingBody:
+    """
+    A JSON request body whose attachments are read and base64-encoded while it is being sent.
+
+    Files are memory-mapped and encoded in fixed-size chunks, so an attachment is never held in memory
+    as a whole, whether as raw bytes, base64 or JSON. The total `length` is known up front,
+    so the request is sent with a `Content-Length` header rather than chunked encoding.
+    """
+
+    def __init__(
+        self,
+        prefix: bytes,
+        attachments: Sequence[EmailAttachment | str | PathLike[str]],
+        suffix: bytes,
+    ) -> None:
+        self._prefix = prefix
+        self._suffix = suffix
+        self._attachments = [_PreparedAttachment(attachment) for attachment in attachments]
+        self.length = (
+            len(prefix)
+            + len(suffix)
+            + len(b"[]")
+            + sum(attachment.length for attachment in self._attachments)
+            + max(len(self._attachments) - 1, 0)
+        )
+
+    @property
+    def fingerprint(self) -> bytes:
+        """Bytes identifying this body for deduplication, without reading the attached files."""
+        return b"\n".join((self._prefix, *(attachment.fingerprint for attachment in self._attachments), self._suffix))
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield self._prefix
+        yield b"["
+        for i, attachment in enumerate(self._attachments):
+            if i:
+                yield b","
+            yield from attachment
+        yield b"]"
+        yield self._suffix
@@ -0,0 +1,173 @@
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from itertools import islice
+from typing import Generic, TypeVar
+
+from msgspec import Struct
+
+from ._ratelimit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+ItemT = TypeVar("ItemT")
+ResultT = TypeVar("ResultT")
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_RETRIES = 2
+DEFAULT_RETRY_BACKOFF = 0.5
+
+
+class BulkResult(Struct, Generic[ItemT, ResultT]):
+    """The outcome of one operation in a bulk call: either `response` or `error` is set."""
+
+    item: ItemT
+    response: ResultT | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def chunked(items: Iterable[ItemT], size: int, /) -> Iterator[tuple[ItemT, ...]]:
+    """Lazily split `items` into tuples of at most `size` items."""
+    if size < 1:
+        msg = "chunk size must be at least 1"
+        raise ValueError(msg)
+    iterator = iter(items)
+    while chunk := tuple(islice(iterator, size)):
+        yield chunk
+
+
+def with_retries(
+    func: Callable[[ItemT], ResultT],
+    /,
+    *,
+    retries: int,
+    backoff: float,
+    should_retry: Callable[[Exception], bool],
+    sleep: Callable[[float], object] = time.sleep,
+) -> Callable[[ItemT], ResultT]:
+    """
+    Wrap `func` to retry it up to `retries` times on errors accepted by `should_retry`.
+
+    Retries wait `backoff` seconds, doubling after each attempt.
+    """
+    if retries < 0:
+        msg = "retries must not be negative"
+        raise ValueError(msg)
+
+    def call(item: ItemT) -> ResultT:
+        for attempt in range(retries):
+            try:
+                return func(item)
+            except Exception as exc:  # noqa: PERF203
+                if not should_retry(exc):
+                    raise
+                delay = backoff * 2**attempt
+                logger.debug("retrying %r in %.2fs after %s", item, delay, exc)
+                sleep(delay)
+        return func(item)
+
+    return call
+
+
+def _call(
+    func: Callable[[ItemT], ResultT],
+    item: ItemT,
+    rate_limiter: TokenBucket | None,
+) -> BulkResult[ItemT, ResultT]:
+    if rate_limiter is not None:
+        rate_limiter.acquire()
+    try:
+        return BulkResult(item=item, response=func(item))
+    except Exception as exc:  # noqa: BLE001
+        return BulkResult(item=item, error=exc)
+
+
+def map_bounded(
+    func: Callable[[ItemT], ResultT],
+    items: Iterable[ItemT],
+    /,
+    *,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate_limiter: TokenBucket | None = None,
+) -> Iterator[BulkResult[ItemT, ResultT]]:
+    """
+    Call `func` on each item in a thread pool, yielding results as they complete.
+
+    Items are consumed lazily, with at most `2 * max_workers` calls queued at a time.
+    Exceptions raised by `func` are returned in the result instead of being raised.
+    """
+    if max_workers < 1:
+        msg = "max_workers must be at least 1"
+        raise ValueError(msg)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: set[Future[BulkResult[ItemT, ResultT]]] = set()
+        for item in items:
+            if len(pending) >= 2 * max_workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            pending.add(executor.submit(_call, func, item, rate_limiter))
+        for future in as_completed(pending):
+            yield future.result()
+
+
+async def amap_bounded(
+    func: Callable[[ItemT], ResultT],
+    items: Iterable[ItemT] | AsyncIterable[ItemT],
+    /,
+    *,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate_limiter: TokenBucket | None = None,
+) -> AsyncIterator[BulkResult[ItemT, ResultT]]:
+    """
+    Call `func` on each item in worker threads, yielding results as they complete.
+
+    At most `max_workers` calls run at a time and items are consumed lazily.
+    Exceptions raised by `func` are returned in the result instead of being raised.
+    """
+    if max_workers < 1:
+        msg = "max_workers must be at least 1"
+        raise ValueError(msg)
+    pending: set[asyncio.Task[BulkResult[ItemT, ResultT]]] = set()
+    try:
+        async for item in aiter_items(items):
+            if len(pending) >= max_workers:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+            pending.add(asyncio.create_task(_acall(func, item, rate_limiter)))
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def _acall(
+    func: Callable[[ItemT], ResultT],
+    item: ItemT,
+    rate_limiter: TokenBucket | None,
+) -> BulkResult[ItemT, ResultT]:
+    if rate_limiter is not None:
+        await rate_limiter.acquire_async()
+    try:
+        return BulkResult(item=item, response=await asyncio.to_thread(func, item))
+    except Exception as exc:  # noqa: BLE001
+        return BulkResult(item=item, error=exc)
+
+
+async def aiter_items(items: Iterable[ItemT] | AsyncIterable[ItemT]) -> AsyncIterator[ItemT]:
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
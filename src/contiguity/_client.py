@@ -2,14 +2,44 @@ from http import HTTPStatus
 
 from httpx import AsyncClient as HttpxAsyncClient
 from httpx import Client as HttpxClient
-from httpx import Response
+from httpx import ConnectError, ConnectTimeout, Response, TransportError
 
 from ._auth import get_contiguity_token
-from ._response import ErrorResponse, decode_response
+from ._response import ErrorResponse, T, decode_response
+from .response_cache import ResponseCache
+
+# Errors that may succeed if the request is retried.
+RETRYABLE_STATUSES = frozenset(
+    {
+        HTTPStatus.TOO_MANY_REQUESTS,
+        HTTPStatus.INTERNAL_SERVER_ERROR,
+        HTTPStatus.BAD_GATEWAY,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        HTTPStatus.GATEWAY_TIMEOUT,
+    },
+)
+# Errors returned before the API acted on the request, so retrying cannot repeat its effect.
+UNPROCESSED_STATUSES = frozenset({HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.SERVICE_UNAVAILABLE})
 
 
 class ContiguityApiError(Exception):
-    pass
+    def __init__(self, *args: object, status_code: int | None = None) -> None:
+        super().__init__(*args)
+        self.status_code = status_code
+
+
+def is_retryable(exc: Exception, /) -> bool:
+    """Return whether the request that raised `exc` may succeed if it is retried."""
+    if isinstance(exc, ContiguityApiError):
+        return exc.status_code in RETRYABLE_STATUSES
+    return isinstance(exc, TransportError)
+
+
+def is_retryable_unprocessed(exc: Exception, /) -> bool:
+    """Return whether `exc` is retryable and the request was not processed, so a non-idempotent one can be resent."""
+    if isinstance(exc, ContiguityApiError):
+        return exc.status_code in UNPROCESSED_STATUSES
+    return isinstance(exc, ConnectError | ConnectTimeout)
 
 
 class BaseApiClient:
@@ -17,7 +47,7 @@ class BaseApiClient:
         if not HTTPStatus.OK <= response.status_code < HTTPStatus.MULTIPLE_CHOICES:
             data = decode_response(response.content, type=ErrorResponse)
             msg = f"{fail_message}. {response.status_code} {data.error}"
-            raise ContiguityApiError(msg)
+            raise ContiguityApiError(msg, status_code=response.status_code)
 
 
 class ApiClient(HttpxClient, BaseApiClient):
@@ -27,6 +57,7 @@ class ApiClient(HttpxClient, BaseApiClient):
         base_url: str = "https://api.contiguity.com",
         api_key: str | None = None,
         timeout: int = 5,
+        response_cache: ResponseCache | None = None,
     ) -> None:
         if not api_key:
             api_key = get_contiguity_token()
@@ -38,6 +69,39 @@ class ApiClient(HttpxClient, BaseApiClient):
             timeout=timeout,
             base_url=base_url,
         )
+        self.response_cache = response_cache
+
+    def get_decoded(self, path: str, /, *, type: type[T], fail_message: str) -> T:
+        """
+        GET `path` and decode the response as `type`, through the response cache if the client has one.
+
+        Requests that the cache can answer are not sent, and revalidated responses are not decoded again.
+        """
+        cache = self.response_cache
+        if cache is None:
+            response = self.get(path)
+            self.handle_error(response, fail_message=fail_message)
+            return decode_response(response.content, type=type)
+
+        cached, headers = cache.lookup(path)
+        if cached is not None:
+            return cached
+        response = self.get(path, headers=headers)
+        if response.status_code == HTTPStatus.NOT_MODIFIED:
+            cached = cache.revalidated(path, response.headers)
+            if cached is not None:
+                return cached
+            # The entry was evicted while the request was in flight.
+            response = self.get(path)
+        self.handle_error(response, fail_message=fail_message)
+        data = decode_response(response.content, type=type)
+        cache.store(path, data, response.headers, nbytes=len(response.content))
+        return data
+
+    def invalidate(self, *paths: str) -> None:
+        """Drop the cached responses of `paths` after a request that changed them."""
+        if self.response_cache is not None:
+            self.response_cache.invalidate(*paths)
 
 
 class AsyncApiClient(HttpxAsyncClient, BaseApiClient):
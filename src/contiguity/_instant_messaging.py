@@ -1,10 +1,18 @@
 import logging
+import threading
 from abc import ABC, abstractmethod
-from collections.abc import Sequence
-from typing import Generic, Literal, TypeVar
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from typing import Generic, Literal, TypeVar, cast
 
+from ._client import ApiClient, ContiguityApiError
 from ._product import BaseProduct
 from ._response import BaseResponse, decode_response
+from ._template import MessageTemplate, TemplateCompiler
+from .capabilities import CapabilityCache, Channel, is_unreachable
+from .dedup import DedupStore, post_once
+from .text import Text, TextResponse
+from .typing_indicators import DEFAULT_REFRESH_INTERVAL
 
 FallbackCauseT = TypeVar("FallbackCauseT", bound=str)
 
@@ -24,10 +32,25 @@ class IMReactionResponse(IMTypingResponse):
 
 
 class InstantMessagingClient(ABC, BaseProduct, Generic[FallbackCauseT]):
+    def __init__(
+        self,
+        *,
+        client: ApiClient,
+        dedup: DedupStore | None = None,
+        capabilities: CapabilityCache | None = None,
+    ) -> None:
+        super().__init__(client=client)
+        self._dedup = dedup
+        self._capabilities = capabilities
+
     @property
     @abstractmethod
     def _api_path(self) -> str: ...
 
+    @property
+    def _channel(self) -> Channel:
+        return cast("Channel", self._api_path[1:])
+
     def send(  # noqa: PLR0913
         self,
         *,
@@ -37,7 +60,104 @@ class InstantMessagingClient(ABC, BaseProduct, Generic[FallbackCauseT]):
         attachments: Sequence[str] | None = None,
         fallback_when: Sequence[FallbackCauseT] | None = None,
         fallback_number: str | None = None,
+        dedup_key: str | None = None,
     ) -> IMSendResponse:
+        payload = self._payload(
+            to=to,
+            message=message,
+            from_=from_,
+            attachments=attachments,
+            fallback_when=fallback_when,
+            fallback_number=fallback_number,
+        )
+
+        content = post_once(
+            self._client,
+            self._api_path,
+            payload,
+            store=self._dedup,
+            key=dedup_key,
+            fail_message="failed to send instant message",
+        )
+        data = decode_response(content, type=IMSendResponse)
+        logger.debug("successfully sent %s message to %r", self._api_path[1:], to)
+        if self._capabilities is not None and not fallback_when:
+            self._capabilities.record(to, self._channel, supported=True)
+        return data
+
+    def send_or_text(  # noqa: PLR0913
+        self,
+        text: Text,
+        /,
+        *,
+        to: str,
+        message: str,
+        from_: str | None = None,
+        attachments: Sequence[str] | None = None,
+        dedup_key: str | None = None,
+    ) -> IMSendResponse | TextResponse:
+        """
+        Send an instant message, or a text message if the recipient cannot be reached on this channel.
+
+        Recipients known from the product's capability cache not to support the channel are sent a text
+        straight away. Otherwise the instant message is tried first, and if it is rejected for the recipient,
+        the cache records that and the message is sent with `text`.
+        """
+        if self._capabilities is None:
+            msg = "send_or_text requires the product to be configured with a capability cache"
+            raise ValueError(msg)
+        if self._capabilities.supports(to, self._channel) is not False:
+            try:
+                return self.send(to=to, message=message, from_=from_, attachments=attachments, dedup_key=dedup_key)
+            except ContiguityApiError as exc:
+                if not is_unreachable(exc):
+                    raise
+                logger.debug("falling back to text for %r: %s", to, exc)
+                self._capabilities.record(to, self._channel, supported=False)
+        return text.send(to=to, message=message, from_=from_, attachments=attachments, dedup_key=dedup_key)
+
+    def template(
+        self,
+        *,
+        message: str,
+        from_: str | None = None,
+        attachments: Sequence[str] | None = None,
+        fallback_when: Sequence[FallbackCauseT] | None = None,
+        fallback_number: str | None = None,
+    ) -> MessageTemplate[IMSendResponse]:
+        """
+        Compile an instant message for sending to many recipients.
+
+        `message` is a `str.format` template whose named fields are filled in on each send.
+        """
+        compiler = TemplateCompiler()
+        payload = self._payload(
+            to=compiler.recipient(),
+            message=compiler.field(message),
+            from_=from_,
+            attachments=attachments,
+            fallback_when=fallback_when,
+            fallback_number=fallback_number,
+        )
+        return compiler.compile(
+            payload,
+            client=self._client,
+            path=self._api_path,
+            response_type=IMSendResponse,
+            fail_message="failed to send instant message",
+            description=f"{self._api_path[1:]} message",
+        )
+
+    @staticmethod
+    def _payload(  # noqa: PLR0913
+        *,
+        to: str,
+        message: str,
+        from_: str | None,
+        attachments: Sequence[str] | None,
+        fallback_when: Sequence[FallbackCauseT] | None,
+        fallback_number: str | None,
+    ) -> dict[str, object]:
         payload = {
             "to": to,
             "message": message,
@@ -46,16 +166,7 @@ class InstantMessagingClient(ABC, BaseProduct, Generic[FallbackCauseT]):
             "fallback_when": fallback_when,
             "fallback_number": fallback_number,
         }
-
-        response = self._client.post(
-            self._api_path,
-            json={k: v for k, v in payload.items() if v is not None},
-        )
-
-        self._client.handle_error(response, fail_message="failed to send instant message")
-        data = decode_response(response.content, type=IMSendResponse)
-        logger.debug("successfully sent %s message to %r", self._api_path[1:], to)
-        return data
+        return {k: v for k, v in payload.items() if v is not None}
 
     def _typing(self, *, to: str, action: Literal["start", "stop"], from_: str | None = None) -> IMTypingResponse:
         payload = {
@@ -80,6 +191,44 @@ class InstantMessagingClient(ABC, BaseProduct, Generic[FallbackCauseT]):
     def stop_typing(self, *, to: str, from_: str | None = None) -> IMTypingResponse:
         return self._typing(to=to, action="stop", from_=from_)
 
+    @contextmanager
+    def typing(
+        self,
+        *,
+        to: str,
+        from_: str | None = None,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+    ) -> Iterator[None]:
+        """
+        Show the typing indicator while the block runs.
+
+        The indicator is started once, refreshed every `refresh_interval` seconds from a background thread,
+        and stopped when the block exits. Failures to refresh or stop the indicator are logged rather than raised,
+        so they never replace an exception raised by the block. To share indicators between many concurrent
+        conversations in async code, use `contiguity.typing_indicators.TypingCoalescer`.
+        """
+        self.start_typing(to=to, from_=from_)
+        stopped = threading.Event()
+
+        def refresh() -> None:
+            while not stopped.wait(refresh_interval):
+                try:
+                    self.start_typing(to=to, from_=from_)
+                except Exception:  # noqa: PERF203
+                    logger.warning("failed to refresh typing indicator for %r", to, exc_info=True)
+
+        thread = threading.Thread(target=refresh, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stopped.set()
+            thread.join()
+            try:
+                self.stop_typing(to=to, from_=from_)
+            except Exception:
+                logger.warning("failed to stop typing indicator for %r", to, exc_info=True)
+
     def _reactions(
         self,
         *,
@@ -0,0 +1,275 @@
+import re
+from collections.abc import Collection
+from functools import lru_cache
+from typing import TYPE_CHECKING, NamedTuple
+
+import phonenumbers
+from phonenumbers import COUNTRY_CODE_TO_REGION_CODE, PhoneMetadata, PhoneNumber
+from phonenumbers.phonemetadata import PhoneNumberDesc
+
+if TYPE_CHECKING:
+    from functools import _CacheInfo
+
+DEFAULT_CACHE_SIZE = 65_536
+
+PARSING_FAILED = "parsing failed. Phone number must follow the E.164 format."
+FORMATTING_FAILED = "formatting failed. Phone number must follow the E.164 format."
+REGION_NOT_ALLOWED = "region check failed. Phone number must belong to one of the allowed regions."
+
+# Either (e164, None) for a valid number or (None, error message) for an invalid one.
+_Result = tuple[str, None] | tuple[None, str]
+
+STRICT_E164_REGEX = re.compile(r"\+([1-9]\d{1,14})")
+LEADING_DIGITS_REGEX = re.compile(r"\s*\+\D*(\d(?:\D*\d){0,2})")
+MAX_COUNTRY_CODE_LENGTH = 3
+MIN_NATIONAL_NUMBER_LENGTH = 2
+NON_GEOGRAPHIC_REGION = "001"
+
+# Number types in the order `phonenumbers` checks them; "mobile" is skipped when it shares the fixed line pattern.
+_NUMBER_TYPE_DESCS = (
+    "premium_rate",
+    "toll_free",
+    "shared_cost",
+    "voip",
+    "personal_number",
+    "pager",
+    "uan",
+    "voicemail",
+    "fixed_line",
+    "mobile",
+)
+
+
+class _DescMatcher(NamedTuple):
+    possible_lengths: frozenset[int]
+    pattern: re.Pattern[str]
+
+    @classmethod
+    def compile(cls, desc: PhoneNumberDesc | None) -> "_DescMatcher | None":
+        if desc is None or not desc.national_number_pattern:
+            return None
+        return cls(frozenset(desc.possible_length), re.compile(desc.national_number_pattern))
+
+    def matches(self, national_number: str) -> bool:
+        if self.possible_lengths and len(national_number) not in self.possible_lengths:
+            return False
+        return self.pattern.fullmatch(national_number) is not None
+
+
+class _RegionEntry(NamedTuple):
+    region: str
+    leading_digits: re.Pattern[str] | None
+    general: _DescMatcher | None
+    types: tuple[_DescMatcher, ...]
+
+    @classmethod
+    def compile(cls, region: str, metadata: PhoneMetadata) -> "_RegionEntry":
+        names = _NUMBER_TYPE_DESCS[:-1] if metadata.same_mobile_and_fixed_line_pattern else _NUMBER_TYPE_DESCS
+        types = (_DescMatcher.compile(getattr(metadata, name)) for name in names)
+        return cls(
+            region=region,
+            leading_digits=re.compile(metadata.leading_digits) if metadata.leading_digits is not None else None,
+            general=_DescMatcher.compile(metadata.general_desc),
+            types=tuple(matcher for matcher in types if matcher is not None),
+        )
+
+    def is_valid(self, national_number: str) -> bool:
+        if self.general is None or not self.general.matches(national_number):
+            return False
+        return any(matcher.matches(national_number) for matcher in self.types)
+
+
+class _CallingCodeEntry(NamedTuple):
+    national_prefix: re.Pattern[str] | None
+    regions: tuple[_RegionEntry, ...]
+
+    def region_for(self, national_number: str) -> str | None:
+        """Return the region a valid number belongs to, or `None` if it is not valid in any region."""
+        # Mirrors the region selection done by `phonenumbers.region_code_for_number`.
+        for entry in self.regions:
+            if entry.leading_digits is not None:
+                if entry.leading_digits.match(national_number):
+                    return entry.region if entry.is_valid(national_number) else None
+            elif entry.is_valid(national_number):
+                return entry.region
+        return None
+
+
+class E164Index:
+    """
+    Validates strict E.164 strings against precompiled calling code metadata.
+
+    Entries are compiled from the installed `phonenumbers` metadata the first time a calling code is seen,
+    so only the regions that are actually dialed are ever loaded.
+    When `regions` is given, only numbers belonging to those regions are considered valid.
+    Numbers from any other calling code are rejected before `phonenumbers` is touched; numbers sharing
+    a calling code with an allowed region are matched to their region first, as `phonenumbers` does.
+    """
+
+    def __init__(self, *, regions: Collection[str] | None = None) -> None:
+        self.regions = _check_regions(regions) if regions is not None else None
+        self._country_codes = (
+            frozenset(code for code, codes in COUNTRY_CODE_TO_REGION_CODE.items() if self.regions.intersection(codes))
+            if self.regions is not None
+            else None
+        )
+        self._entries: dict[int, _CallingCodeEntry | None] = {}
+
+    def allows(self, country_code: int, /) -> bool:
+        return self._country_codes is None or country_code in self._country_codes
+
+    def lookup(self, number: str, /) -> _Result | None:  # noqa: PLR0911
+        """Return the validation result for `number`, or `None` if it needs a full `phonenumbers` parse."""
+        match = STRICT_E164_REGEX.fullmatch(number)
+        if match is None:
+            return None
+        digits = match[1]
+        country_code = _extract_country_code(digits)
+        if country_code is None:
+            return None, PARSING_FAILED
+        if not self.allows(country_code):
+            return None, REGION_NOT_ALLOWED
+
+        national_number = digits[len(str(country_code)) :]
+        if len(national_number) < MIN_NATIONAL_NUMBER_LENGTH:
+            return None
+        entry = self._entry(country_code)
+        if entry is None:
+            return None
+        if entry.national_prefix is not None and entry.national_prefix.match(national_number):
+            # `phonenumbers` may strip or rewrite a national prefix here, so the input is not canonical.
+            return None
+        error = self._check_region(entry.region_for(national_number))
+        return (number, None) if error is None else (None, error)
+
+    def validate(self, number: PhoneNumber, /) -> str | None:
+        """Validate an already parsed number, returning the error message if it is invalid or not allowed."""
+        if number.country_code is None:
+            return PARSING_FAILED
+        entry = self._entry(number.country_code)
+        if entry is None:
+            region = phonenumbers.region_code_for_number(number) if phonenumbers.is_valid_number(number) else None
+        else:
+            region = entry.region_for(phonenumbers.national_significant_number(number))
+        return self._check_region(region)
+
+    def _check_region(self, region: str | None) -> str | None:
+        if region is None:
+            return FORMATTING_FAILED
+        if self.regions is not None and region not in self.regions:
+            return REGION_NOT_ALLOWED
+        return None
+
+    def _entry(self, country_code: int) -> _CallingCodeEntry | None:
+        try:
+            return self._entries[country_code]
+        except KeyError:
+            entry = self._entries[country_code] = self._compile(country_code)
+            return entry
+
+    def _compile(self, country_code: int) -> _CallingCodeEntry | None:
+        regions = COUNTRY_CODE_TO_REGION_CODE[country_code]
+        if NON_GEOGRAPHIC_REGION in regions:
+            return None
+        entries = []
+        for region in regions:
+            metadata = PhoneMetadata.metadata_for_region(region, None)
+            if metadata is not None:
+                entries.append(_RegionEntry.compile(region, metadata))
+        if not entries:
+            return None
+        # National prefixes are always stripped using the main region for the calling code.
+        main_metadata = PhoneMetadata.metadata_for_region(regions[0], None)
+        national_prefix = main_metadata.national_prefix_for_parsing if main_metadata is not None else None
+        return _CallingCodeEntry(
+            national_prefix=re.compile(national_prefix) if national_prefix else None,
+            regions=tuple(entries),
+        )
+
+
+def _check_regions(regions: Collection[str]) -> frozenset[str]:
+    checked = frozenset(region.upper() for region in regions)
+    for region in checked:
+        if region not in phonenumbers.SUPPORTED_REGIONS and region != NON_GEOGRAPHIC_REGION:
+            msg = f"unknown region code {region!r}"
+            raise ValueError(msg)
+    if not checked:
+        msg = "at least one allowed region must be provided"
+        raise ValueError(msg)
+    return checked
+
+
+def _extract_country_code(digits: str) -> int | None:
+    if digits.startswith("0"):
+        return None
+    for length in range(1, MAX_COUNTRY_CODE_LENGTH + 1):
+        country_code = int(digits[:length])
+        if country_code in COUNTRY_CODE_TO_REGION_CODE:
+            return country_code
+    return None
+
+
+class PhoneNumberNormalizer:
+    """
+    Normalizes phone numbers to E.164, memoizing both successes and failures.
+
+    The cache is a bounded LRU, so repeated numbers skip `phonenumbers` entirely.
+    Cache misses that are already strict E.164 are checked against an `E164Index`,
+    and only other input is handed to `phonenumbers.parse`.
+    Pass `regions` (ISO 3166-1 alpha-2 codes) to reject numbers from any other region
+    and avoid loading their metadata.
+    It is safe to share a single instance between threads and products.
+    """
+
+    def __init__(self, *, maxsize: int = DEFAULT_CACHE_SIZE, regions: Collection[str] | None = None) -> None:
+        self.maxsize = maxsize
+        self._index = E164Index(regions=regions)
+        self._lookup = lru_cache(maxsize=maxsize)(self._parse)
+
+    def normalize(self, number: str, /) -> str:
+        """Return `number` in E.164 format, or raise `ValueError` if it is not a valid phone number."""
+        e164, error = self._lookup(number)
+        if e164 is None:
+            raise ValueError(error)
+        return e164
+
+    def is_valid(self, number: str, /) -> bool:
+        return self._lookup(number)[0] is not None
+
+    @property
+    def regions(self) -> frozenset[str] | None:
+        return self._index.regions
+
+    def cache_info(self) -> "_CacheInfo":
+        return self._lookup.cache_info()
+
+    def cache_clear(self) -> None:
+        self._lookup.cache_clear()
+
+    def _parse(self, number: str) -> _Result:
+        result = self._index.lookup(number)
+        if result is not None:
+            return result
+        if self.regions is not None and (match := LEADING_DIGITS_REGEX.match(number)):
+            # Reject disallowed calling codes before `phonenumbers` loads their metadata.
+            country_code = _extract_country_code(re.sub(r"\D", "", match[1]))
+            if country_code is not None and not self._index.allows(country_code):
+                return None, REGION_NOT_ALLOWED
+        return self._parse_full(number)
+
+    def _parse_full(self, number: str) -> _Result:
+        try:
+            parsed_number = phonenumbers.parse(number, None)
+        except phonenumbers.NumberParseException:
+            return None, PARSING_FAILED
+        if parsed_number.country_code is None:
+            return None, PARSING_FAILED
+        if not self._index.allows(parsed_number.country_code):
+            return None, REGION_NOT_ALLOWED
+        error = self._index.validate(parsed_number)
+        if error is not None:
+            return None, error
+        return phonenumbers.format_number(parsed_number, phonenumbers.PhoneNumberFormat.E164), None
+
+
+default_normalizer = PhoneNumberNormalizer()
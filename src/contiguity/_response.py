@@ -37,6 +37,8 @@ def decode_response(content: bytes, /, *, type: type[T]) -> T:
         object=raw.object,
     )
     data = msgspec.to_builtins(raw.data)
+    if isinstance(data, list):
+        return msgspec.convert(data, type=type)
     if not isinstance(data, Mapping):
         msg = f"expected Mapping instance for 'data' field, got {_type(data)}"
         raise TypeError(msg)
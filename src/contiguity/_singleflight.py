@@ -0,0 +1,75 @@
+import asyncio
+import threading
+from collections.abc import Callable, Hashable
+from typing import Generic, TypeVar
+
+KeyT = TypeVar("KeyT", bound=Hashable)
+ResultT = TypeVar("ResultT")
+
+
+class _Call(Generic[ResultT]):
+    __slots__ = ("done", "error", "result")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: ResultT | None = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight(Generic[KeyT, ResultT]):
+    """
+    Coalesces concurrent calls with the same key into one.
+
+    The first caller for a key runs the function; callers arriving while it runs
+    wait for it and share its result or exception. Results are not kept once the call completes.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[KeyT, _Call[ResultT]] = {}
+        self._tasks: dict[tuple[asyncio.AbstractEventLoop, KeyT], asyncio.Task[ResultT]] = {}
+
+    def do(self, key: KeyT, func: Callable[[], ResultT], /) -> ResultT:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result  # type: ignore[return-value]
+
+        try:
+            call.result = func()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    async def do_async(self, key: KeyT, func: Callable[[], ResultT], /) -> ResultT:
+        """
+        Like `do()`, but runs `func` in a worker thread.
+
+        Calls coalesce with other async callers on the same event loop and with concurrent `do()` callers.
+        Cancelling one caller does not cancel the shared call.
+        """
+        loop = asyncio.get_running_loop()
+        task = self._tasks.get((loop, key))
+        if task is None:
+            task = loop.create_task(asyncio.to_thread(self.do, key, func))
+            self._tasks[loop, key] = task
+            task.add_done_callback(lambda _: self._forget(loop, key))
+        return await asyncio.shield(task)
+
+    def _forget(self, loop: asyncio.AbstractEventLoop, key: KeyT) -> None:
+        task = self._tasks.pop((loop, key))
+        if not task.cancelled():
+            # Mark the exception as retrieved, in case every caller was cancelled.
+            task.exception()
@@ -0,0 +1,199 @@
+import logging
+import re
+import secrets
+from collections.abc import Callable, Mapping
+from string import Formatter
+from typing import Any, Generic, TypeVar
+
+import msgspec
+
+from ._client import ApiClient
+from ._response import BaseResponse, decode_response
+from .suppression import SuppressionList
+
+ResponseT = TypeVar("ResponseT", bound=BaseResponse)
+
+logger = logging.getLogger(__name__)
+
+_formatter = Formatter()
+
+
+def _escape(value: str) -> bytes:
+    """Encode `value` as the inside of a JSON string."""
+    return msgspec.json.encode(value)[1:-1]
+
+
+class TemplateString:
+    """
+    A `str.format` template compiled into pre-escaped JSON fragments.
+
+    Only named fields are supported. Literal braces must be doubled, as with `str.format`.
+    """
+
+    def __init__(self, template: str, /) -> None:
+        self.template = template
+        self.fields: set[str] = set()
+        self._parts: list[tuple[bytes, str | None, str | None, str]] = []
+        for literal, field_name, conversion, format_spec in self._parse(template):
+            self._parts.append((_escape(literal), field_name, conversion, format_spec))
+            if field_name is not None:
+                self.fields.add(re.split(r"[.\[]", field_name, maxsplit=1)[0])
+
+    @staticmethod
+    def _parse(template: str) -> list[tuple[str, str | None, str | None, str]]:
+        parts = []
+        for literal, field_name, format_spec, conversion in _formatter.parse(template):
+            if field_name is not None and (not field_name or field_name[0].isdigit()):
+                msg = f"positional fields are not supported in templates: {template!r}"
+                raise ValueError(msg)
+            if format_spec and "{" in format_spec:
+                msg = f"nested fields are not supported in templates: {template!r}"
+                raise ValueError(msg)
+            parts.append((literal, field_name, conversion, format_spec or ""))
+        return parts
+
+    def render(self, variables: Mapping[str, Any], /) -> bytes:
+        """Render the template as an encoded JSON string."""
+        chunks = [b'"']
+        for literal, field_name, conversion, format_spec in self._parts:
+            chunks.append(literal)
+            if field_name is not None:
+                value, _ = _formatter.get_field(field_name, (), variables)
+                if conversion is not None:
+                    value = _formatter.convert_field(value, conversion)
+                chunks.append(_escape(format(value, format_spec)))
+        chunks.append(b'"')
+        return b"".join(chunks)
+
+
+class TemplateCompiler:
+    """
+    Builds a `MessageTemplate` from a regular request payload.
+
+    Products build their payload as usual, passing `recipient()` and `field()` markers
+    in place of the per-recipient values. The payload is then encoded once and split on those markers.
+    """
+
+    def __init__(self) -> None:
+        self._token = secrets.token_hex(8)
+        self._fields: list[TemplateString | None] = []
+
+    def recipient(self) -> str:
+        """Return a marker for the recipient address."""
+        return self.slot()
+
+    def slot(self) -> str:
+        """Return a marker for a value that the caller splices in as encoded bytes."""
+        return self._marker(None)
+
+    def field(self, template: str, /) -> str:
+        """Return a marker for a templated string value."""
+        return self._marker(TemplateString(template))
+
+    def _marker(self, field: TemplateString | None) -> str:
+        self._fields.append(field)
+        return f"<{self._token}:{len(self._fields) - 1}>"
+
+    def fragments(self, payload: Mapping[str, Any], /) -> list[bytes | TemplateString | None]:
+        """
+        Encode `payload` and split it on the markers.
+
+        The result alternates between encoded bytes and a marker slot:
+        `None` for the recipient or another caller-supplied value, or the `TemplateString` to render.
+        """
+        encoded = msgspec.json.encode(payload)
+        pieces = re.split(rb'"<' + self._token.encode() + rb':(\d+)>"', encoded)
+        return [piece if i % 2 == 0 else self._fields[int(piece)] for i, piece in enumerate(pieces)]
+
+    def split(self, payload: Mapping[str, Any], /) -> tuple[bytes, bytes]:
+        """Encode `payload`, which must hold a single `slot()` marker, and return the bytes before and after it."""
+        match self.fragments(payload):
+            case [bytes() as prefix, None, bytes() as suffix]:
+                return prefix, suffix
+        msg = "payload must contain exactly one slot"
+        raise ValueError(msg)
+
+    def compile(  # noqa: PLR0913
+        self,
+        payload: Mapping[str, Any],
+        /,
+        *,
+        client: ApiClient,
+        path: str,
+        response_type: type[ResponseT],
+        fail_message: str,
+        description: str,
+        normalize_recipient: Callable[[str], str] | None = None,
+        suppression: SuppressionList | None = None,
+    ) -> "MessageTemplate[ResponseT]":
+        return MessageTemplate(
+            client=client,
+            path=path,
+            fragments=self.fragments(payload),
+            response_type=response_type,
+            fail_message=fail_message,
+            description=description,
+            normalize_recipient=normalize_recipient,
+            suppression=suppression,
+        )
+
+
+class MessageTemplate(Generic[ResponseT]):
+    """
+    A message compiled once and sent to many recipients.
+
+    The static parts of the request body are encoded when the template is created;
+    each send only renders the templated fields and splices in the recipient.
+    Create templates with the `template()` method of `Text`, `Email`, `IMessage` or `WhatsApp`.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        client: ApiClient,
+        path: str,
+        fragments: list[bytes | TemplateString | None],
+        response_type: type[ResponseT],
+        fail_message: str,
+        description: str,
+        normalize_recipient: Callable[[str], str] | None = None,
+        suppression: SuppressionList | None = None,
+    ) -> None:
+        self._client = client
+        self._path = path
+        self._fragments = fragments
+        self._response_type = response_type
+        self._fail_message = fail_message
+        self._description = description
+        self._normalize_recipient = normalize_recipient
+        self._suppression = suppression
+        self.fields = frozenset().union(*(f.fields for f in fragments if isinstance(f, TemplateString)))
+
+    def render(self, *, to: str, variables: Mapping[str, Any] | None = None) -> bytes:
+        """
+        Return the encoded request body for a single recipient.
+
+        Raises `SuppressedRecipientError` if `to` is on the product's suppression list.
+        """
+        variables = variables or {}
+        if self._normalize_recipient is not None:
+            to = self._normalize_recipient(to)
+        if self._suppression is not None:
+            self._suppression.check(to)
+        chunks = []
+        for fragment in self._fragments:
+            if isinstance(fragment, bytes):
+                chunks.append(fragment)
+            elif fragment is None:
+                chunks.append(msgspec.json.encode(to))
+            else:
+                chunks.append(fragment.render(variables))
+        return b"".join(chunks)
+
+    def send(self, *, to: str, variables: Mapping[str, Any] | None = None) -> ResponseT:
+        """Send the message to `to`, filling in the template fields from `variables`."""
+        response = self._client.post(self._path, content=self.render(to=to, variables=variables))
+        self._client.handle_error(response, fail_message=self._fail_message)
+        data = decode_response(response.content, type=self._response_type)
+        logger.debug("successfully sent %s to %r", self._description, to)
+        return data
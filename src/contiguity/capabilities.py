@@ -0,0 +1,103 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from http import HTTPStatus
+from typing import Literal, NamedTuple
+
+from ._client import ContiguityApiError
+from ._phone import PhoneNumberNormalizer, default_normalizer
+
+Channel = Literal["imessage", "whatsapp"]
+
+DEFAULT_TTL = 30 * 24 * 60 * 60
+# Recipients may start using a channel at any time, so negative results expire sooner.
+DEFAULT_UNSUPPORTED_TTL = 24 * 60 * 60
+DEFAULT_MAXSIZE = 100_000
+
+# Statuses the API answers with when the request was valid but the recipient cannot be reached on the channel.
+# Any other error, including a 400 for a malformed request, says nothing about the recipient's capabilities.
+UNREACHABLE_STATUSES = frozenset({HTTPStatus.NOT_FOUND, HTTPStatus.UNPROCESSABLE_ENTITY})
+
+
+def is_unreachable(exc: ContiguityApiError, /) -> bool:
+    """Return whether `exc` means the recipient cannot be reached on the channel, rather than a failed request."""
+    return exc.status_code in UNREACHABLE_STATUSES
+
+
+class CapabilityInfo(NamedTuple):
+    hits: int
+    misses: int
+    size: int
+
+
+class CapabilityCache:
+    """
+    Remembers which recipients can be reached on iMessage and WhatsApp.
+
+    Entries are recorded by the instant messaging products as sends succeed or fall back to text,
+    and can also be recorded directly, for example from delivery webhooks.
+    Supported channels are remembered for `ttl` seconds and unsupported ones for `unsupported_ttl` seconds.
+    The least recently used entries are evicted beyond `maxsize`.
+    Phone numbers are keyed in E.164 format using `phone_numbers`, so a recipient is found however it is written.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float = DEFAULT_TTL,
+        unsupported_ttl: float = DEFAULT_UNSUPPORTED_TTL,
+        maxsize: int = DEFAULT_MAXSIZE,
+        clock: Callable[[], float] = time.monotonic,
+        phone_numbers: PhoneNumberNormalizer | None = None,
+    ) -> None:
+        self.ttl = ttl
+        self.unsupported_ttl = unsupported_ttl
+        self.maxsize = maxsize
+        self._clock = clock
+        self._phone_numbers = phone_numbers or default_normalizer
+        self._entries: OrderedDict[tuple[str, Channel], tuple[bool, float]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def record(self, recipient: str, channel: Channel, /, *, supported: bool) -> None:
+        expires_at = self._clock() + (self.ttl if supported else self.unsupported_ttl)
+        key = (self._key(recipient), channel)
+        with self._lock:
+            self._entries[key] = (supported, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def supports(self, recipient: str, channel: Channel, /) -> bool | None:
+        """Return whether `recipient` can be reached on `channel`, or `None` if it is not known."""
+        key = (self._key(recipient), channel)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= self._clock():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def info(self) -> CapabilityInfo:
+        return CapabilityInfo(hits=self._hits, misses=self._misses, size=len(self))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _key(self, recipient: str) -> str:
+        try:
+            return self._phone_numbers.normalize(recipient)
+        except ValueError:
+            # Not a phone number, such as an iMessage email address.
+            return recipient
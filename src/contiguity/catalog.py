@@ -0,0 +1,390 @@
+import asyncio
+import logging
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from collections.abc import AsyncIterator, Callable, Collection, Hashable, Iterable, Sequence
+from typing import Literal
+
+import msgspec
+from msgspec import Struct
+
+from .leases import Carrier, Leases, NumberDetails
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 60.0
+DEFAULT_POLL_INTERVAL = 60.0
+DEFAULT_MIN_POLL_INTERVAL = 5.0
+DEFAULT_MAX_POLL_INTERVAL = 300.0
+
+CatalogSortKey = Literal["monthly_rate", "reputation"]
+
+_NO_POSITIONS: frozenset[int] = frozenset()
+
+
+def _hash_index(keys: Iterable[Iterable[Hashable]]) -> dict[Hashable, frozenset[int]]:
+    index: defaultdict[Hashable, set[int]] = defaultdict(set)
+    for position, position_keys in enumerate(keys):
+        for key in position_keys:
+            index[key].add(position)
+    return {key: frozenset(positions) for key, positions in index.items()}
+
+
+class _SortedIndex:
+    __slots__ = ("keys", "positions")
+
+    def __init__(self, values: Sequence[float]) -> None:
+        self.positions = sorted(range(len(values)), key=values.__getitem__)
+        self.keys = [values[position] for position in self.positions]
+
+    def between(self, low: float, high: float) -> range:
+        """Return the range of `positions` whose keys are between `low` and `high`."""
+        return range(bisect_left(self.keys, low), bisect_right(self.keys, high))
+
+
+class _CatalogIndex:
+    def __init__(self, numbers: list[NumberDetails]) -> None:
+        self.numbers = numbers
+        self.by_id = {number.id: number for number in numbers}
+        self.by_country = _hash_index((n.location.country,) for n in numbers)
+        self.by_region = _hash_index(((n.location.country, n.location.region),) for n in numbers)
+        self.by_city = _hash_index(((n.location.country, n.location.region, n.location.city),) for n in numbers)
+        self.by_carrier = _hash_index((n.carrier,) for n in numbers)
+        self.by_channel = _hash_index(n.capabilities.channels for n in numbers)
+        self.by_intl_sms = _hash_index((n.capabilities.intl_sms,) for n in numbers)
+        self.monthly_rates = [n.pricing.monthly_rate for n in numbers]
+        self.reputations = [n.health.reputation for n in numbers]
+        self.by_monthly_rate = _SortedIndex(self.monthly_rates)
+        self.by_reputation = _SortedIndex(self.reputations)
+
+    def matching(  # noqa: PLR0913
+        self,
+        *,
+        country: str | None,
+        region: str | None,
+        city: str | None,
+        carrier: str | None,
+        channels: Collection[str],
+        intl_sms: bool | None,
+    ) -> frozenset[int] | None:
+        """Return the positions matching every hash-indexed filter, or `None` if there are none."""
+        matches: list[frozenset[int]] = []
+        if city is not None:
+            matches.append(self.by_city.get((country, region, city), _NO_POSITIONS))
+        elif region is not None:
+            matches.append(self.by_region.get((country, region), _NO_POSITIONS))
+        elif country is not None:
+            matches.append(self.by_country.get(country, _NO_POSITIONS))
+        if carrier is not None:
+            matches.append(self.by_carrier.get(carrier, _NO_POSITIONS))
+        if intl_sms is not None:
+            matches.append(self.by_intl_sms.get(intl_sms, _NO_POSITIONS))
+        matches.extend(self.by_channel.get(channel, _NO_POSITIONS) for channel in channels)
+        return frozenset.intersection(*sorted(matches, key=len)) if matches else None
+
+    def select(  # noqa: PLR0913
+        self,
+        candidates: frozenset[int] | None,
+        /,
+        *,
+        min_monthly_rate: float,
+        max_monthly_rate: float,
+        min_reputation: float,
+        sort_by: CatalogSortKey | None,
+        descending: bool,
+        limit: int | None,
+    ) -> list[int]:
+        """Return up to `limit` positions out of `candidates` within the range filters."""
+        if sort_by == "reputation":
+            index, values = self.by_reputation, self.reputations
+            span = index.between(min_reputation, float("inf"))
+        else:
+            index, values = self.by_monthly_rate, self.monthly_rates
+            span = index.between(min_monthly_rate, max_monthly_rate)
+
+        def matches(position: int) -> bool:
+            return (
+                min_monthly_rate <= self.monthly_rates[position] <= max_monthly_rate
+                and self.reputations[position] >= min_reputation
+            )
+
+        # Walking the sorted index is cheapest when it soon finds `limit` candidates;
+        # otherwise the candidates are filtered directly, and sorted if needed.
+        if candidates is not None and (sort_by is None or limit is None or limit * len(span) > len(candidates) ** 2):
+            positions = [position for position in candidates if matches(position)]
+            if sort_by is None:
+                positions.sort()
+            else:
+                positions.sort(key=values.__getitem__, reverse=descending)
+            return positions[:limit]
+
+        positions = []
+        for i in reversed(span) if descending else span:
+            position = index.positions[i]
+            if (candidates is None or position in candidates) and matches(position):
+                positions.append(position)
+                if sort_by is not None and len(positions) == limit:
+                    break
+        if sort_by is None:
+            positions.sort()
+        return positions[:limit]
+
+
+class NumberCatalog:
+    """
+    An indexed copy of the numbers available to lease.
+
+    The catalog is fetched with `Leases.get_available_numbers()` on first use and again once it is
+    older than `ttl` seconds. Each fetch builds hash indexes on location, carrier and capabilities,
+    and sorted indexes on monthly rate and reputation, so `find()` does not scan the whole catalog.
+    """
+
+    def __init__(
+        self,
+        leases: Leases,
+        /,
+        *,
+        ttl: float = DEFAULT_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._leases = leases
+        self.ttl = ttl
+        self._clock = clock
+        self._index: _CatalogIndex | None = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def refresh(self) -> None:
+        """Fetch the catalog and rebuild its indexes now."""
+        numbers = self._leases.get_available_numbers()
+        index = _CatalogIndex(numbers)
+        self._index, self._expires_at = index, self._clock() + self.ttl
+        logger.debug("indexed %d available numbers", len(numbers))
+
+    def find(  # noqa: PLR0913
+        self,
+        *,
+        country: str | None = None,
+        region: str | None = None,
+        city: str | None = None,
+        carrier: Carrier | None = None,
+        channels: Collection[str] = (),
+        intl_sms: bool | None = None,
+        min_monthly_rate: float | None = None,
+        max_monthly_rate: float | None = None,
+        min_reputation: float | None = None,
+        sort_by: CatalogSortKey | None = None,
+        descending: bool = False,
+        limit: int | None = None,
+    ) -> list[NumberDetails]:
+        """
+        Return the available numbers matching every given filter.
+
+        `region` is matched within `country`, and `city` within `region`. Numbers must support all of `channels`.
+        Results are in catalog order unless `sort_by` is given.
+        """
+        index = self._current()
+        if city is not None and (country is None or region is None):
+            msg = "city requires country and region"
+            raise ValueError(msg)
+        if region is not None and country is None:
+            msg = "region requires country"
+            raise ValueError(msg)
+
+        candidates = index.matching(
+            country=country,
+            region=region,
+            city=city,
+            carrier=carrier,
+            channels=channels,
+            intl_sms=intl_sms,
+        )
+        positions = index.select(
+            candidates,
+            min_monthly_rate=min_monthly_rate if min_monthly_rate is not None else float("-inf"),
+            max_monthly_rate=max_monthly_rate if max_monthly_rate is not None else float("inf"),
+            min_reputation=min_reputation if min_reputation is not None else float("-inf"),
+            sort_by=sort_by,
+            descending=descending,
+            limit=limit,
+        )
+        return [index.numbers[position] for position in positions]
+
+    def get(self, number: str, /) -> NumberDetails | None:
+        """Return the available number with the E.164 id `number`, or `None` if it is not available."""
+        return self._current().by_id.get(number)
+
+    def __len__(self) -> int:
+        return len(self._current().numbers)
+
+    def _current(self) -> _CatalogIndex:
+        index = self._index
+        if index is not None and self._clock() < self._expires_at:
+            return index
+        with self._lock:
+            # Another thread may have refreshed the catalog while this one waited.
+            if self._index is None or self._clock() >= self._expires_at:
+                self.refresh()
+            return self._index  # type: ignore[return-value]
+
+
+class CatalogChanges(Struct):
+    """The numbers added to, removed from and changed in the catalog since the previous poll."""
+
+    added: list[NumberDetails] = []
+    removed: list[NumberDetails] = []
+    changed: list[NumberDetails] = []
+    """The new details of numbers that changed, such as in price or reputation."""
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+class _NumberId(Struct):
+    id: str
+
+
+class _RawNumbersResponse(Struct):
+    data: list[msgspec.Raw]
+
+
+class _NumberIdsResponse(Struct):
+    data: list[_NumberId]
+
+
+_raw_decoder = msgspec.json.Decoder(_RawNumbersResponse)
+_ids_decoder = msgspec.json.Decoder(_NumberIdsResponse)
+_number_decoder = msgspec.json.Decoder(NumberDetails)
+
+
+class CatalogWatcher:
+    """
+    Polls the numbers available to lease and reports only what changed.
+
+    Each poll compares the raw JSON of every number with the previous poll by `id`, so only added and changed
+    numbers are decoded, and an unchanged catalog answered with `304 Not Modified` is not diffed at all.
+    The first poll reports the whole catalog as added.
+
+    The interval adapts to the catalog: it is halved, down to `min_interval`, after a poll that found changes,
+    and grows by half, up to `max_interval`, after one that did not. Changes are passed to the callbacks
+    given to `subscribe()` from a background thread started with `start()`, or yielded by `changes()` in async code.
+    """
+
+    def __init__(
+        self,
+        leases: Leases,
+        /,
+        *,
+        interval: float = DEFAULT_POLL_INTERVAL,
+        min_interval: float = DEFAULT_MIN_POLL_INTERVAL,
+        max_interval: float = DEFAULT_MAX_POLL_INTERVAL,
+    ) -> None:
+        if not 0 < min_interval <= interval <= max_interval:
+            msg = "intervals must satisfy 0 < min_interval <= interval <= max_interval"
+            raise ValueError(msg)
+        self._leases = leases
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._snapshot: dict[str, bytes] = {}
+        self._etag: str | None = None
+        self._callbacks: list[Callable[[CatalogChanges], object]] = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def subscribe(self, callback: Callable[[CatalogChanges], object], /) -> Callable[[], None]:
+        """Call `callback` with the changes found by each poll, and return a function that unsubscribes it."""
+        self._callbacks.append(callback)
+        return lambda: self._callbacks.remove(callback)
+
+    def poll(self) -> CatalogChanges:
+        """Fetch the catalog now, pass any changes to the callbacks and return them."""
+        with self._lock:
+            changes = self._poll()
+            self._adapt(changed=bool(changes))
+        if changes:
+            for callback in list(self._callbacks):
+                callback(changes)
+        return changes
+
+    def start(self) -> None:
+        """Start polling in a background thread, first polling immediately."""
+        if self._thread is not None:
+            msg = "watcher is already running"
+            raise RuntimeError(msg)
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread, waiting for a poll in progress to finish."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    async def changes(self) -> AsyncIterator[CatalogChanges]:
+        """Poll from async code, making requests in a worker thread, and yield the changes of each poll."""
+        while True:
+            try:
+                changes = await asyncio.to_thread(self.poll)
+            except Exception:
+                logger.warning("failed to poll available numbers", exc_info=True)
+                with self._lock:
+                    self._adapt(changed=False)
+            else:
+                if changes:
+                    yield changes
+            await asyncio.sleep(self.interval)
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self.poll()
+            except Exception:
+                logger.warning("failed to poll available numbers", exc_info=True)
+                with self._lock:
+                    self._adapt(changed=False)
+            self._stopped.wait(self.interval)
+
+    def _adapt(self, *, changed: bool) -> None:
+        if changed:
+            self.interval = max(self.min_interval, self.interval / 2)
+        else:
+            self.interval = min(self.max_interval, self.interval * 1.5)
+
+    def _poll(self) -> CatalogChanges:
+        raw_numbers = self._leases.get_available_numbers_raw(etag=self._etag)
+        if raw_numbers is None:
+            return CatalogChanges()
+        self._etag = raw_numbers.etag
+
+        # Raw items reference the response body, so numbers are only decoded if they were added or changed.
+        items = _raw_decoder.decode(raw_numbers.content).data
+        number_ids = _ids_decoder.decode(raw_numbers.content).data
+        previous = self._snapshot
+        current: dict[str, bytes] = {}
+        changes = CatalogChanges()
+        for raw, number_id in zip(items, number_ids, strict=True):
+            content = bytes(raw)
+            current[number_id.id] = content
+            old = previous.get(number_id.id)
+            if old is None:
+                changes.added.append(_number_decoder.decode(content))
+            elif old != content:
+                number = _number_decoder.decode(content)
+                # The same details may be serialized differently, so compare them decoded.
+                if number != _number_decoder.decode(old):
+                    changes.changed.append(number)
+        changes.removed = [_number_decoder.decode(old) for i, old in previous.items() if i not in current]
+        self._snapshot = current
+        logger.debug(
+            "%d numbers added, %d removed, %d changed",
+            len(changes.added),
+            len(changes.removed),
+            len(changes.changed),
+        )
+        return changes
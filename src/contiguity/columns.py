@@ -0,0 +1,275 @@
+from array import array
+from collections.abc import Iterable, Sequence
+from typing import TYPE_CHECKING, Any, Literal, TypeAlias
+
+from .leases import NumberDetails
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+StringColumn = Literal["country", "region", "city", "carrier", "status", "currency"]
+NumericColumn = Literal["monthly_rate", "upfront_fee", "reputation", "previous_owners", "created_at"]
+
+# Row positions, as a NumPy array when filtered with NumPy.
+_Rows: TypeAlias = "npt.NDArray[Any] | Sequence[int]"
+
+CHANNELS = ("sms", "mms", "rcs", "imessage", "whatsapp")
+
+
+class _DictionaryColumn:
+    """A string column stored as integer codes into a list of distinct values."""
+
+    __slots__ = ("codes", "values")
+
+    def __init__(self, codes: array, values: list[str]) -> None:
+        self.codes = codes
+        self.values = values
+
+    @classmethod
+    def encode(cls, strings: Iterable[str]) -> "_DictionaryColumn":
+        lookup: dict[str, int] = {}
+        codes = array("I", (lookup.setdefault(string, len(lookup)) for string in strings))
+        return cls(codes, list(lookup))
+
+    def code(self, value: str) -> int | None:
+        try:
+            return self.values.index(value)
+        except ValueError:
+            return None
+
+    def take(self, rows: _Rows) -> "_DictionaryColumn":
+        return _DictionaryColumn(_take(self.codes, rows), self.values)
+
+
+def _take(column: array, rows: _Rows) -> array:
+    if np is not None:
+        taken = array(column.typecode)
+        taken.frombytes(np.frombuffer(column, dtype=column.typecode)[np.asarray(rows, dtype=np.intp)].tobytes())
+        return taken
+    return array(column.typecode, [column[row] for row in rows])
+
+
+class NumberColumns:
+    """
+    A columnar copy of many `NumberDetails`, for filtering and aggregating them without walking nested structs.
+
+    Numeric fields are stored in `array` columns, strings are dictionary-encoded as integer codes, and channels
+    as a bitmask per number, using a fraction of the memory of the structs. When NumPy is installed,
+    filters and aggregates run on zero-copy NumPy views of the columns; otherwise they run in Python.
+
+        columns = NumberColumns.from_numbers(client.leases.get_available_numbers())
+        columns.where(country="US", channel="imessage").mean_by("monthly_rate", "region")
+    """
+
+    def __init__(
+        self,
+        ids: list[str],
+        strings: dict[str, _DictionaryColumn],
+        numbers: dict[str, array],
+        channels: array,
+        intl_sms: array,
+    ) -> None:
+        self.ids = ids
+        self._strings = strings
+        self._numbers = numbers
+        self._channels = channels
+        self._intl_sms = intl_sms
+
+    @classmethod
+    def from_numbers(cls, numbers: Iterable[NumberDetails], /) -> "NumberColumns":
+        numbers = list(numbers)
+        bits = {channel: 1 << i for i, channel in enumerate(CHANNELS)}
+        return cls(
+            ids=[n.id for n in numbers],
+            strings={
+                "country": _DictionaryColumn.encode(n.location.country for n in numbers),
+                "region": _DictionaryColumn.encode(n.location.region for n in numbers),
+                "city": _DictionaryColumn.encode(n.location.city for n in numbers),
+                "carrier": _DictionaryColumn.encode(n.carrier for n in numbers),
+                "status": _DictionaryColumn.encode(n.status for n in numbers),
+                "currency": _DictionaryColumn.encode(n.pricing.currency for n in numbers),
+            },
+            numbers={
+                "monthly_rate": array("d", (n.pricing.monthly_rate for n in numbers)),
+                "upfront_fee": array("d", (n.pricing.upfront_fee for n in numbers)),
+                "reputation": array("d", (n.health.reputation for n in numbers)),
+                "previous_owners": array("i", (n.health.previous_owners for n in numbers)),
+                "created_at": array("q", (n.created_at for n in numbers)),
+            },
+            channels=array("B", (sum(bits[c] for c in set(n.capabilities.channels)) for n in numbers)),
+            intl_sms=array("b", (n.capabilities.intl_sms for n in numbers)),
+        )
+
+    def column(self, name: StringColumn | NumericColumn, /) -> list[str] | array:
+        """Return a column: decoded strings for string columns, or the `array` itself for numeric ones."""
+        if name in self._strings:
+            strings = self._strings[name]
+            return [strings.values[code] for code in strings.codes]
+        return self._numbers[name]
+
+    def to_numpy(self, name: NumericColumn, /) -> "npt.NDArray[Any]":
+        """Return a read-only NumPy view of a numeric column, without copying it."""
+        if np is None:
+            msg = "to_numpy() requires NumPy to be installed"
+            raise ImportError(msg)
+        column = self._numbers[name]
+        view = np.frombuffer(column, dtype=column.typecode)
+        view.flags.writeable = False
+        return view
+
+    def where(  # noqa: PLR0913
+        self,
+        *,
+        country: str | None = None,
+        region: str | None = None,
+        city: str | None = None,
+        carrier: str | None = None,
+        status: str | None = None,
+        channel: str | None = None,
+        intl_sms: bool | None = None,
+        max_monthly_rate: float | None = None,
+        min_reputation: float | None = None,
+        max_previous_owners: int | None = None,
+    ) -> "NumberColumns":
+        """Return the numbers matching every given filter."""
+        equal = {"country": country, "region": region, "city": city, "carrier": carrier, "status": status}
+        codes = {}
+        for name, value in equal.items():
+            if value is not None:
+                code = self._strings[name].code(value)
+                if code is None:
+                    return self._take([])
+                codes[name] = code
+        bit = None
+        if channel is not None:
+            if channel not in CHANNELS:
+                msg = f"unknown channel {channel!r}"
+                raise ValueError(msg)
+            bit = 1 << CHANNELS.index(channel)
+        ranges = {
+            "monthly_rate": (None, max_monthly_rate),
+            "reputation": (min_reputation, None),
+            "previous_owners": (None, max_previous_owners),
+        }
+        ranges = {name: bounds for name, bounds in ranges.items() if bounds != (None, None)}
+        if np is not None:
+            return self._take(self._where_numpy(codes=codes, bit=bit, intl_sms=intl_sms, ranges=ranges))
+        return self._take(self._where_python(codes=codes, bit=bit, intl_sms=intl_sms, ranges=ranges))
+
+    def mean(self, value: NumericColumn, /) -> float | None:
+        column = self._numbers[value]
+        if not column:
+            return None
+        if np is not None:
+            return float(np.frombuffer(column, dtype=column.typecode).mean())
+        return sum(column) / len(column)
+
+    def mean_by(self, value: NumericColumn, by: StringColumn, /) -> dict[str, float]:
+        """Return the mean of `value` for each distinct value of `by`, such as the average monthly rate by region."""
+        totals, counts = self._group_sums(value, by)
+        values = self._strings[by].values
+        return {values[code]: totals[code] / counts[code] for code in range(len(values)) if counts[code]}
+
+    def count_by(self, by: StringColumn, /) -> dict[str, int]:
+        _, counts = self._group_sums(None, by)
+        values = self._strings[by].values
+        return {values[code]: int(counts[code]) for code in range(len(values)) if counts[code]}
+
+    def nbytes(self) -> int:
+        """Return the approximate memory used by the columns, excluding the ids."""
+        arrays = [*self._numbers.values(), self._channels, self._intl_sms]
+        arrays += [strings.codes for strings in self._strings.values()]
+        return sum(column.itemsize * len(column) for column in arrays)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _group_sums(
+        self,
+        value: NumericColumn | None,
+        by: StringColumn,
+    ) -> tuple["npt.NDArray[Any] | Sequence[float]", "npt.NDArray[Any] | Sequence[int]"]:
+        strings = self._strings[by]
+        size = len(strings.values)
+        if np is not None:
+            codes = np.frombuffer(strings.codes, dtype=strings.codes.typecode)
+            counts = np.bincount(codes, minlength=size)
+            if value is None:
+                return counts, counts
+            column = self._numbers[value]
+            totals = np.bincount(codes, weights=np.frombuffer(column, dtype=column.typecode), minlength=size)
+            return totals, counts
+        totals = [0.0] * size
+        counts = [0] * size
+        values = self._numbers[value] if value is not None else None
+        for row, code in enumerate(strings.codes):
+            counts[code] += 1
+            if values is not None:
+                totals[code] += values[row]
+        return totals, counts
+
+    def _where_numpy(
+        self,
+        *,
+        codes: dict[str, int],
+        bit: int | None,
+        intl_sms: bool | None,
+        ranges: dict[str, tuple[float | None, float | None]],
+    ) -> "npt.NDArray[Any]":
+        if np is None:
+            msg = "filtering with NumPy requires NumPy to be installed"
+            raise ImportError(msg)
+        mask = np.ones(len(self), dtype=bool)
+        for name, code in codes.items():
+            column = self._strings[name].codes
+            mask &= np.frombuffer(column, dtype=column.typecode) == code
+        if bit is not None:
+            mask &= (np.frombuffer(self._channels, dtype=np.uint8) & bit) != 0
+        if intl_sms is not None:
+            mask &= np.frombuffer(self._intl_sms, dtype=np.int8) == intl_sms
+        for name, (low, high) in ranges.items():
+            column = np.frombuffer(self._numbers[name], dtype=self._numbers[name].typecode)
+            if low is not None:
+                mask &= column >= low
+            if high is not None:
+                mask &= column <= high
+        return np.flatnonzero(mask)
+
+    def _where_python(
+        self,
+        *,
+        codes: dict[str, int],
+        bit: int | None,
+        intl_sms: bool | None,
+        ranges: dict[str, tuple[float | None, float | None]],
+    ) -> list[int]:
+        rows: Iterable[int] = range(len(self))
+        for name, code in codes.items():
+            column = self._strings[name].codes
+            rows = [row for row in rows if column[row] == code]
+        if bit is not None:
+            rows = [row for row in rows if self._channels[row] & bit]
+        if intl_sms is not None:
+            rows = [row for row in rows if self._intl_sms[row] == intl_sms]
+        for name, (low, high) in ranges.items():
+            column = self._numbers[name]
+            low_value = low if low is not None else float("-inf")
+            high_value = high if high is not None else float("inf")
+            rows = [row for row in rows if low_value <= column[row] <= high_value]
+        return list(rows)
+
+    def _take(self, rows: _Rows) -> "NumberColumns":
+        return NumberColumns(
+            ids=[
+                self.ids[row] for row in (rows.tolist() if np is not None and isinstance(rows, np.ndarray) else rows)
+            ],
+            strings={name: strings.take(rows) for name, strings in self._strings.items()},
+            numbers={name: _take(column, rows) for name, column in self._numbers.items()},
+            channels=_take(self._channels, rows),
+            intl_sms=_take(self._intl_sms, rows),
+        )
@@ -0,0 +1,243 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Mapping
+from os import PathLike
+from typing import Any, NamedTuple
+
+import msgspec
+
+from ._attachments import StreamingBody
+from ._client import ApiClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 24 * 60 * 60
+DEFAULT_MAXSIZE = 100_000
+
+
+class DedupInfo(NamedTuple):
+    hits: int
+    misses: int
+    size: int
+
+
+class DedupStore(ABC):
+    """
+    Remembers the API response of recent sends so that repeats can be skipped.
+
+    A send is identified by the caller-supplied `dedup_key`, or by a hash of its request body.
+    Repeats within `ttl` seconds return the original response without making a request.
+    """
+
+    def __init__(self, *, ttl: float = DEFAULT_TTL, maxsize: int = DEFAULT_MAXSIZE) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(path: str, content: bytes, key: str | None = None) -> str:
+        if key is not None:
+            return f"{path}:{key}"
+        return f"{path}#{hashlib.blake2b(content, digest_size=16).hexdigest()}"
+
+    def get(self, key: str, /) -> bytes | None:
+        value = self._get(key, time.time())
+        with self._lock:
+            if value is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return value
+
+    def put(self, key: str, value: bytes, /) -> None:
+        self._put(key, value, time.time() + self.ttl)
+
+    def info(self) -> DedupInfo:
+        return DedupInfo(hits=self._hits, misses=self._misses, size=len(self))
+
+    @abstractmethod
+    def _get(self, key: str, now: float) -> bytes | None: ...
+
+    @abstractmethod
+    def _put(self, key: str, value: bytes, expires_at: float) -> None: ...
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+
+class MemoryDedupStore(DedupStore):
+    """An in-process `DedupStore` that evicts the oldest entries first."""
+
+    def __init__(self, *, ttl: float = DEFAULT_TTL, maxsize: int = DEFAULT_MAXSIZE) -> None:
+        super().__init__(ttl=ttl, maxsize=maxsize)
+        self._entries: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+
+    def _get(self, key: str, now: float) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= now:
+                del self._entries[key]
+                return None
+            return value
+
+    def _put(self, key: str, value: bytes, expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            # All entries share one TTL, so insertion order is also expiry order.
+            now = expires_at - self.ttl
+            while self._entries:
+                oldest_key, (_, oldest_expires_at) = next(iter(self._entries.items()))
+                if oldest_expires_at > now and len(self._entries) <= self.maxsize:
+                    break
+                del self._entries[oldest_key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteDedupStore(DedupStore):
+    """A `DedupStore` in a SQLite database, which can be shared by several processes on one host."""
+
+    PRUNE_INTERVAL = 1000
+
+    def __init__(
+        self,
+        path: str | PathLike[str],
+        /,
+        *,
+        ttl: float = DEFAULT_TTL,
+        maxsize: int = DEFAULT_MAXSIZE,
+    ) -> None:
+        super().__init__(ttl=ttl, maxsize=maxsize)
+        self._connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS contiguity_sends"
+            " (key TEXT PRIMARY KEY, response BLOB NOT NULL, expires_at REAL NOT NULL)",
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS contiguity_sends_expires_at ON contiguity_sends (expires_at)",
+        )
+        self._puts = 0
+
+    def _get(self, key: str, now: float) -> bytes | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT response FROM contiguity_sends WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def _put(self, key: str, value: bytes, expires_at: float) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO contiguity_sends (key, response, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at),
+            )
+            self._puts += 1
+            if self._puts % self.PRUNE_INTERVAL == 0:
+                self._prune(expires_at - self.ttl)
+
+    def _prune(self, now: float) -> None:
+        self._connection.execute("DELETE FROM contiguity_sends WHERE expires_at <= ?", (now,))
+        self._connection.execute(
+            "DELETE FROM contiguity_sends WHERE key IN"
+            " (SELECT key FROM contiguity_sends ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+            (self.maxsize,),
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM contiguity_sends")
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM contiguity_sends").fetchone()[0]
+
+
+def post_once(  # noqa: PLR0913
+    client: ApiClient,
+    path: str,
+    payload: Mapping[str, Any] | bytes | StreamingBody,
+    *,
+    store: DedupStore | None,
+    key: str | None,
+    fail_message: str,
+) -> bytes:
+    """
+    Send `payload` to `path` unless an identical send is remembered by `store`, and return the response body.
+
+    `payload` may be a mapping to encode as JSON, an already encoded request body,
+    or a `StreamingBody`, which is identified by its fingerprint rather than by reading its files.
+    """
+    if isinstance(payload, StreamingBody):
+        return _post_streaming(client, path, payload, store=store, key=key, fail_message=fail_message)
+    if store is None:
+        if key is not None:
+            msg = "dedup_key requires the product to be configured with a dedup store"
+            raise ValueError(msg)
+        if isinstance(payload, bytes):
+            response = client.post(path, content=payload)
+        else:
+            response = client.post(path, json=payload)
+        client.handle_error(response, fail_message=fail_message)
+        return response.content
+
+    content = payload if isinstance(payload, bytes) else msgspec.json.encode(payload)
+    key = store.make_key(path, content, key)
+    cached = store.get(key)
+    if cached is not None:
+        logger.debug("skipping duplicate send to %s with key %r", path, key)
+        return cached
+
+    response = client.post(path, content=content)
+    client.handle_error(response, fail_message=fail_message)
+    store.put(key, response.content)
+    return response.content
+
+
+def _post_streaming(  # noqa: PLR0913
+    client: ApiClient,
+    path: str,
+    body: StreamingBody,
+    *,
+    store: DedupStore | None,
+    key: str | None,
+    fail_message: str,
+) -> bytes:
+    if store is None and key is not None:
+        msg = "dedup_key requires the product to be configured with a dedup store"
+        raise ValueError(msg)
+    if store is not None:
+        key = store.make_key(path, body.fingerprint, key)
+        cached = store.get(key)
+        if cached is not None:
+            logger.debug("skipping duplicate send to %s with key %r", path, key)
+            return cached
+
+    response = client.post(path, content=iter(body), headers={"Content-Length": str(body.length)})
+    client.handle_error(response, fail_message=fail_message)
+    if store is not None and key is not None:
+        store.put(key, response.content)
+    return response.content
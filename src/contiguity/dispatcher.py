@@ -0,0 +1,122 @@
+import asyncio
+import logging
+from collections import deque
+from collections.abc import Callable
+from types import TracebackType
+from typing import Any, Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+ResponseT = TypeVar("ResponseT")
+
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_MAX_PENDING = 1000
+
+_Conversation = tuple[str | None, str]
+
+
+class ConversationDispatcher(Generic[ResponseT]):
+    """
+    Sends messages in order within each conversation and in parallel across conversations.
+
+    A conversation is identified by its (`from_`, `to`) pair. Messages to one conversation are sent one
+    at a time in the order they were submitted, while different conversations share a pool of
+    `max_concurrency` concurrent sends. Once `max_pending` messages are queued or in flight,
+    `submit()` waits for room. A failed send does not stop later messages in its conversation.
+
+    Wraps any send method that takes `to` and `from_` keyword arguments, such as `client.imessage.send`,
+    and calls it in worker threads:
+
+        async with ConversationDispatcher(client.imessage.send) as dispatcher:
+            await dispatcher.send(to="+15555555555", message="Hello")
+    """
+
+    def __init__(
+        self,
+        send: Callable[..., ResponseT],
+        /,
+        *,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_pending: int = DEFAULT_MAX_PENDING,
+    ) -> None:
+        if max_concurrency < 1 or max_pending < 1:
+            msg = "max_concurrency and max_pending must be at least 1"
+            raise ValueError(msg)
+        self._send = send
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._room = asyncio.Semaphore(max_pending)
+        self._queues: dict[_Conversation, deque[tuple[dict[str, Any], asyncio.Future[ResponseT]]]] = {}
+        self._workers: set[asyncio.Task[None]] = set()
+        self._closed = False
+
+    async def submit(self, *, to: str, from_: str | None = None, **kwargs: Any) -> "asyncio.Future[ResponseT]":  # noqa: ANN401
+        """
+        Queue a message and return a future for its response, waiting first if the dispatcher is full.
+
+        Keyword arguments are passed to the send method along with `to` and `from_`.
+        """
+        if self._closed:
+            msg = "dispatcher is closed"
+            raise RuntimeError(msg)
+        await self._room.acquire()
+        future: asyncio.Future[ResponseT] = asyncio.get_running_loop().create_future()
+        conversation = (from_, to)
+        queue = self._queues.get(conversation)
+        if queue is None:
+            queue = self._queues[conversation] = deque()
+            worker = asyncio.create_task(self._drain(conversation, queue))
+            self._workers.add(worker)
+            worker.add_done_callback(self._workers.discard)
+        queue.append(({"to": to, "from_": from_, **kwargs}, future))
+        return future
+
+    async def send(self, *, to: str, from_: str | None = None, **kwargs: Any) -> ResponseT:  # noqa: ANN401
+        """Queue a message and wait for its response."""
+        return await (await self.submit(to=to, from_=from_, **kwargs))
+
+    def pending(self) -> int:
+        """Return the number of messages queued or in flight."""
+        return sum(len(queue) for queue in self._queues.values())
+
+    async def aclose(self) -> None:
+        """Stop accepting messages and wait until every queued message has been sent."""
+        self._closed = True
+        while self._workers:
+            await asyncio.gather(*self._workers)
+
+    async def __aenter__(self) -> "ConversationDispatcher[ResponseT]":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.aclose()
+
+    async def _drain(
+        self,
+        conversation: _Conversation,
+        queue: deque[tuple[dict[str, Any], "asyncio.Future[ResponseT]"]],
+    ) -> None:
+        # One worker per conversation preserves its order; the worker exits once the queue is empty.
+        try:
+            while queue:
+                kwargs, future = queue[0]
+                try:
+                    async with self._slots:
+                        response = await asyncio.to_thread(self._send, **kwargs)
+                except Exception as exc:  # noqa: BLE001
+                    if not future.done():
+                        future.set_exception(exc)
+                else:
+                    if not future.done():
+                        future.set_result(response)
+                queue.popleft()
+                self._room.release()
+        finally:
+            del self._queues[conversation]
+            for _, future in queue:
+                future.cancel()
+                self._room.release()
@@ -59,23 +59,21 @@ class Domains(BaseProduct):
         )
 
         self._client.handle_error(response, fail_message="failed to register domain")
+        self._client.invalidate("/domains", f"/domains/{domain}")
         data = decode_response(response.content, type=PartialDomain)
         logger.debug("successfully registered domain %r", domain)
         return data
 
     def list(self) -> list[PartialDomain]:
-        response = self._client.get("/domains")
-        self._client.handle_error(response, fail_message="failed to list domains")
-        return decode_response(response.content, type=list[PartialDomain])
+        return self._client.get_decoded("/domains", type=list[PartialDomain], fail_message="failed to list domains")
 
     def get(self, domain: str, /) -> Domain:
-        response = self._client.get(f"/domains/{domain}")
-        self._client.handle_error(response, fail_message="failed to get domain")
-        return decode_response(response.content, type=Domain)
+        return self._client.get_decoded(f"/domains/{domain}", type=Domain, fail_message="failed to get domain")
 
     def delete(self, domain: str, /) -> DeleteDomainResponse:
         response = self._client.delete(f"/domains/{domain}")
         self._client.handle_error(response, fail_message="failed to delete domain")
+        self._client.invalidate("/domains", f"/domains/{domain}")
         data = decode_response(response.content, type=DeleteDomainResponse)
         logger.debug("successfully deleted domain %r", domain)
         return data
@@ -1,18 +1,135 @@
+import functools
 import logging
-from collections.abc import Mapping, Sequence
-from typing import overload
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator, Mapping, Sequence
+from os import PathLike
+from types import MappingProxyType
+from typing import Any, NoReturn, overload
 
+import msgspec
+from msgspec import Struct
+
+from ._attachments import EmailAttachment, StreamingBody
+from ._bulk import DEFAULT_MAX_WORKERS, BulkResult, aiter_items, amap_bounded, chunked, map_bounded
+from ._client import ApiClient
 from ._product import BaseProduct
+from ._ratelimit import TokenBucket
 from ._response import BaseResponse, decode_response
+from ._template import MessageTemplate, TemplateCompiler
+from .dedup import DedupStore, post_once
+from .suppression import SuppressedRecipientError, SuppressionList
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_BCC_BATCH_SIZE = 50
+
 
 class EmailResponse(BaseResponse):
     email_id: str
 
 
+class EmailRecipient(Struct, frozen=True):
+    to: str
+    """The recipient's email address."""
+    variables: Mapping[str, Any] = {}
+    """Values for the template fields in the subject and body. Without them, the email is sent as written."""
+    subject: str | None = None
+    """Replaces the shared subject for this recipient."""
+    reply_to: str | None = None
+    """Replaces the shared reply-to address for this recipient."""
+    cc: str | Sequence[str] | None = None
+    """Replaces the shared CC addresses for this recipient."""
+    headers: Mapping[str, str] | None = None
+    """Extra headers for this recipient, added to the shared headers."""
+
+    def has_overrides(self) -> bool:
+        return any(value is not None for value in (self.subject, self.reply_to, self.cc, self.headers))
+
+
+class EmailMessage:
+    """
+    An immutable email that can be sent to many recipients.
+
+    The message is validated and its request body encoded once, when it is created.
+    Sending it with `Email.send_message()` only splices the recipient's address into the cached bytes,
+    so large bodies are never copied or re-encoded per send.
+    """
+
+    __slots__ = (
+        "_prefix",
+        "_suffix",
+        "bcc",
+        "body_html",
+        "body_text",
+        "cc",
+        "from_",
+        "headers",
+        "reply_to",
+        "subject",
+    )
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        from_: str,
+        subject: str,
+        body_text: str | None = None,
+        body_html: str | None = None,
+        reply_to: str | None = None,
+        cc: str | Sequence[str] | None = None,
+        bcc: str | Sequence[str] | None = None,
+        headers: Mapping[str, str] | None = None,
+    ) -> None:
+        fields = {
+            "from_": from_,
+            "subject": subject,
+            "body_text": body_text,
+            "body_html": body_html,
+            "reply_to": reply_to,
+            "cc": cc if cc is None or isinstance(cc, str) else tuple(cc),
+            "bcc": bcc if bcc is None or isinstance(bcc, str) else tuple(bcc),
+            "headers": MappingProxyType(dict(headers)) if headers is not None else None,
+        }
+        compiler = TemplateCompiler()
+        email_payload = Email._payload(  # noqa: SLF001
+            to=compiler.recipient(),
+            from_=from_,
+            subject=subject,
+            body_text=body_text,
+            body_html=body_html,
+            reply_to=reply_to,
+            cc=fields["cc"],
+            bcc=fields["bcc"],
+            headers=headers,
+        )
+        prefix, _, suffix = compiler.fragments(email_payload)
+        fields.update(_prefix=prefix, _suffix=suffix)
+        for name, value in fields.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: object) -> NoReturn:
+        msg = f"{type(self).__name__} is immutable"
+        raise AttributeError(msg)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(from_={self.from_!r}, subject={self.subject!r})"
+
+    def encode(self, *, to: str) -> bytes:
+        """Return the encoded request body for sending this message to `to`."""
+        return b"".join((self._prefix, msgspec.json.encode(to), self._suffix))
+
+
 class Email(BaseProduct):
+    def __init__(
+        self,
+        *,
+        client: ApiClient,
+        dedup: DedupStore | None = None,
+        suppression: SuppressionList | None = None,
+    ) -> None:
+        super().__init__(client=client)
+        self._dedup = dedup
+        self._suppression = suppression
+
     @overload
     def send(
         self,
@@ -25,6 +142,8 @@ class Email(BaseProduct):
         cc: str | Sequence[str] | None = None,
         bcc: str | Sequence[str] | None = None,
         headers: Mapping[str, str] | None = None,
+        attachments: Sequence[str | PathLike[str] | EmailAttachment] | None = None,
+        dedup_key: str | None = None,
     ) -> EmailResponse: ...
 
     @overload
@@ -39,6 +158,8 @@ class Email(BaseProduct):
         cc: str | Sequence[str] | None = None,
         bcc: str | Sequence[str] | None = None,
         headers: Mapping[str, str] | None = None,
+        attachments: Sequence[str | PathLike[str] | EmailAttachment] | None = None,
+        dedup_key: str | None = None,
     ) -> EmailResponse: ...
 
     def send(  # noqa: PLR0913
@@ -53,6 +174,8 @@ class Email(BaseProduct):
         cc: str | Sequence[str] | None = None,
         bcc: str | Sequence[str] | None = None,
         headers: Mapping[str, str] | None = None,
+        attachments: Sequence[str | PathLike[str] | EmailAttachment] | None = None,
+        dedup_key: str | None = None,
     ) -> EmailResponse:
         """
         Send an email.
@@ -66,11 +189,337 @@ class Email(BaseProduct):
             html (str, optional): The HTML email body. Provide one body.
             reply_to (str, optional): The reply-to email address.
             cc (str, optional): The CC email addresses.
+            attachments (list, optional): Local files to attach, as paths or `EmailAttachment` objects.
+                Files are streamed into the request rather than read into memory.
+            dedup_key (str, optional): Identifies this message when the product has a dedup store.
+                Defaults to a hash of the request body.
         Returns:
             dict: The response object.
         Raises:
             ValueError: Raises an error if required fields are missing or sending the email fails.
+            SuppressedRecipientError: Raised without sending if `to`, `cc` or `bcc` is on the product's
+                suppression list.
+        """
+        self._check_suppression(to, cc, bcc)
+        email_payload = self._payload(
+            to=to,
+            from_=from_,
+            subject=subject,
+            body_text=body_text,
+            body_html=body_html,
+            reply_to=reply_to,
+            cc=cc,
+            bcc=bcc,
+            headers=headers,
+        )
+        body: dict[str, object] | StreamingBody = email_payload
+        if attachments:
+            compiler = TemplateCompiler()
+            email_payload["attachments"] = compiler.slot()
+            prefix, suffix = compiler.split(email_payload)
+            body = StreamingBody(prefix, attachments, suffix)
+
+        content = post_once(
+            self._client,
+            "/send/email",
+            body,
+            store=self._dedup,
+            key=dedup_key,
+            fail_message="failed to send email",
+        )
+        data = decode_response(content, type=EmailResponse)
+        logger.debug("successfully sent email to %r", to)
+        return data
+
+    def send_message(self, message: EmailMessage, /, *, to: str, dedup_key: str | None = None) -> EmailResponse:
+        """Send a pre-encoded `EmailMessage` to `to`."""
+        self._check_suppression(to, message.cc, message.bcc)
+        content = post_once(
+            self._client,
+            "/send/email",
+            message.encode(to=to),
+            store=self._dedup,
+            key=dedup_key,
+            fail_message="failed to send email",
+        )
+        data = decode_response(content, type=EmailResponse)
+        logger.debug("successfully sent email to %r", to)
+        return data
+
+    def template(  # noqa: PLR0913
+        self,
+        *,
+        from_: str,
+        subject: str,
+        body_text: str | None = None,
+        body_html: str | None = None,
+        reply_to: str | None = None,
+        cc: str | Sequence[str] | None = None,
+        bcc: str | Sequence[str] | None = None,
+        headers: Mapping[str, str] | None = None,
+    ) -> MessageTemplate[EmailResponse]:
+        """
+        Compile an email for sending to many recipients.
+
+        `subject`, `body_text` and `body_html` are `str.format` templates whose named fields
+        are filled in on each send. Literal braces, such as those in inline CSS, must be doubled.
+        Recipients on the product's suppression list are rejected on each send, and suppressed `cc` or `bcc`
+        addresses when the template is compiled.
+        """
+        self._check_suppression(None, cc, bcc)
+        compiler = TemplateCompiler()
+        email_payload = self._payload(
+            to=compiler.recipient(),
+            from_=from_,
+            subject=compiler.field(subject),
+            body_text=compiler.field(body_text) if body_text else None,
+            body_html=compiler.field(body_html) if body_html else None,
+            reply_to=reply_to,
+            cc=cc,
+            bcc=bcc,
+            headers=headers,
+        )
+        return compiler.compile(
+            email_payload,
+            client=self._client,
+            path="/send/email",
+            response_type=EmailResponse,
+            fail_message="failed to send email",
+            description="email",
+            suppression=self._suppression,
+        )
+
+    def send_many(  # noqa: PLR0913
+        self,
+        recipients: Iterable[str | EmailRecipient],
+        /,
+        *,
+        from_: str,
+        subject: str,
+        body_text: str | None = None,
+        body_html: str | None = None,
+        reply_to: str | None = None,
+        cc: str | Sequence[str] | None = None,
+        bcc: str | Sequence[str] | None = None,
+        headers: Mapping[str, str] | None = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limit: float | None = None,
+    ) -> Iterator[BulkResult[EmailRecipient, EmailResponse]]:
+        """
+        Send one email to many recipients, yielding a result per recipient as each send completes.
+
+        Recipients without `variables` or overrides are sent a single `EmailMessage`, encoded once, so braces
+        in the subject and bodies, such as those in inline CSS, are sent as written. For recipients with
+        `variables`, `subject`, `body_text` and `body_html` are `str.format` templates compiled once with
+        `template()`, and their fields are filled in from the recipient's `variables`.
+        A recipient's `subject`, `reply_to`, `cc` and `headers` override the shared ones for that recipient only.
+        Recipients are consumed lazily and sent by `max_workers` threads, at most `rate_limit` sends per second.
+        Failed sends are reported in the result's `error` instead of being raised.
+        """
+        send = self._bulk_sender(
+            from_=from_,
+            subject=subject,
+            body_text=body_text,
+            body_html=body_html,
+            reply_to=reply_to,
+            cc=cc,
+            bcc=bcc,
+            headers=headers,
+        )
+        return map_bounded(
+            send,
+            map(_as_recipient, recipients),
+            max_workers=max_workers,
+            rate_limiter=TokenBucket(rate_limit) if rate_limit is not None else None,
+        )
+
+    def send_many_async(  # noqa: PLR0913
+        self,
+        recipients: Iterable[str | EmailRecipient] | AsyncIterable[str | EmailRecipient],
+        /,
+        *,
+        from_: str,
+        subject: str,
+        body_text: str | None = None,
+        body_html: str | None = None,
+        reply_to: str | None = None,
+        cc: str | Sequence[str] | None = None,
+        bcc: str | Sequence[str] | None = None,
+        headers: Mapping[str, str] | None = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limit: float | None = None,
+    ) -> AsyncIterator[BulkResult[EmailRecipient, EmailResponse]]:
+        """Like `send_many()`, but as an async iterator that also accepts an async iterable of recipients."""
+        send = self._bulk_sender(
+            from_=from_,
+            subject=subject,
+            body_text=body_text,
+            body_html=body_html,
+            reply_to=reply_to,
+            cc=cc,
+            bcc=bcc,
+            headers=headers,
+        )
+        return amap_bounded(
+            send,
+            _as_recipients_async(recipients),
+            max_workers=max_workers,
+            rate_limiter=TokenBucket(rate_limit) if rate_limit is not None else None,
+        )
+
+    def send_bcc_batches(  # noqa: PLR0913
+        self,
+        recipients: Iterable[str],
+        /,
+        *,
+        to: str,
+        from_: str,
+        subject: str,
+        body_text: str | None = None,
+        body_html: str | None = None,
+        reply_to: str | None = None,
+        headers: Mapping[str, str] | None = None,
+        batch_size: int = DEFAULT_BCC_BATCH_SIZE,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limit: float | None = None,
+    ) -> Iterator[BulkResult[tuple[str, ...], EmailResponse]]:
+        """
+        Send one non-personalized email to many recipients, packing them into BCC batches.
+
+        Each batch of up to `batch_size` recipients is sent as a single email addressed to `to`,
+        with the batch as its BCC list. Batches are sent by `max_workers` threads, at most `rate_limit`
+        requests per second, and a result is yielded per batch as it completes.
+        Each result's `item` holds the recipients of that batch, and its `response` the shared `email_id`.
+        Recipients on the product's suppression list are left out of the batches, and each is reported
+        in a result of its own with a `SuppressedRecipientError`.
         """
+        self._check_suppression(to, None, None)
+        compiler = TemplateCompiler()
+        email_payload = self._payload(
+            to=to,
+            from_=from_,
+            subject=subject,
+            body_text=body_text,
+            body_html=body_html,
+            reply_to=reply_to,
+            cc=None,
+            bcc=compiler.slot(),
+            headers=headers,
+        )
+        prefix, suffix = compiler.split(email_payload)
+
+        def send_batch(batch: tuple[str, ...]) -> EmailResponse:
+            content = b"".join((prefix, msgspec.json.encode(batch), suffix))
+            response = self._client.post("/send/email", content=content)
+            self._client.handle_error(response, fail_message="failed to send email")
+            data = decode_response(response.content, type=EmailResponse)
+            logger.debug("successfully sent email %r to %d BCC recipients", data.email_id, len(batch))
+            return data
+
+        suppressed: list[str] = []
+        results = map_bounded(
+            send_batch,
+            chunked(self._unsuppressed(recipients, suppressed), batch_size),
+            max_workers=max_workers,
+            rate_limiter=TokenBucket(rate_limit) if rate_limit is not None else None,
+        )
+        return _with_suppressed(results, suppressed)
+
+    @property
+    def suppression(self) -> SuppressionList | None:
+        return self._suppression
+
+    def _bulk_sender(  # noqa: PLR0913
+        self,
+        *,
+        from_: str,
+        subject: str,
+        body_text: str | None,
+        body_html: str | None,
+        reply_to: str | None,
+        cc: str | Sequence[str] | None,
+        bcc: str | Sequence[str] | None,
+        headers: Mapping[str, str] | None,
+    ) -> Callable[[EmailRecipient], EmailResponse]:
+        self._check_suppression(None, cc, bcc)
+        message = EmailMessage(
+            from_=from_,
+            subject=subject,
+            body_text=body_text,
+            body_html=body_html,
+            reply_to=reply_to,
+            cc=cc,
+            bcc=bcc,
+            headers=headers,
+        )
+
+        # Compiled on first use, so a body that is not a valid template only fails sends that fill it in.
+        @functools.cache
+        def template() -> MessageTemplate[EmailResponse]:
+            return self.template(
+                from_=from_,
+                subject=subject,
+                body_text=body_text,
+                body_html=body_html,
+                reply_to=reply_to,
+                cc=cc,
+                bcc=bcc,
+                headers=headers,
+            )
+
+        def send(recipient: EmailRecipient) -> EmailResponse:
+            if recipient.has_overrides():
+                variables = recipient.variables
+                return self.send(  # type: ignore[call-overload]
+                    to=recipient.to,
+                    from_=from_,
+                    subject=_fill(recipient.subject or subject, variables),
+                    body_text=_fill(body_text, variables),
+                    body_html=_fill(body_html, variables),
+                    reply_to=recipient.reply_to or reply_to,
+                    cc=recipient.cc if recipient.cc is not None else cc,
+                    bcc=bcc,
+                    headers={**(headers or {}), **(recipient.headers or {})} or None,
+                )
+            if recipient.variables:
+                return template().send(to=recipient.to, variables=recipient.variables)
+            return self.send_message(message, to=recipient.to)
+
+        return send
+
+    def _check_suppression(
+        self,
+        to: str | None,
+        cc: str | Sequence[str] | None,
+        bcc: str | Sequence[str] | None,
+    ) -> None:
+        if self._suppression is None:
+            return
+        for addresses in (to, cc, bcc):
+            for address in [addresses] if isinstance(addresses, str) else addresses or ():
+                self._suppression.check(address)
+
+    def _unsuppressed(self, recipients: Iterable[str], suppressed: list[str]) -> Iterator[str]:
+        for recipient in recipients:
+            if self._suppression is not None and self._suppression.is_suppressed(recipient):
+                logger.debug("leaving suppressed recipient %r out of BCC batch", recipient)
+                suppressed.append(recipient)
+            else:
+                yield recipient
+
+    @staticmethod
+    def _payload(  # noqa: PLR0913
+        *,
+        to: str,
+        from_: str,
+        subject: str,
+        body_text: str | None,
+        body_html: str | None,
+        reply_to: str | None,
+        cc: str | Sequence[str] | None,
+        bcc: str | Sequence[str] | None,
+        headers: Mapping[str, str] | None,
+    ) -> dict[str, object]:
         if not body_text and not body_html:
             msg = "either text or html body must be provided"
             raise ValueError(msg)
@@ -88,13 +537,36 @@ class Email(BaseProduct):
             "bcc": bcc,
             "headers": headers,
         }
+        return {k: v for k, v in email_payload.items() if v}
 
-        response = self._client.post(
-            "/send/email",
-            json={k: v for k, v in email_payload.items() if v},
-        )
 
-        self._client.handle_error(response, fail_message="failed to send email")
-        data = decode_response(response.content, type=EmailResponse)
-        logger.debug("successfully sent email to %r", to)
-        return data
+def _with_suppressed(
+    results: Iterator[BulkResult[tuple[str, ...], EmailResponse]],
+    suppressed: list[str],
+) -> Iterator[BulkResult[tuple[str, ...], EmailResponse]]:
+    # Recipients are filtered as batches are formed, so report them as they are found among the results.
+    def flush() -> Iterator[BulkResult[tuple[str, ...], EmailResponse]]:
+        while suppressed:
+            recipient = suppressed.pop(0)
+            msg = f"recipient {recipient!r} is on the suppression list"
+            yield BulkResult(item=(recipient,), error=SuppressedRecipientError(msg))
+
+    for result in results:
+        yield from flush()
+        yield result
+    yield from flush()
+
+
+def _fill(template: str | None, variables: Mapping[str, Any]) -> str | None:
+    return template.format_map(variables) if template and variables else template
+
+
+def _as_recipient(recipient: str | EmailRecipient) -> EmailRecipient:
+    return EmailRecipient(to=recipient) if isinstance(recipient, str) else recipient
+
+
+async def _as_recipients_async(
+    recipients: Iterable[str | EmailRecipient] | AsyncIterable[str | EmailRecipient],
+) -> AsyncIterator[EmailRecipient]:
+    async for recipient in aiter_items(recipients):
+        yield _as_recipient(recipient)
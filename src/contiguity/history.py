@@ -0,0 +1,283 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterable
+from os import PathLike
+
+import msgspec
+
+from .imessage import History, HistoryChat, HistoryMessage, HistoryReaction, IMessage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_AGE = 10.0
+DEFAULT_FETCH_LIMIT = 20
+DEFAULT_MAX_FETCH_LIMIT = 1000
+
+_message_decoder = msgspec.json.Decoder(HistoryMessage)
+_reaction_decoder = msgspec.json.Decoder(HistoryReaction)
+_chat_decoder = msgspec.json.Decoder(HistoryChat)
+
+
+def _item_key(*parts: object) -> bytes:
+    return hashlib.blake2b(msgspec.json.encode(parts), digest_size=16).digest()
+
+
+class HistoryStore:
+    """
+    A local copy of conversation histories in a SQLite database.
+
+    Messages are identified by their sender, recipient, content and timestamp,
+    so storing a message again updates its delivery and read status instead of duplicating it.
+    Ranges from which messages may be missing are recorded as gaps until a later merge covers them.
+    """
+
+    def __init__(self, path: str | PathLike[str], /) -> None:
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS contiguity_history_messages
+                (conversation TEXT NOT NULL, key BLOB NOT NULL, timestamp INTEGER NOT NULL, item BLOB NOT NULL,
+                 PRIMARY KEY (conversation, key));
+            CREATE INDEX IF NOT EXISTS contiguity_history_messages_timestamp
+                ON contiguity_history_messages (conversation, timestamp);
+            CREATE TABLE IF NOT EXISTS contiguity_history_reactions
+                (conversation TEXT NOT NULL, key BLOB NOT NULL, timestamp INTEGER NOT NULL, item BLOB NOT NULL,
+                 PRIMARY KEY (conversation, key));
+            CREATE INDEX IF NOT EXISTS contiguity_history_reactions_timestamp
+                ON contiguity_history_reactions (conversation, timestamp);
+            CREATE TABLE IF NOT EXISTS contiguity_history_conversations
+                (conversation TEXT PRIMARY KEY, chat BLOB NOT NULL, synced_at REAL NOT NULL);
+            CREATE TABLE IF NOT EXISTS contiguity_history_gaps
+                (conversation TEXT NOT NULL, after_timestamp INTEGER NOT NULL, before_timestamp INTEGER NOT NULL,
+                 PRIMARY KEY (conversation, after_timestamp));
+            """,
+        )
+
+    def newest(self, conversation: str, /) -> int | None:
+        """Return the timestamp of the newest stored message in `conversation`."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT MAX(timestamp) FROM contiguity_history_messages WHERE conversation = ?",
+                (conversation,),
+            ).fetchone()
+        return row[0]
+
+    def count(self, conversation: str, /) -> int:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM contiguity_history_messages WHERE conversation = ?",
+                (conversation,),
+            ).fetchone()[0]
+
+    def synced_at(self, conversation: str, /) -> float | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT synced_at FROM contiguity_history_conversations WHERE conversation = ?",
+                (conversation,),
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def gaps(self, conversation: str, /) -> list[tuple[int, int]]:
+        """
+        Return the `(after, before)` timestamp ranges of `conversation`, oldest first,
+        strictly between which stored messages may be missing.
+        """
+        with self._lock:
+            return self._connection.execute(
+                "SELECT after_timestamp, before_timestamp FROM contiguity_history_gaps WHERE conversation = ?"
+                " ORDER BY after_timestamp",
+                (conversation,),
+            ).fetchall()
+
+    def merge(  # noqa: PLR0913
+        self,
+        conversation: str,
+        /,
+        *,
+        messages: Iterable[HistoryMessage],
+        reactions: Iterable[HistoryReaction],
+        chat: HistoryChat,
+        synced_at: float,
+        gap: tuple[int, int] | None = None,
+    ) -> None:
+        """
+        Store `messages`, which must be the newest messages of `conversation` without omissions,
+        and clear the gaps they cover. `gap` records a range that they do not connect to the stored messages.
+        """
+        message_rows = [
+            (conversation, _item_key(m.to, m.from_, m.message, m.timestamp), m.timestamp, msgspec.json.encode(m))
+            for m in messages
+        ]
+        reaction_rows = [
+            (
+                conversation,
+                _item_key(r.from_, r.reaction, r.on, r.action, r.timestamp),
+                r.timestamp,
+                msgspec.json.encode(r),
+            )
+            for r in reactions
+        ]
+        oldest = min((row[2] for row in message_rows), default=None)
+        with self._lock:
+            self._connection.execute("BEGIN")
+            try:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO contiguity_history_messages (conversation, key, timestamp, item)"
+                    " VALUES (?, ?, ?, ?)",
+                    message_rows,
+                )
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO contiguity_history_reactions (conversation, key, timestamp, item)"
+                    " VALUES (?, ?, ?, ?)",
+                    reaction_rows,
+                )
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO contiguity_history_conversations (conversation, chat, synced_at)"
+                    " VALUES (?, ?, ?)",
+                    (conversation, msgspec.json.encode(chat), synced_at),
+                )
+                if oldest is not None:
+                    self._connection.execute(
+                        "DELETE FROM contiguity_history_gaps WHERE conversation = ? AND after_timestamp >= ?",
+                        (conversation, oldest),
+                    )
+                if gap is not None:
+                    self._connection.execute(
+                        "INSERT OR REPLACE INTO contiguity_history_gaps"
+                        " (conversation, after_timestamp, before_timestamp) VALUES (?, ?, ?)",
+                        (conversation, *gap),
+                    )
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+
+    def history(self, conversation: str, /, *, limit: int) -> History | None:
+        """
+        Return the newest `limit` stored messages of `conversation` in chronological order,
+        with the reactions made since the oldest of them.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT chat FROM contiguity_history_conversations WHERE conversation = ?",
+                (conversation,),
+            ).fetchone()
+            if row is None:
+                return None
+            messages = self._connection.execute(
+                "SELECT timestamp, item FROM contiguity_history_messages WHERE conversation = ?"
+                " ORDER BY timestamp DESC LIMIT ?",
+                (conversation, limit),
+            ).fetchall()
+            since = messages[-1][0] if messages else 0
+            reactions = self._connection.execute(
+                "SELECT item FROM contiguity_history_reactions WHERE conversation = ? AND timestamp >= ?"
+                " ORDER BY timestamp",
+                (conversation, since),
+            ).fetchall()
+        chat = _chat_decoder.decode(row[0])
+        chat.limit = limit
+        chat.count = len(messages)
+        return History(
+            conversation=[_message_decoder.decode(item) for _, item in reversed(messages)],
+            reactions=[_reaction_decoder.decode(item) for (item,) in reactions],
+            chat=chat,
+        )
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+class HistorySync:
+    """
+    Serves iMessage histories from a `HistoryStore`, fetching only what is new.
+
+    A conversation synced within the last `max_age` seconds is read from the store without a request.
+    Otherwise the most recent `fetch_limit` messages are fetched and merged. As the API has no way
+    to ask for messages after a timestamp, the fetch is repeated with a doubled limit, up to `max_fetch_limit`,
+    until it reaches a message that was already stored. If more than `max_fetch_limit` messages arrived
+    since the last sync, the older of them are not fetched: a warning is logged and the range is recorded
+    in `HistoryStore.gaps` until a later fetch of at least as many messages covers it.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        imessage: IMessage,
+        store: HistoryStore,
+        /,
+        *,
+        max_age: float = DEFAULT_MAX_AGE,
+        fetch_limit: int = DEFAULT_FETCH_LIMIT,
+        max_fetch_limit: int = DEFAULT_MAX_FETCH_LIMIT,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._imessage = imessage
+        self._store = store
+        self.max_age = max_age
+        self.fetch_limit = fetch_limit
+        self.max_fetch_limit = max_fetch_limit
+        self._clock = clock
+
+    def get_history(self, *, to: str, from_: str, limit: int = 20) -> History:
+        """Return the newest `limit` messages of the conversation in chronological order, syncing it if stale."""
+        conversation = f"{to}:{from_}"
+        synced_at = self._store.synced_at(conversation)
+        history = None
+        if synced_at is not None and self._clock() - synced_at < self.max_age:
+            history = self._store.history(conversation, limit=limit)
+        if history is None or len(history.conversation) < min(limit, history.chat.total):
+            self.sync(to=to, from_=from_, limit=limit)
+            history = self._store.history(conversation, limit=limit)
+        if history is None:
+            msg = f"history of {conversation!r} was not synced"
+            raise RuntimeError(msg)
+        return history
+
+    def sync(self, *, to: str, from_: str, limit: int = DEFAULT_FETCH_LIMIT) -> int:
+        """
+        Fetch and store the messages and reactions newer than the stored ones, and return the number of new messages.
+
+        If fewer than `limit` messages are stored, the newest `limit` messages are fetched instead.
+        """
+        conversation = f"{to}:{from_}"
+        newest = self._store.newest(conversation)
+        backfill = self._store.count(conversation) < limit
+        fetch_limit = max(limit, self.fetch_limit) if backfill else self.fetch_limit
+        while True:
+            history = self._imessage.get_history(to=to, from_=from_, limit=fetch_limit)
+            messages = history.conversation
+            if (
+                backfill
+                or newest is None
+                or len(messages) < fetch_limit
+                or fetch_limit >= self.max_fetch_limit
+                or any(message.timestamp <= newest for message in messages)
+            ):
+                break
+            fetch_limit = min(2 * fetch_limit, self.max_fetch_limit)
+
+        # Already stored messages are merged too, to update their delivery and read status.
+        new_messages = sum(newest is None or message.timestamp > newest for message in messages)
+        gap = None
+        if newest is not None and len(messages) >= fetch_limit and new_messages == len(messages):
+            gap = (newest, min(message.timestamp for message in messages))
+            logger.warning(
+                "history of %r has a gap: more than %d messages arrived since the last sync",
+                conversation,
+                fetch_limit,
+            )
+        self._store.merge(
+            conversation,
+            messages=messages,
+            reactions=history.reactions,
+            chat=history.chat,
+            synced_at=self._clock(),
+            gap=gap,
+        )
+        logger.debug("synced %d new messages of %r", new_messages, conversation)
+        return new_messages
@@ -1,6 +1,9 @@
+import asyncio
 import logging
+from collections.abc import AsyncIterator, Iterator
 from typing import Literal
 
+import msgspec
 from msgspec import Struct
 
 from ._instant_messaging import InstantMessagingClient
@@ -75,6 +78,19 @@ class History(Struct):
     chat: HistoryChat
 
 
+class _RawHistory(Struct):
+    conversation: list[msgspec.Raw]
+    reactions: list[msgspec.Raw]
+
+
+class _RawHistoryResponse(Struct):
+    data: _RawHistory
+
+
+_message_decoder = msgspec.json.Decoder(HistoryMessage)
+_reaction_decoder = msgspec.json.Decoder(HistoryReaction)
+
+
 class IMessage(InstantMessagingClient[FallbackCause]):
     @property
     def _api_path(self) -> str:
@@ -97,9 +113,48 @@ class IMessage(InstantMessagingClient[FallbackCause]):
         return data
 
     def get_history(self, *, to: str, from_: str, limit: int = 20) -> History:
+        return decode_response(self._get_history(to=to, from_=from_, limit=limit), type=History)
+
+    def iter_history(
+        self,
+        *,
+        to: str,
+        from_: str,
+        limit: int = 20,
+    ) -> Iterator[HistoryMessage | HistoryReaction]:
+        """
+        Yield the messages of a conversation, followed by its reactions, decoding each one only when it is reached.
+
+        Unlike `get_history()`, the decoded history is never held in memory as a whole:
+        only the response body is kept, and each item is decoded from it as the iterator advances.
+        """
+        return _decode_history(self._get_history(to=to, from_=from_, limit=limit))
+
+    async def iter_history_async(
+        self,
+        *,
+        to: str,
+        from_: str,
+        limit: int = 20,
+    ) -> AsyncIterator[HistoryMessage | HistoryReaction]:
+        """Like `iter_history()`, but as an async iterator that makes the request in a worker thread."""
+        content = await asyncio.to_thread(self._get_history, to=to, from_=from_, limit=limit)
+        for item in _decode_history(content):
+            yield item
+
+    def _get_history(self, *, to: str, from_: str, limit: int) -> bytes:
         response = self._client.post(
             f"/history/{self._api_path}/{to}/{from_}/{limit}",
         )
 
         self._client.handle_error(response, fail_message="failed to get message history")
-        return decode_response(response.content, type=History)
+        return response.content
+
+
+def _decode_history(content: bytes) -> Iterator[HistoryMessage | HistoryReaction]:
+    # Raw items reference the response body without decoding or copying it.
+    history = msgspec.json.decode(content, type=_RawHistoryResponse).data
+    for raw in history.conversation:
+        yield _message_decoder.decode(raw)
+    for raw in history.reactions:
+        yield _reaction_decoder.decode(raw)
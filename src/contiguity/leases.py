@@ -1,7 +1,19 @@
-from typing import Literal
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+from http import HTTPStatus
+from typing import Literal, NamedTuple
 
 from msgspec import Struct
 
+from ._bulk import (
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_RETRIES,
+    DEFAULT_RETRY_BACKOFF,
+    BulkResult,
+    amap_bounded,
+    map_bounded,
+    with_retries,
+)
+from ._client import is_retryable, is_retryable_unprocessed
 from ._product import BaseProduct
 from ._response import decode_response
 
@@ -20,9 +32,12 @@ class NumberLocation(Struct):
     city: str
 
 
+LeaseChannel = Literal["sms", "mms", "rcs", "imessage", "whatsapp"]
+
+
 class NumberCapabilities(Struct):
     intl_sms: bool
-    channels: list[Literal["sms", "mms", "rcs", "imessage", "whatsapp"]]
+    channels: list[LeaseChannel]
 
 
 class NumberHealth(Struct):
@@ -77,21 +92,47 @@ class TerminateLeaseResponse(Struct):
     terminated_at: int
 
 
+class RawNumbers(NamedTuple):
+    content: bytes
+    """The undecoded response body, as returned by the API."""
+    etag: str | None
+
+
 class Leases(BaseProduct):
     def get_available_numbers(self) -> list[NumberDetails]:
-        response = self._client.get("/leases")
+        return self._client.get_decoded(
+            "/leases",
+            type=list[NumberDetails],
+            fail_message="failed to get available numbers",
+        )
+
+    def get_available_numbers_raw(self, *, etag: str | None = None) -> RawNumbers | None:
+        """
+        Fetch the numbers available to lease without decoding them, or return `None` if they are unchanged.
+
+        When `etag` is given, the request is conditional, and `None` is returned if the API answers
+        `304 Not Modified` because the catalog still has that ETag.
+        """
+        headers = {"If-None-Match": etag} if etag is not None else {}
+        response = self._client.get("/leases", headers=headers)
+        if response.status_code == HTTPStatus.NOT_MODIFIED:
+            return None
         self._client.handle_error(response, fail_message="failed to get available numbers")
-        return decode_response(response.content, type=list[NumberDetails])
+        return RawNumbers(content=response.content, etag=response.headers.get("etag"))
 
     def get_leased_numbers(self) -> list[NumberDetails]:
-        response = self._client.get("/leased")
-        self._client.handle_error(response, fail_message="failed to get leased numbers")
-        return decode_response(response.content, type=list[NumberDetails])
+        return self._client.get_decoded(
+            "/leased",
+            type=list[NumberDetails],
+            fail_message="failed to get leased numbers",
+        )
 
     def get_number_details(self, number: str, /) -> NumberDetails:
-        response = self._client.get(f"/lease/{number}")
-        self._client.handle_error(response, fail_message="failed to get number details")
-        return decode_response(response.content, type=NumberDetails)
+        return self._client.get_decoded(
+            f"/lease/{number}",
+            type=NumberDetails,
+            fail_message="failed to get number details",
+        )
 
     def lease_number(
         self,
@@ -106,10 +147,100 @@ class Leases(BaseProduct):
             json={"billing_method": billing_method},
         )
         self._client.handle_error(response, fail_message="failed to lease number")
+        self._client.invalidate("/leases", "/leased", f"/lease/{number}")
         return decode_response(response.content, type=NumberDetails)
 
     def terminate_lease(self, number: NumberDetails | str, /) -> TerminateLeaseResponse:
         number = number.id if isinstance(number, NumberDetails) else number
         response = self._client.delete(f"/leased/{number}")
         self._client.handle_error(response, fail_message="failed to terminate lease")
+        self._client.invalidate("/leases", "/leased", f"/lease/{number}")
         return decode_response(response.content, type=TerminateLeaseResponse)
+
+    def lease_numbers(
+        self,
+        numbers: Iterable[NumberDetails | str],
+        /,
+        *,
+        billing_method: Literal["monthly", "service_contract"],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        retries: int = DEFAULT_RETRIES,
+        retry_backoff: float = DEFAULT_RETRY_BACKOFF,
+    ) -> Iterator[BulkResult[NumberDetails | str, NumberDetails]]:
+        """
+        Lease many numbers, yielding a result per number as each lease completes.
+
+        Numbers are leased by `max_workers` threads. Leasing is not idempotent, so only errors raised before the
+        API acted on the request, rate limits, 503s and failures to connect, are retried. They are retried
+        up to `retries` times, waiting `retry_backoff` seconds and doubling the wait after each attempt.
+        Failed leases are reported in the result's `error` instead of being raised.
+        """
+        return map_bounded(
+            with_retries(
+                lambda number: self.lease_number(number, billing_method=billing_method),
+                retries=retries,
+                backoff=retry_backoff,
+                should_retry=is_retryable_unprocessed,
+            ),
+            numbers,
+            max_workers=max_workers,
+        )
+
+    def lease_numbers_async(
+        self,
+        numbers: Iterable[NumberDetails | str] | AsyncIterable[NumberDetails | str],
+        /,
+        *,
+        billing_method: Literal["monthly", "service_contract"],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        retries: int = DEFAULT_RETRIES,
+        retry_backoff: float = DEFAULT_RETRY_BACKOFF,
+    ) -> AsyncIterator[BulkResult[NumberDetails | str, NumberDetails]]:
+        """Like `lease_numbers()`, but runs at most `max_workers` leases at a time from async code."""
+        return amap_bounded(
+            with_retries(
+                lambda number: self.lease_number(number, billing_method=billing_method),
+                retries=retries,
+                backoff=retry_backoff,
+                should_retry=is_retryable_unprocessed,
+            ),
+            numbers,
+            max_workers=max_workers,
+        )
+
+    def terminate_leases(
+        self,
+        numbers: Iterable[NumberDetails | str],
+        /,
+        *,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        retries: int = DEFAULT_RETRIES,
+        retry_backoff: float = DEFAULT_RETRY_BACKOFF,
+    ) -> Iterator[BulkResult[NumberDetails | str, TerminateLeaseResponse]]:
+        """
+        Terminate many leases, yielding a result per number as each completes.
+
+        Terminating a lease is idempotent, so rate limited, server and network errors are all retried,
+        with the same backoff as `lease_numbers()`.
+        """
+        return map_bounded(
+            with_retries(self.terminate_lease, retries=retries, backoff=retry_backoff, should_retry=is_retryable),
+            numbers,
+            max_workers=max_workers,
+        )
+
+    def terminate_leases_async(
+        self,
+        numbers: Iterable[NumberDetails | str] | AsyncIterable[NumberDetails | str],
+        /,
+        *,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        retries: int = DEFAULT_RETRIES,
+        retry_backoff: float = DEFAULT_RETRY_BACKOFF,
+    ) -> AsyncIterator[BulkResult[NumberDetails | str, TerminateLeaseResponse]]:
+        """Like `terminate_leases()`, but runs at most `max_workers` terminations at a time from async code."""
+        return amap_bounded(
+            with_retries(self.terminate_lease, retries=retries, backoff=retry_backoff, should_retry=is_retryable),
+            numbers,
+            max_workers=max_workers,
+        )
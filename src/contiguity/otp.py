@@ -1,13 +1,17 @@
 import logging
 from enum import Enum
 
-import phonenumbers
-
+from ._client import ApiClient
+from ._phone import PhoneNumberNormalizer, default_normalizer
 from ._product import BaseProduct
 from ._response import BaseResponse, decode_response
+from ._singleflight import SingleFlight
+from .dedup import MemoryDedupStore, post_once
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_RESEND_COOLDOWN = 10.0
+
 
 class OTPLanguage(str, Enum):
     ENGLISH = "en"
@@ -61,6 +65,32 @@ class OTPVerifyResponse(BaseResponse):
 
 
 class OTP(BaseProduct):
+    """
+    Send and verify one-time passwords.
+
+    Concurrent identical `verify()` or `resend()` calls, such as those from a double-tapped button,
+    share a single request and its result. A successful resend is also remembered for `resend_cooldown` seconds,
+    during which further resends of the same OTP return the same response without a request.
+    Set `resend_cooldown` to `None` to disable this.
+    """
+
+    def __init__(
+        self,
+        *,
+        client: ApiClient,
+        phone_numbers: PhoneNumberNormalizer | None = None,
+        resend_cooldown: float | None = DEFAULT_RESEND_COOLDOWN,
+    ) -> None:
+        super().__init__(client=client)
+        self._phone_numbers = phone_numbers or default_normalizer
+        self._resend_cooldown = MemoryDedupStore(ttl=resend_cooldown) if resend_cooldown else None
+        self._resends: SingleFlight[str, OTPResendResponse] = SingleFlight()
+        self._verifications: SingleFlight[tuple[str, str], OTPVerifyResponse] = SingleFlight()
+
+    @property
+    def phone_numbers(self) -> PhoneNumberNormalizer:
+        return self._phone_numbers
+
     def send(
         self,
         to: str,
@@ -69,7 +99,7 @@ class OTP(BaseProduct):
         name: str | None = None,
         language: OTPLanguage = OTPLanguage.ENGLISH,
     ) -> OTPSendResponse:
-        e164 = phonenumbers.format_number(phonenumbers.parse(to), phonenumbers.PhoneNumberFormat.E164)
+        e164 = self._phone_numbers.normalize(to)
 
         response = self._client.post(
             "/otp/new",
@@ -86,23 +116,41 @@ class OTP(BaseProduct):
         return data
 
     def resend(self, otp_id: str, /) -> OTPResendResponse:
-        response = self._client.post(
+        return self._resends.do(otp_id, lambda: self._resend(otp_id))
+
+    async def resend_async(self, otp_id: str, /) -> OTPResendResponse:
+        """Like `resend()`, but runs the request in a worker thread."""
+        return await self._resends.do_async(otp_id, lambda: self._resend(otp_id))
+
+    def verify(self, otp: int | str, /, *, otp_id: str) -> OTPVerifyResponse:
+        code = str(otp)
+        return self._verifications.do((otp_id, code), lambda: self._verify(code, otp_id=otp_id))
+
+    async def verify_async(self, otp: int | str, /, *, otp_id: str) -> OTPVerifyResponse:
+        """Like `verify()`, but runs the request in a worker thread."""
+        code = str(otp)
+        return await self._verifications.do_async((otp_id, code), lambda: self._verify(code, otp_id=otp_id))
+
+    def _resend(self, otp_id: str) -> OTPResendResponse:
+        content = post_once(
+            self._client,
             "/otp/resend",
-            json={
+            {
                 "otp_id": otp_id,
             },
+            store=self._resend_cooldown,
+            key=otp_id if self._resend_cooldown is not None else None,
+            fail_message="failed to resend OTP",
         )
-
-        self._client.handle_error(response, fail_message="failed to resend OTP")
-        data = decode_response(response.content, type=OTPResendResponse)
+        data = decode_response(content, type=OTPResendResponse)
         logger.debug("successfully resent OTP %r with status: %r", otp_id, data.resent)
         return data
 
-    def verify(self, otp: int | str, /, *, otp_id: str) -> OTPVerifyResponse:
+    def _verify(self, otp: str, *, otp_id: str) -> OTPVerifyResponse:
         response = self._client.post(
             "/otp/verify",
             json={
-                "otp": str(otp),
+                "otp": otp,
                 "otp_id": otp_id,
             },
         )
@@ -0,0 +1,241 @@
+import heapq
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+
+import msgspec
+from msgspec import Struct
+
+from .otp import OTP, OTPLanguage, OTPResendResponse, OTPVerifyResponse
+
+logger = logging.getLogger(__name__)
+
+# OTPs expire 15 minutes after they are sent.
+DEFAULT_TTL = 15 * 60
+DEFAULT_MAX_ATTEMPTS = 5
+
+
+class OTPSession(Struct):
+    otp_id: str
+    to: str
+    """The recipient's phone number in E.164 format."""
+    expires_at: float
+    """Unix timestamp after which the OTP can no longer be verified."""
+    session_id: str | None = None
+    """The caller's identifier for the session that requested the OTP."""
+    attempts: int = 0
+    """The number of verification attempts so far."""
+
+
+class OTPSessionBackend(ABC):
+    """
+    Shared storage for OTP sessions, so that several processes see the same pending OTPs.
+
+    Implementations store opaque values with an expiry, as offered by Redis or Memcached,
+    and counters that must be incremented atomically, as Redis `INCR` and Memcached `incr` do,
+    so that concurrent verifications in different processes cannot exceed the attempt limit.
+    """
+
+    @abstractmethod
+    def get(self, key: str, /) -> bytes | None: ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, /, *, ttl: float) -> None: ...
+
+    @abstractmethod
+    def delete(self, key: str, /) -> None: ...
+
+    @abstractmethod
+    def increment(self, key: str, /, *, ttl: float) -> int:
+        """Atomically add one to the counter at `key`, creating it with `ttl` if needed, and return its new value."""
+
+
+class OTPSessionStore:
+    """
+    Tracks the OTPs sent to each phone number until they are verified or expire.
+
+    `send()` returns the pending session when a number already has a live OTP, instead of sending another.
+    `verify()` counts attempts and refuses to verify once `max_attempts` is reached.
+    Sessions are kept in memory with a heap of expiry times. Pass a `backend` to share them between processes,
+    in which case the backend is consulted on each lookup.
+    """
+
+    def __init__(
+        self,
+        otp: OTP,
+        /,
+        *,
+        ttl: float = DEFAULT_TTL,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        backend: OTPSessionBackend | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._otp = otp
+        self.ttl = ttl
+        self.max_attempts = max_attempts
+        self._backend = backend
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._sessions: dict[str, OTPSession] = {}
+        self._session_ids: dict[str, str] = {}
+        self._expiry: list[tuple[float, str, str]] = []
+
+    def send(
+        self,
+        to: str,
+        /,
+        *,
+        name: str | None = None,
+        language: OTPLanguage = OTPLanguage.ENGLISH,
+        session_id: str | None = None,
+    ) -> OTPSession:
+        """Send an OTP to `to`, or return the live session if one is already pending."""
+        e164 = self._normalize(to)
+        session = self.live(e164)
+        if session is not None:
+            logger.debug("reusing pending OTP %r for %r", session.otp_id, to)
+            return session
+
+        response = self._otp.send(e164, name=name, language=language)
+        session = OTPSession(
+            otp_id=response.otp_id,
+            to=e164,
+            expires_at=self._clock() + self.ttl,
+            session_id=session_id,
+        )
+        self._save(session)
+        return session
+
+    def live(self, to: str, /) -> OTPSession | None:
+        """Return the pending session for the phone number `to`, if its OTP has not expired."""
+        to = self._normalize(to)
+        now = self._clock()
+        with self._lock:
+            self._prune(now)
+            session = self._sessions.get(to)
+        if self._backend is not None:
+            # The backend is the source of truth, as another process may have verified or replaced the OTP.
+            value = self._backend.get(_number_key(to))
+            if value is None:
+                self._forget(to)
+                return None
+            session = msgspec.json.decode(value, type=OTPSession)
+            self._remember(session)
+        if session is None or session.expires_at <= now:
+            return None
+        return session
+
+    def for_session(self, session_id: str, /) -> OTPSession | None:
+        """Return the pending session started with `session_id`."""
+        with self._lock:
+            to = self._session_ids.get(session_id)
+        if to is None and self._backend is not None:
+            value = self._backend.get(_session_key(session_id))
+            to = value.decode() if value is not None else None
+        session = self.live(to) if to is not None else None
+        return session if session is not None and session.session_id == session_id else None
+
+    def verify(self, to: str, otp: int | str, /) -> OTPVerifyResponse:
+        """
+        Verify `otp` against the pending OTP for the phone number `to`.
+
+        The session is discarded once verified.
+        Raises ValueError if there is no pending OTP or it has no attempts left.
+        """
+        session = self._pending(to)
+        self._count_attempt(session)
+        data = self._otp.verify(otp, otp_id=session.otp_id)
+        if data.verified:
+            self.discard(to)
+        return data
+
+    def resend(self, to: str, /) -> OTPResendResponse:
+        """Resend the pending OTP for the phone number `to`. Its expiry does not renew."""
+        return self._otp.resend(self._pending(to).otp_id)
+
+    def discard(self, to: str, /) -> None:
+        to = self._normalize(to)
+        session = self._forget(to)
+        if self._backend is not None:
+            self._backend.delete(_number_key(to))
+            if session is not None:
+                self._backend.delete(_attempts_key(session.otp_id))
+                if session.session_id is not None:
+                    self._backend.delete(_session_key(session.session_id))
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._prune(self._clock())
+            return len(self._sessions)
+
+    def _normalize(self, to: str) -> str:
+        return self._otp.phone_numbers.normalize(to)
+
+    def _pending(self, to: str) -> OTPSession:
+        session = self.live(to)
+        if session is None:
+            msg = f"no pending OTP for {to!r}"
+            raise ValueError(msg)
+        return session
+
+    def _count_attempt(self, session: OTPSession) -> None:
+        counted = None
+        if self._backend is not None:
+            # Counted by the backend, so that attempts made through other processes are included.
+            ttl = max(session.expires_at - self._clock(), 0)
+            counted = self._backend.increment(_attempts_key(session.otp_id), ttl=ttl)
+        with self._lock:
+            attempts = session.attempts + 1 if counted is None else counted
+            if attempts > self.max_attempts:
+                msg = f"too many verification attempts for OTP {session.otp_id!r}"
+                raise ValueError(msg)
+            session.attempts = attempts
+
+    def _save(self, session: OTPSession) -> None:
+        self._remember(session)
+        if self._backend is not None:
+            ttl = session.expires_at - self._clock()
+            self._backend.set(_number_key(session.to), msgspec.json.encode(session), ttl=ttl)
+            if session.session_id is not None:
+                self._backend.set(_session_key(session.session_id), session.to.encode(), ttl=ttl)
+
+    def _forget(self, to: str) -> OTPSession | None:
+        with self._lock:
+            session = self._sessions.pop(to, None)
+            if session is not None and session.session_id is not None:
+                self._session_ids.pop(session.session_id, None)
+        return session
+
+    def _remember(self, session: OTPSession) -> None:
+        with self._lock:
+            previous = self._sessions.get(session.to)
+            self._sessions[session.to] = session
+            if session.session_id is not None:
+                self._session_ids[session.session_id] = session.to
+            if previous is None or previous.otp_id != session.otp_id:
+                heapq.heappush(self._expiry, (session.expires_at, session.to, session.otp_id))
+
+    def _prune(self, now: float) -> None:
+        # Heap entries are not removed when sessions are discarded or replaced,
+        # so an entry only expires the session if it still holds the same OTP.
+        while self._expiry and self._expiry[0][0] <= now:
+            _, to, otp_id = heapq.heappop(self._expiry)
+            session = self._sessions.get(to)
+            if session is not None and session.otp_id == otp_id:
+                del self._sessions[to]
+                if session.session_id is not None:
+                    self._session_ids.pop(session.session_id, None)
+
+
+def _number_key(to: str) -> str:
+    return f"contiguity:otp:number:{to}"
+
+
+def _session_key(session_id: str) -> str:
+    return f"contiguity:otp:session:{session_id}"
+
+
+def _attempts_key(otp_id: str) -> str:
+    return f"contiguity:otp:attempts:{otp_id}"
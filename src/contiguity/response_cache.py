@@ -0,0 +1,150 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from typing import Any, NamedTuple
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+
+class ResponseCacheInfo(NamedTuple):
+    hits: int
+    revalidations: int
+    misses: int
+    size: int
+    nbytes: int
+
+
+class _CacheEntry(NamedTuple):
+    value: Any
+    etag: str | None
+    last_modified: str | None
+    expires_at: float
+    nbytes: int
+
+
+def _cache_control(headers: Mapping[str, str]) -> dict[str, str | None]:
+    directives: dict[str, str | None] = {}
+    for directive in headers.get("cache-control", "").split(","):
+        name, _, value = directive.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') if value else None
+    return directives
+
+
+class ResponseCache:
+    """
+    Caches the decoded responses of read requests, such as listing leased numbers or domains.
+
+    Responses are fresh for as long as their `Cache-Control` header allows and are returned without a request.
+    Stale responses are revalidated with `If-None-Match` and `If-Modified-Since`, and when the API replies
+    `304 Not Modified` the cached object is returned without downloading or decoding the body again.
+    Responses marked `no-store`, or that are neither fresh nor revalidatable, are not cached.
+    The least recently used responses are evicted once their bodies add up to more than `max_bytes`.
+
+    Cached objects are shared between calls and should not be modified.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._nbytes = 0
+        self._hits = 0
+        self._revalidations = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, key: str, /) -> tuple[Any, dict[str, str]]:
+        """
+        Return the cached value of `key` if it is fresh, and otherwise `None` with the headers to revalidate it.
+
+        A fresh value is returned with no headers.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None, {}
+            self._entries.move_to_end(key)
+            if self._clock() < entry.expires_at:
+                self._hits += 1
+                return entry.value, {}
+        headers = {}
+        if entry.etag is not None:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified is not None:
+            headers["If-Modified-Since"] = entry.last_modified
+        return None, headers
+
+    def revalidated(self, key: str, headers: Mapping[str, str], /) -> Any:  # noqa: ANN401
+        """Mark the entry of `key` as still valid after a `304 Not Modified` response, and return its value."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._revalidations += 1
+            self._entries[key] = entry._replace(
+                expires_at=self._expires_at(headers),
+                etag=headers.get("etag", entry.etag),
+                last_modified=headers.get("last-modified", entry.last_modified),
+            )
+            return entry.value
+
+    def store(self, key: str, value: Any, headers: Mapping[str, str], /, *, nbytes: int) -> None:  # noqa: ANN401
+        """Cache `value`, decoded from a response of `nbytes` bytes with `headers`, if the headers allow it."""
+        directives = _cache_control(headers)
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        expires_at = self._expires_at(headers)
+        cacheable = expires_at > self._clock() or etag is not None or last_modified is not None
+        with self._lock:
+            self._pop(key)
+            if "no-store" in directives or not cacheable or nbytes > self.max_bytes:
+                return
+            self._entries[key] = _CacheEntry(value, etag, last_modified, expires_at, nbytes)
+            self._nbytes += nbytes
+            while self._nbytes > self.max_bytes:
+                self._nbytes -= self._entries.popitem(last=False)[1].nbytes
+
+    def invalidate(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._pop(key)
+
+    def info(self) -> ResponseCacheInfo:
+        return ResponseCacheInfo(
+            hits=self._hits,
+            revalidations=self._revalidations,
+            misses=self._misses,
+            size=len(self),
+            nbytes=self._nbytes,
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _expires_at(self, headers: Mapping[str, str]) -> float:
+        directives = _cache_control(headers)
+        if "no-cache" in directives:
+            return float("-inf")
+        try:
+            max_age = int(directives.get("max-age") or 0) - int(headers.get("age", 0))
+        except ValueError:
+            max_age = 0
+        return self._clock() + max_age if max_age > 0 else float("-inf")
+
+    def _pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._nbytes -= entry.nbytes
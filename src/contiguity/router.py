@@ -0,0 +1,196 @@
+import functools
+import logging
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from typing import Any, Literal
+
+from msgspec import Struct
+
+from ._bulk import DEFAULT_MAX_WORKERS, BulkResult, map_bounded
+from ._client import ContiguityApiError
+from ._instant_messaging import IMSendResponse
+from ._ratelimit import TokenBucket
+from ._template import MessageTemplate
+from .capabilities import CapabilityCache, is_unreachable
+from .imessage import IMessage
+from .leases import NumberCapabilities, NumberDetails
+from .suppression import SuppressionList
+from .text import Text, TextResponse
+from .whatsapp import WhatsApp
+
+logger = logging.getLogger(__name__)
+
+RouteChannel = Literal["imessage", "whatsapp", "text"]
+
+DEFAULT_PREFERENCE: tuple[RouteChannel, ...] = ("imessage", "whatsapp", "text")
+_LEASE_CHANNELS: Mapping[str, RouteChannel] = {
+    "sms": "text",
+    "mms": "text",
+    "imessage": "imessage",
+    "whatsapp": "whatsapp",
+}
+
+
+class Recipient(Struct, frozen=True):
+    to: str
+    """The recipient's phone number."""
+    variables: Mapping[str, Any] = {}
+    """Values for the template fields in the message. Without them, the message is sent as written."""
+
+
+class RouteResponse(Struct):
+    """The outcome of a routed send."""
+
+    channel: RouteChannel
+    """The channel the message was sent on."""
+    message_id: str
+    rejected: tuple[RouteChannel, ...] = ()
+    """Channels tried first that could not reach the recipient."""
+
+
+class MessageRouter:
+    """
+    Sends each message on the best channel for its recipient.
+
+    Channels are limited to those of the sending number, given as its `NumberDetails` from `Leases`
+    or its `NumberCapabilities`. Channels the capability cache knows the recipient cannot use are skipped.
+    The remaining channels are tried in order of `costs`, then channels known to reach the recipient first,
+    then in `preference` order. A channel that rejects the recipient is recorded in the cache
+    and the next one is tried.
+
+    Recipients on `suppression`, which defaults to the text product's suppression list,
+    are rejected with `SuppressedRecipientError` before any channel is tried.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        text: Text,
+        imessage: IMessage,
+        whatsapp: WhatsApp,
+        /,
+        *,
+        capabilities: CapabilityCache | None = None,
+        sender: NumberDetails | NumberCapabilities | None = None,
+        costs: Mapping[RouteChannel, float] | None = None,
+        preference: Sequence[RouteChannel] = DEFAULT_PREFERENCE,
+        suppression: SuppressionList | None = None,
+    ) -> None:
+        self._text = text
+        self._imessage = imessage
+        self._whatsapp = whatsapp
+        self._capabilities = capabilities or CapabilityCache()
+        self._suppression = suppression if suppression is not None else text.suppression
+        self._sender = sender.id if isinstance(sender, NumberDetails) else None
+        if sender is not None:
+            sender_capabilities = sender.capabilities if isinstance(sender, NumberDetails) else sender
+            allowed = {_LEASE_CHANNELS[c] for c in sender_capabilities.channels if c in _LEASE_CHANNELS}
+            preference = [channel for channel in preference if channel in allowed]
+        self.preference = tuple(preference)
+        self.costs = dict(costs or {})
+
+    def route(self, to: str, /) -> list[RouteChannel]:
+        """Return the channels to try for `to`, in order."""
+        candidates = []
+        for i, channel in enumerate(self.preference):
+            # Text reaches every recipient, so it is never skipped, but it is not preferred as a known channel either.
+            supported = None if channel == "text" else self._capabilities.supports(to, channel)
+            if supported is False:
+                continue
+            candidates.append((self.costs.get(channel, 0.0), supported is not True, i, channel))
+        return [channel for *_, channel in sorted(candidates)]
+
+    def send(
+        self,
+        *,
+        to: str,
+        message: str,
+        from_: str | None = None,
+        attachments: Sequence[str] | None = None,
+    ) -> RouteResponse:
+        """Send `message` to `to` on the first channel that can reach them."""
+        from_ = from_ or self._sender
+        return self._send_routed(
+            to,
+            lambda channel: self._send_on(channel, to=to, message=message, from_=from_, attachments=attachments),
+        )
+
+    def send_many(  # noqa: PLR0913
+        self,
+        recipients: Iterable[str | Recipient],
+        /,
+        *,
+        message: str,
+        from_: str | None = None,
+        attachments: Sequence[str] | None = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limits: Mapping[RouteChannel, float] | None = None,
+    ) -> Iterator[BulkResult[Recipient, RouteResponse]]:
+        """
+        Send one message to many recipients, yielding a result per recipient as each send completes.
+
+        Each recipient is routed and sent on its own, with one request per channel tried.
+        For recipients with `variables`, `message` is a `str.format` template compiled once per channel
+        with `template()` and filled in from their `variables`; other recipients are sent `message` as written.
+        Sends are made by `max_workers` threads, at most `rate_limits[channel]` sends per second on each channel.
+        """
+        from_ = from_ or self._sender
+        rate_limiters = {channel: TokenBucket(rate) for channel, rate in (rate_limits or {}).items()}
+
+        # Compiled on first use, so a message that is not a valid template only fails sends that fill it in.
+        @functools.cache
+        def template(channel: RouteChannel) -> MessageTemplate[TextResponse] | MessageTemplate[IMSendResponse]:
+            product = self._text if channel == "text" else self._imessage if channel == "imessage" else self._whatsapp
+            return product.template(message=message, from_=from_, attachments=attachments)
+
+        def send(recipient: Recipient) -> RouteResponse:
+            def send_on(channel: RouteChannel) -> str:
+                if channel in rate_limiters:
+                    rate_limiters[channel].acquire()
+                if recipient.variables:
+                    return template(channel).send(to=recipient.to, variables=recipient.variables).message_id
+                return self._send_on(channel, to=recipient.to, message=message, from_=from_, attachments=attachments)
+
+            return self._send_routed(recipient.to, send_on)
+
+        return map_bounded(
+            send,
+            (Recipient(to=r) if isinstance(r, str) else r for r in recipients),
+            max_workers=max_workers,
+        )
+
+    def _send_on(
+        self,
+        channel: RouteChannel,
+        *,
+        to: str,
+        message: str,
+        from_: str | None,
+        attachments: Sequence[str] | None,
+    ) -> str:
+        if channel == "text":
+            return self._text.send(to=to, message=message, from_=from_, attachments=attachments).message_id
+        product = self._imessage if channel == "imessage" else self._whatsapp
+        return product.send(to=to, message=message, from_=from_, attachments=attachments).message_id
+
+    def _send_routed(self, to: str, send_on: Callable[[RouteChannel], str]) -> RouteResponse:
+        if self._suppression is not None:
+            self._suppression.check(self._text.phone_numbers.normalize(to))
+        channels = self.route(to)
+        if not channels:
+            msg = f"no channel can reach {to!r}"
+            raise ValueError(msg)
+        rejected: list[RouteChannel] = []
+        for channel in channels:
+            try:
+                message_id = send_on(channel)
+            except ContiguityApiError as exc:
+                if channel == "text" or not is_unreachable(exc):
+                    raise
+                logger.debug("%s cannot reach %r: %s", channel, to, exc)
+                self._capabilities.record(to, channel, supported=False)
+                rejected.append(channel)
+                continue
+            if channel != "text":
+                self._capabilities.record(to, channel, supported=True)
+            return RouteResponse(channel=channel, message_id=message_id, rejected=tuple(rejected))
+        msg = f"no channel can reach {to!r}"
+        raise ValueError(msg)
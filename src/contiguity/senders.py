@@ -0,0 +1,146 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from typing import Any, NamedTuple, TypeVar
+
+from ._ratelimit import TokenBucket
+from .leases import LeaseChannel, Leases, NumberDetails
+
+ResponseT = TypeVar("ResponseT")
+
+# Long codes are typically limited by carriers to around one message per second.
+DEFAULT_RATE = 1.0
+DEFAULT_MAXSIZE = 100_000
+
+
+class SenderPoolInfo(NamedTuple):
+    numbers: int
+    sticky: int
+
+
+class _Sender:
+    __slots__ = ("bucket", "current", "number", "weight")
+
+    def __init__(self, number: str, weight: float, bucket: TokenBucket) -> None:
+        self.number = number
+        self.weight = weight
+        self.bucket = bucket
+        self.current = 0.0
+
+
+class SenderPool:
+    """
+    Spreads sends across leased numbers, so that no single number exceeds its throughput limit.
+
+    Each number may send `rate` messages per second, with bursts of up to `capacity`. New recipients
+    are assigned numbers by smooth weighted round-robin, weighted by `NumberHealth.reputation`,
+    skipping numbers that have no throughput left while another one has. Numbers with no reputation
+    and leases that are no longer active are left out, as are numbers without `channel` when it is given,
+    such as `"imessage"` for a pool used with `IMessage.send`.
+
+    A recipient keeps the number they were first sent from, so conversations stay on one thread.
+    The least recently used assignments are forgotten beyond `maxsize`.
+
+        pool = SenderPool.from_leases(client.leases, channel="imessage")
+        pool.send(client.imessage.send, to="+15555555555", message="Hello")
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        numbers: Iterable[NumberDetails],
+        /,
+        *,
+        channel: LeaseChannel | None = None,
+        rate: float = DEFAULT_RATE,
+        capacity: float | None = None,
+        maxsize: int = DEFAULT_MAXSIZE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._senders = [
+            _Sender(number.id, number.health.reputation, TokenBucket(rate, capacity=capacity, clock=clock))
+            for number in numbers
+            if number.health.reputation > 0
+            and number.lease_status in {None, "active"}
+            and (channel is None or channel in number.capabilities.channels)
+        ]
+        if not self._senders:
+            msg = "no leased numbers available to send from"
+            if channel is not None:
+                msg += f" on {channel}"
+            raise ValueError(msg)
+        self._by_number = {sender.number: sender for sender in self._senders}
+        self._total_weight = sum(sender.weight for sender in self._senders)
+        self.maxsize = maxsize
+        self._sticky: OrderedDict[str, _Sender] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_leases(cls, leases: Leases, /, **kwargs: Any) -> "SenderPool":  # noqa: ANN401
+        """Build a pool from the numbers currently leased through `leases`."""
+        return cls(leases.get_leased_numbers(), **kwargs)
+
+    @property
+    def numbers(self) -> tuple[str, ...]:
+        return tuple(self._by_number)
+
+    def sender_for(self, to: str, /) -> str | None:
+        """Return the number assigned to `to`, or `None` if it has not been assigned one."""
+        with self._lock:
+            sender = self._sticky.get(to)
+        return sender.number if sender is not None else None
+
+    def acquire(self, to: str | None = None, /) -> str:
+        """Return the number to send to `to` from, waiting until it may send another message."""
+        number, delay = self._reserve(to)
+        if delay:
+            time.sleep(delay)
+        return number
+
+    async def acquire_async(self, to: str | None = None, /) -> str:
+        number, delay = self._reserve(to)
+        if delay:
+            await asyncio.sleep(delay)
+        return number
+
+    def send(self, send: Callable[..., ResponseT], /, *, to: str, **kwargs: Any) -> ResponseT:  # noqa: ANN401
+        """Call a send method such as `client.text.send` with `from_` set to a number from the pool."""
+        return send(to=to, from_=self.acquire(to), **kwargs)
+
+    async def send_async(self, send: Callable[..., ResponseT], /, *, to: str, **kwargs: Any) -> ResponseT:  # noqa: ANN401
+        """Like `send()`, but waits for throughput without blocking and calls `send` in a worker thread."""
+        from_ = await self.acquire_async(to)
+        return await asyncio.to_thread(send, to=to, from_=from_, **kwargs)
+
+    def info(self) -> SenderPoolInfo:
+        return SenderPoolInfo(numbers=len(self._senders), sticky=len(self._sticky))
+
+    def __len__(self) -> int:
+        return len(self._senders)
+
+    def _reserve(self, to: str | None) -> tuple[str, float]:
+        with self._lock:
+            if to is not None and (sender := self._sticky.get(to)) is not None:
+                self._sticky.move_to_end(to)
+                return sender.number, sender.bucket.reserve()
+            sender, delay = self._next()
+            if to is not None:
+                self._sticky[to] = sender
+                while len(self._sticky) > self.maxsize:
+                    self._sticky.popitem(last=False)
+            return sender.number, delay
+
+    def _next(self) -> tuple[_Sender, float]:
+        # Smooth weighted round-robin: every number gains its weight and the one furthest ahead is picked.
+        # When it has no throughput left, the next one in line that does is picked instead.
+        for sender in self._senders:
+            sender.current += sender.weight
+        ranked = sorted(self._senders, key=lambda sender: sender.current, reverse=True)
+        chosen = next((sender for sender in ranked if sender.bucket.try_acquire()), None)
+        delay = 0.0
+        if chosen is None:
+            chosen = ranked[0]
+            delay = chosen.bucket.reserve()
+        chosen.current -= self._total_weight
+        return chosen, delay
@@ -0,0 +1,177 @@
+import hashlib
+import logging
+import math
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
+from os import PathLike
+from pathlib import Path
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FALSE_POSITIVE_RATE = 0.001
+
+_MAGIC = b"CTGSUPP1"
+# Magic, number of hash functions, number of bloom filter bytes, number of entries.
+_HEADER = struct.Struct("<8sIQQ")
+
+
+class SuppressedRecipientError(ValueError):
+    """Raised instead of sending to a recipient on the suppression list."""
+
+
+class SuppressionInfo(NamedTuple):
+    checks: int
+    skipped: int
+    size: int
+
+
+def _normalize(recipient: str) -> str:
+    return recipient.strip().lower()
+
+
+def _digest(recipient: str) -> tuple[int, int]:
+    digest = hashlib.blake2b(_normalize(recipient).encode(), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+
+class SuppressionIndex:
+    """
+    A read-only set of suppressed recipients, memory-mapped from a file written by `build()`.
+
+    Lookups first check a bloom filter, which rules out almost every recipient not in the set.
+    The rest are confirmed by binary search over the sorted 64-bit fingerprints of the entries.
+    Recipients are compared case-insensitively. Phone numbers must be in E.164 format.
+    """
+
+    def __init__(self, path: str | PathLike[str], /) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as file:
+            self._mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._hashes, bloom_size, self._size = (
+            _HEADER.unpack_from(self._mapped) if len(self._mapped) >= _HEADER.size else (b"", 0, 0, 0)
+        )
+        if magic != _MAGIC or len(self._mapped) != _HEADER.size + bloom_size + 8 * self._size:
+            self._mapped.close()
+            msg = f"{str(self.path)!r} is not a suppression index"
+            raise ValueError(msg)
+        self._bloom_bits = 8 * bloom_size
+        self._bloom_offset = _HEADER.size
+        keys = memoryview(self._mapped)[_HEADER.size + bloom_size :]
+        self._keys: Sequence[int]
+        if sys.byteorder == "little":
+            self._keys = keys.cast("Q")
+        else:
+            self._keys = array("Q", keys)
+            self._keys.byteswap()
+
+    @classmethod
+    def build(
+        cls,
+        path: str | PathLike[str],
+        recipients: Iterable[str],
+        /,
+        *,
+        false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE,
+    ) -> "SuppressionIndex":
+        """
+        Write an index of `recipients` to `path` and load it.
+
+        The file is written next to `path` and renamed into place,
+        so processes loading `path` concurrently never see a partial index.
+        """
+        digests = {_digest(recipient) for recipient in recipients if recipient.strip()}
+        keys = array("Q", sorted({key for key, _ in digests}))
+        bloom_bits = max(math.ceil(-len(keys) * math.log(false_positive_rate) / math.log(2) ** 2), 64)
+        bloom_size = -(-bloom_bits // 64) * 8
+        bloom_bits = 8 * bloom_size
+        hashes = max(round(bloom_bits / max(len(keys), 1) * math.log(2)), 1)
+        bloom = bytearray(bloom_size)
+        for first, second in digests:
+            for i in range(hashes):
+                bit = (first + i * second) % bloom_bits
+                bloom[bit >> 3] |= 1 << (bit & 7)
+        if sys.byteorder != "little":
+            keys.byteswap()
+
+        path = Path(path)
+        temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with temporary.open("wb") as file:
+            file.write(_HEADER.pack(_MAGIC, hashes, bloom_size, len(keys)))
+            file.write(bloom)
+            file.write(keys.tobytes())
+        temporary.replace(path)
+        return cls(path)
+
+    def __contains__(self, recipient: object) -> bool:
+        if not isinstance(recipient, str):
+            return False
+        first, second = _digest(recipient)
+        for i in range(self._hashes):
+            bit = (first + i * second) % self._bloom_bits
+            if not self._mapped[self._bloom_offset + (bit >> 3)] >> (bit & 7) & 1:
+                return False
+        i = bisect_left(self._keys, first)
+        return i < len(self._keys) and self._keys[i] == first
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class SuppressionList:
+    """
+    Rejects sends to suppressed recipients, such as hard-bounced emails and opted-out numbers, before any request.
+
+    The index can be replaced at any time with `load()` or `reload()`, for example after a nightly export.
+    Sends in progress keep using the index they started with.
+    """
+
+    def __init__(self, source: str | PathLike[str] | SuppressionIndex | None = None, /) -> None:
+        self._index: SuppressionIndex | None = None
+        self._checks = 0
+        self._skipped = 0
+        self._lock = threading.Lock()
+        if source is not None:
+            self.load(source)
+
+    @property
+    def index(self) -> SuppressionIndex | None:
+        return self._index
+
+    def load(self, source: str | PathLike[str] | SuppressionIndex, /) -> None:
+        """Replace the current index with `source`, an index or a path written by `SuppressionIndex.build()`."""
+        index = source if isinstance(source, SuppressionIndex) else SuppressionIndex(source)
+        self._index = index
+        logger.debug("loaded suppression index %r with %d entries", str(index.path), len(index))
+
+    def reload(self) -> None:
+        """Load the current index's file again, picking up a rebuilt index."""
+        if self._index is None:
+            msg = "no suppression index has been loaded"
+            raise ValueError(msg)
+        self.load(self._index.path)
+
+    def is_suppressed(self, recipient: str, /) -> bool:
+        index = self._index
+        suppressed = index is not None and recipient in index
+        with self._lock:
+            self._checks += 1
+            self._skipped += suppressed
+        return suppressed
+
+    def check(self, recipient: str, /) -> None:
+        """Raise `SuppressedRecipientError` if `recipient` is suppressed."""
+        if self.is_suppressed(recipient):
+            logger.debug("skipping send to suppressed recipient %r", recipient)
+            msg = f"recipient {recipient!r} is on the suppression list"
+            raise SuppressedRecipientError(msg)
+
+    def info(self) -> SuppressionInfo:
+        index = self._index
+        return SuppressionInfo(checks=self._checks, skipped=self._skipped, size=len(index) if index else 0)
@@ -1,10 +1,13 @@
 import logging
 from collections.abc import Sequence
 
-import phonenumbers
-
+from ._client import ApiClient
+from ._phone import PhoneNumberNormalizer, default_normalizer
 from ._product import BaseProduct
 from ._response import BaseResponse, decode_response
+from ._template import MessageTemplate, TemplateCompiler
+from .dedup import DedupStore, post_once
+from .suppression import SuppressionList
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +17,27 @@ class TextResponse(BaseResponse):
 
 
 class Text(BaseProduct):
+    def __init__(
+        self,
+        *,
+        client: ApiClient,
+        phone_numbers: PhoneNumberNormalizer | None = None,
+        dedup: DedupStore | None = None,
+        suppression: SuppressionList | None = None,
+    ) -> None:
+        super().__init__(client=client)
+        self._phone_numbers = phone_numbers or default_normalizer
+        self._dedup = dedup
+        self._suppression = suppression
+
+    @property
+    def phone_numbers(self) -> PhoneNumberNormalizer:
+        return self._phone_numbers
+
+    @property
+    def suppression(self) -> SuppressionList | None:
+        return self._suppression
+
     def send(
         self,
         *,
@@ -21,29 +45,72 @@ class Text(BaseProduct):
         message: str,
         from_: str | None = None,
         attachments: Sequence[str] | None = None,
+        dedup_key: str | None = None,
     ) -> TextResponse:
-        try:
-            parsed_number = phonenumbers.parse(to, None)
-            if not phonenumbers.is_valid_number(parsed_number):
-                msg = "formatting failed. Phone number must follow the E.164 format."
-                raise ValueError(msg)
-        except phonenumbers.NumberParseException as exc:
-            msg = "parsing failed. Phone number must follow the E.164 format."
-            raise ValueError(msg) from exc
+        to = self._phone_numbers.normalize(to)
+        if self._suppression is not None:
+            self._suppression.check(to)
+        payload = self._payload(
+            to=to,
+            message=message,
+            from_=from_,
+            attachments=attachments,
+        )
+
+        content = post_once(
+            self._client,
+            "/send/text",
+            payload,
+            store=self._dedup,
+            key=dedup_key,
+            fail_message="failed to send text message",
+        )
+        data = decode_response(content, type=TextResponse)
+        logger.debug("successfully sent text to %r", to)
+        return data
+
+    def template(
+        self,
+        *,
+        message: str,
+        from_: str | None = None,
+        attachments: Sequence[str] | None = None,
+    ) -> MessageTemplate[TextResponse]:
+        """
+        Compile a text message for sending to many recipients.
+
+        `message` is a `str.format` template whose named fields are filled in on each send.
+        """
+        compiler = TemplateCompiler()
+        payload = self._payload(
+            to=compiler.recipient(),
+            message=compiler.field(message),
+            from_=from_,
+            attachments=attachments,
+        )
+        return compiler.compile(
+            payload,
+            client=self._client,
+            path="/send/text",
+            response_type=TextResponse,
+            fail_message="failed to send text message",
+            description="text",
+            normalize_recipient=self._phone_numbers.normalize,
+            suppression=self._suppression,
+        )
 
+    @staticmethod
+    def _payload(
+        *,
+        to: str,
+        message: str,
+        from_: str | None,
+        attachments: Sequence[str] | None,
+    ) -> dict[str, object]:
         payload = {
-            "to": phonenumbers.format_number(parsed_number, phonenumbers.PhoneNumberFormat.E164),
+            "to": to,
             "message": message,
             "from": from_,
             "attachments": attachments,
         }
-
-        response = self._client.post(
-            "/send/text",
-            json={k: v for k, v in payload.items() if v is not None},
-        )
-
-        self._client.handle_error(response, fail_message="failed to send text message")
-        data = decode_response(response.content, type=TextResponse)
-        logger.debug("successfully sent text to %r", to)
-        return data
+        return {k: v for k, v in payload.items() if v is not None}
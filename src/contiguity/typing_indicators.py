@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager, suppress
+from typing import TYPE_CHECKING, Literal
+
+if TYPE_CHECKING:
+    from ._instant_messaging import InstantMessagingClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_INTERVAL = 5.0
+DEFAULT_STOP_DELAY = 1.0
+
+
+class _Conversation:
+    __slots__ = ("client", "from_", "holders", "idle_since", "last_start", "shown", "to")
+
+    def __init__(self, client: "InstantMessagingClient", to: str, from_: str | None) -> None:
+        self.client = client
+        self.to = to
+        self.from_ = from_
+        self.holders = 0
+        self.shown = False
+        self.last_start = 0.0
+        self.idle_since = 0.0
+
+
+class TypingCoalescer:
+    """
+    Shows typing indicators for many conversations from a single asyncio task.
+
+    `start()` and `stop()` only record whether a conversation should show the indicator;
+    the background task sends the requests. A start is sent when a conversation begins typing
+    and then at most once every `refresh_interval` seconds while it continues. A stop is only sent
+    after the conversation has been idle for `stop_delay` seconds, so a stop followed by another start,
+    as between two bot replies, sends nothing. A start and stop with no await in between also send nothing.
+    Requests are sent from worker threads, and failures are logged rather than raised.
+    """
+
+    def __init__(
+        self,
+        *,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+        stop_delay: float = DEFAULT_STOP_DELAY,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.refresh_interval = refresh_interval
+        self.stop_delay = stop_delay
+        self._clock = clock
+        self._conversations: dict[tuple[InstantMessagingClient, str, str | None], _Conversation] = {}
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._closing = False
+
+    def start(self, client: "InstantMessagingClient", /, *, to: str, from_: str | None = None) -> None:
+        """Start showing the typing indicator. Each call must be paired with a call to `stop()`."""
+        key = (client, to, from_)
+        conversation = self._conversations.get(key)
+        if conversation is None:
+            conversation = self._conversations[key] = _Conversation(client, to, from_)
+        conversation.holders += 1
+        self._wake()
+
+    def stop(self, client: "InstantMessagingClient", /, *, to: str, from_: str | None = None) -> None:
+        conversation = self._conversations.get((client, to, from_))
+        if conversation is None or not conversation.holders:
+            msg = f"typing indicator for {to!r} was not started"
+            raise ValueError(msg)
+        conversation.holders -= 1
+        if not conversation.holders:
+            conversation.idle_since = self._clock()
+            self._wake()
+
+    @asynccontextmanager
+    async def typing(
+        self,
+        client: "InstantMessagingClient",
+        /,
+        *,
+        to: str,
+        from_: str | None = None,
+    ) -> AsyncIterator[None]:
+        """Show the typing indicator while the block runs."""
+        self.start(client, to=to, from_=from_)
+        try:
+            yield
+        finally:
+            self.stop(client, to=to, from_=from_)
+
+    async def aclose(self) -> None:
+        """Stop every typing indicator that is still shown and wait for the background task to finish."""
+        self._closing = True
+        for conversation in self._conversations.values():
+            conversation.holders = 0
+            conversation.idle_since = float("-inf")
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        self._closing = False
+
+    def _wake(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            now = self._clock()
+            deadline = float("inf")
+            sends: list[tuple[_Conversation, Literal["start", "stop"]]] = []
+            for key, conversation in list(self._conversations.items()):
+                if conversation.holders:
+                    due = conversation.last_start + self.refresh_interval if conversation.shown else now
+                    if due <= now:
+                        sends.append((conversation, "start"))
+                        conversation.shown = True
+                        conversation.last_start = now
+                        due = now + self.refresh_interval
+                elif not conversation.shown:
+                    del self._conversations[key]
+                    continue
+                else:
+                    due = conversation.idle_since + self.stop_delay
+                    if due <= now:
+                        sends.append((conversation, "stop"))
+                        del self._conversations[key]
+                        continue
+                deadline = min(deadline, due)
+
+            await asyncio.gather(*(self._send(conversation, action) for conversation, action in sends))
+            if self._closing and not self._conversations:
+                return
+            if not self._conversations and not self._wakeup.is_set():
+                # Exit when idle; the next start() creates a new task.
+                return
+            with suppress(asyncio.TimeoutError):
+                timeout = max(deadline - self._clock(), 0) if deadline != float("inf") else None
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+
+    @staticmethod
+    async def _send(conversation: _Conversation, action: Literal["start", "stop"]) -> None:
+        method = conversation.client.start_typing if action == "start" else conversation.client.stop_typing
+        try:
+            await asyncio.to_thread(method, to=conversation.to, from_=conversation.from_)
+        except Exception:
+            logger.warning("failed to %s typing indicator for %r", action, conversation.to, exc_info=True)
@@ -1,16 +1,93 @@
 import re
+from collections import deque
+from collections.abc import Callable, Collection, Iterable, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
 
-import phonenumbers
+from ._bulk import chunked
+from ._phone import PhoneNumberNormalizer, default_normalizer
 
 EMAIL_REGEX = re.compile(r"^[^\s@]+@[^\s@]+\.[^\s@]+$")
+DEFAULT_CHUNK_SIZE = 10_000
+
+# Normalizers used by process pool workers, one per allowed-region set, kept for the lifetime of the worker.
+_worker_normalizers: dict[frozenset[str] | None, PhoneNumberNormalizer] = {}
 
 
 class Verify:
+    def __init__(
+        self,
+        *,
+        phone_numbers: PhoneNumberNormalizer | None = None,
+        allowed_regions: Collection[str] | None = None,
+    ) -> None:
+        if phone_numbers is not None and allowed_regions is not None:
+            msg = "provide either phone_numbers or allowed_regions, not both"
+            raise ValueError(msg)
+        if allowed_regions is not None:
+            phone_numbers = PhoneNumberNormalizer(regions=allowed_regions)
+        self._phone_numbers = phone_numbers or default_normalizer
+
     def number(self, number: str) -> bool:
-        try:
-            return phonenumbers.is_valid_number(phonenumbers.parse(number))
-        except phonenumbers.NumberParseException:
-            return False
+        return self._phone_numbers.is_valid(number)
 
     def email(self, email: str) -> bool:
         return EMAIL_REGEX.match(email) is not None
+
+    def numbers(
+        self,
+        numbers: Iterable[str],
+        /,
+        *,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_workers: int | None = None,
+    ) -> Iterator[bytes]:
+        """
+        Validate many phone numbers, yielding one `bytes` object per chunk of input.
+
+        Byte `i` of a chunk is 1 if the `i`th number of that chunk is valid and 0 otherwise.
+        Repeated numbers within a chunk are only validated once.
+        If `max_workers` is given, chunks are validated in a `ProcessPoolExecutor` with that many workers.
+        """
+        chunks = chunked(numbers, chunk_size)
+        if max_workers is None:
+            for chunk in chunks:
+                yield _validate_chunk(chunk, self._phone_numbers.is_valid)
+            return
+
+        regions = self._phone_numbers.regions
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            pending: deque[tuple[Sequence[str], list[str], Future[bytes]]] = deque()
+            for chunk in chunks:
+                unique = list(dict.fromkeys(chunk))
+                pending.append((chunk, unique, executor.submit(_validate_numbers, unique, regions)))
+                if len(pending) >= 2 * max_workers:
+                    yield _expand_chunk(*pending.popleft())
+            while pending:
+                yield _expand_chunk(*pending.popleft())
+
+    def emails(self, emails: Iterable[str], /, *, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Validate many email addresses, yielding one `bytes` object per chunk of input.
+
+        Byte `i` of a chunk is 1 if the `i`th address of that chunk is valid and 0 otherwise.
+        """
+        for chunk in chunked(emails, chunk_size):
+            yield _validate_chunk(chunk, self.email)
+
+
+def _validate_chunk(chunk: Sequence[str], validate: Callable[[str], bool]) -> bytes:
+    results = {value: validate(value) for value in dict.fromkeys(chunk)}
+    return bytes(results[value] for value in chunk)
+
+
+def _expand_chunk(chunk: Sequence[str], unique: list[str], future: Future[bytes]) -> bytes:
+    results = dict(zip(unique, future.result(), strict=True))
+    return bytes(results[value] for value in chunk)
+
+
+def _validate_numbers(numbers: list[str], regions: frozenset[str] | None) -> bytes:
+    try:
+        normalizer = _worker_normalizers[regions]
+    except KeyError:
+        normalizer = _worker_normalizers[regions] = PhoneNumberNormalizer(regions=regions)
+    return bytes(map(normalizer.is_valid, numbers))
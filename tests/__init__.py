@@ -1,9 +1,13 @@
 import random
 import string
+from collections.abc import Callable
+from typing import Any
 
+import httpx
 from dotenv import load_dotenv
 
 from contiguity._auth import _get_env_var
+from contiguity._client import ApiClient
 
 load_dotenv()
 
@@ -26,3 +30,54 @@ def get_test_email(*, reply_to: bool = False, cc: bool = False) -> str:
 
 def get_test_phone() -> str:
     return _get_env_var("TEST_PHONE_NUMBER", "test phone number")
+
+
+def api_response(data: Any, /, *, status_code: int = 200) -> httpx.Response:  # noqa: ANN401
+    metadata = {"id": random_string(), "timestamp": 0, "api_version": "v1", "object": "response"}
+    if isinstance(data, dict):
+        data = {"metadata": metadata, **data}
+    return httpx.Response(status_code, json={**metadata, "data": data})
+
+
+def number_data(  # noqa: PLR0913
+    number: str,
+    /,
+    *,
+    country: str = "US",
+    region: str = "CA",
+    city: str = "San Francisco",
+    carrier: str = "T-Mobile",
+    channels: list[str] | None = None,
+    reputation: float = 0.9,
+    monthly_rate: float = 5.0,
+    lease_status: str | None = None,
+) -> dict[str, Any]:
+    """Return the API representation of a leasable number."""
+    return {
+        "id": number,
+        "status": "leased" if lease_status else "available",
+        "number": {"e164": number, "formatted": number},
+        "location": {"country": country, "region": region, "city": city},
+        "carrier": carrier,
+        "capabilities": {"intl_sms": False, "channels": channels if channels is not None else ["sms", "mms"]},
+        "health": {"reputation": reputation, "previous_owners": 0},
+        "data": {"requirements": [], "e911_capable": False},
+        "created_at": 0,
+        "pricing": {"currency": "USD", "upfront_fee": 0.0, "monthly_rate": monthly_rate},
+        "lease_id": f"lease_{number}" if lease_status else None,
+        "lease_status": lease_status,
+        "billing": None,
+    }
+
+
+class MockApiClient(ApiClient):
+    """An `ApiClient` that passes requests to `handler` instead of the network."""
+
+    def __init__(self, handler: Callable[[httpx.Request], httpx.Response]) -> None:
+        super().__init__(api_key="test")
+        self.handler = handler
+        self.requests: list[httpx.Request] = []
+
+    def send(self, request: httpx.Request, **_: Any) -> httpx.Response:  # noqa: ANN401
+        self.requests.append(request)
+        return self.handler(request)
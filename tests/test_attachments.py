@@ -0,0 +1,65 @@
+import base64
+from pathlib import Path
+
+import httpx
+import msgspec
+
+from contiguity._attachments import ENCODE_CHUNK_SIZE, EmailAttachment, StreamingBody
+from contiguity.dedup import MemoryDedupStore
+from contiguity.email import Email
+from tests import MockApiClient, api_response
+
+
+def test_streaming_body(tmp_path: Path) -> None:
+    """Test that the streamed body is valid JSON of the announced length, with the files base64-encoded."""
+    contents = {"empty.txt": b"", "small.pdf": b"%PDF", "large.bin": bytes(range(256)) * (ENCODE_CHUNK_SIZE // 100)}
+    for name, content in contents.items():
+        (tmp_path / name).write_bytes(content)
+    attachments = [tmp_path / "empty.txt", str(tmp_path / "small.pdf"), EmailAttachment(path=tmp_path / "large.bin")]
+
+    body = StreamingBody(b'{"to":"a@example.com","attachments":', attachments, b"}")
+    encoded = b"".join(body)
+
+    assert len(encoded) == body.length
+    decoded = msgspec.json.decode(encoded)["attachments"]
+    assert [attachment["filename"] for attachment in decoded] == list(contents)
+    assert [attachment["content_type"] for attachment in decoded] == [
+        "text/plain",
+        "application/pdf",
+        "application/octet-stream",
+    ]
+    assert [base64.b64decode(attachment["content"]) for attachment in decoded] == list(contents.values())
+
+
+def test_email_send_with_attachments(tmp_path: Path) -> None:
+    """Test that attachments are sent with a Content-Length and deduplicated without rereading the files."""
+    path = tmp_path / "report.csv"
+    path.write_bytes(b"a,b\n1,2\n")
+    bodies: list[bytes] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(request.read())
+        return api_response({"email_id": "email-1"})
+
+    client = MockApiClient(handler)
+    email = Email(client=client, dedup=MemoryDedupStore())
+    results = [
+        email.send(
+            to="a@example.com",
+            from_="Contiguity",
+            subject="Report",
+            body_text="Attached.",
+            attachments=[EmailAttachment(path=path, filename="data.csv")],
+        )
+        for _ in range(2)
+    ]
+
+    assert [result.email_id for result in results] == ["email-1", "email-1"]
+    assert len(bodies) == 1
+    assert client.requests[0].headers["Content-Length"] == str(len(bodies[0]))
+    assert "Transfer-Encoding" not in client.requests[0].headers
+    payload = msgspec.json.decode(bodies[0])
+    assert payload["subject"] == "Report"
+    assert payload["attachments"] == [
+        {"filename": "data.csv", "content_type": "text/csv", "content": base64.b64encode(path.read_bytes()).decode()},
+    ]
@@ -0,0 +1,156 @@
+from collections.abc import AsyncIterator
+
+import httpx
+import msgspec
+import pytest
+
+from contiguity._bulk import map_bounded
+from contiguity._ratelimit import TokenBucket
+from contiguity.email import Email, EmailRecipient
+from tests import MockApiClient, api_response
+
+
+def _send_email(request: httpx.Request) -> httpx.Response:
+    payload = msgspec.json.decode(request.content)
+    if payload["to"] == "bounce@example.com":
+        return api_response({"error": "bounced", "status": 400}, status_code=400)
+    return api_response({"email_id": f"email-{payload['to']}-{payload['subject']}"})
+
+
+@pytest.fixture
+def client() -> MockApiClient:
+    return MockApiClient(_send_email)
+
+
+def test_map_bounded_reports_errors() -> None:
+    """Test that errors are returned per item instead of being raised."""
+    results = {result.item: result for result in map_bounded(lambda x: 10 // x, range(5), max_workers=2)}
+
+    assert sorted(results) == list(range(5))
+    assert isinstance(results[0].error, ZeroDivisionError)
+    assert [results[i].response for i in range(1, 5)] == [10, 5, 3, 2]
+
+
+def test_token_bucket() -> None:
+    """Test that the token bucket allows bursts up to its capacity and then refills."""
+    now = 0.0
+    bucket = TokenBucket(2, capacity=2, clock=lambda: now)
+
+    assert [bucket.try_acquire() for _ in range(3)] == [True, True, False]
+    assert bucket.reserve() == 0.5  # noqa: PLR2004
+    now = 1.0
+    assert bucket.try_acquire() is True
+
+
+def test_email_send_many(client: MockApiClient) -> None:
+    """Test sending one personalized email to many recipients."""
+    email = Email(client=client)
+    recipients = (EmailRecipient(to=f"user{i}@example.com", variables={"name": f"User {i}"}) for i in range(20))
+
+    results = list(
+        email.send_many(
+            recipients,
+            from_="Contiguity",
+            subject="Hi {name}",
+            body_html="<b>Hi {name}</b>",
+            max_workers=4,
+        ),
+    )
+
+    assert len(results) == len(client.requests) == 20  # noqa: PLR2004
+    assert all(result.ok for result in results)
+    assert {result.response.email_id for result in results if result.response} == {
+        f"email-user{i}@example.com-Hi User {i}" for i in range(20)
+    }
+
+
+def test_email_send_many_errors(client: MockApiClient) -> None:
+    """Test that failed sends are reported per recipient."""
+    email = Email(client=client)
+
+    results = {
+        result.item.to: result
+        for result in email.send_many(
+            ["ok@example.com", "bounce@example.com"],
+            from_="Contiguity",
+            subject="Hi",
+            body_text="Hi",
+        )
+    }
+
+    assert results["ok@example.com"].ok
+    assert "bounced" in str(results["bounce@example.com"].error)
+
+
+async def test_email_send_many_async(client: MockApiClient) -> None:
+    """Test sending one email to an async iterable of recipients."""
+    email = Email(client=client)
+
+    async def recipients() -> AsyncIterator[str]:
+        for i in range(5):
+            yield f"user{i}@example.com"
+
+    results = [
+        result
+        async for result in email.send_many_async(
+            recipients(),
+            from_="Contiguity",
+            subject="Hi",
+            body_text="Hello",
+            max_workers=2,
+        )
+    ]
+
+    assert sorted(result.item.to for result in results if result.ok) == [f"user{i}@example.com" for i in range(5)]
+
+
+def test_email_send_bcc_batches() -> None:
+    """Test that recipients are packed into BCC batches with one request per batch."""
+    client = MockApiClient(
+        lambda request: api_response({"email_id": ",".join(msgspec.json.decode(request.content)["bcc"])}),
+    )
+    recipients = [f"user{i}@example.com" for i in range(7)]
+
+    results = list(
+        Email(client=client).send_bcc_batches(
+            iter(recipients),
+            to="news@example.com",
+            from_="Contiguity",
+            subject="News",
+            body_text="Hello",
+            batch_size=3,
+        ),
+    )
+
+    assert len(client.requests) == 3  # noqa: PLR2004
+    assert sorted(len(result.item) for result in results) == [1, 3, 3]
+    assert all(result.response and result.response.email_id == ",".join(result.item) for result in results)
+    assert sorted(recipient for result in results for recipient in result.item) == sorted(recipients)
+    assert msgspec.json.decode(client.requests[0].content)["to"] == "news@example.com"
+
+
+def test_email_send_many_without_variables_is_not_templated(client: MockApiClient) -> None:
+    """Test that braces are sent as written to recipients without variables, and overrides apply per recipient."""
+    email = Email(client=client)
+    recipients = [
+        "user@example.com",
+        EmailRecipient(to="vip@example.com", subject="Welcome {back}", cc="boss@example.com"),
+    ]
+
+    results = {
+        result.item.to: result
+        for result in email.send_many(
+            recipients,
+            from_="Contiguity",
+            subject="Hi",
+            body_html="<style>body{color:red}</style>",
+        )
+    }
+
+    assert results["user@example.com"].response
+    assert results["user@example.com"].response.email_id == "email-user@example.com-Hi"
+    assert results["vip@example.com"].error is None
+    payloads = {payload["to"]: payload for payload in map(msgspec.json.decode, (r.content for r in client.requests))}
+    assert payloads["user@example.com"]["body"]["html"] == "<style>body{color:red}</style>"
+    assert payloads["vip@example.com"]["subject"] == "Welcome {back}"
+    assert payloads["vip@example.com"]["cc"] == "boss@example.com"
@@ -0,0 +1,58 @@
+import httpx
+import msgspec
+import pytest
+
+from contiguity._client import ContiguityApiError
+from contiguity.capabilities import CapabilityCache
+from contiguity.imessage import IMessage
+from contiguity.text import Text
+from tests import MockApiClient, api_response, random_string
+
+REACHABLE = "+14155552671"
+UNREACHABLE = "+14155552672"
+
+
+def _api(request: httpx.Request) -> httpx.Response:
+    payload = msgspec.json.decode(request.content)
+    if request.url.path == "/imessage" and payload["to"] == UNREACHABLE:
+        return api_response({"error": "recipient does not support iMessage", "status": 422}, status_code=422)
+    if payload["to"] == "+14155550000":
+        return api_response({"error": "rate limited", "status": 429}, status_code=429)
+    return api_response({"message_id": random_string()})
+
+
+def test_capability_cache_expiry() -> None:
+    """Test that supported and unsupported channels expire after their own TTLs."""
+    now = 0.0
+    cache = CapabilityCache(ttl=10, unsupported_ttl=1, clock=lambda: now)
+    cache.record("a", "imessage", supported=True)
+    cache.record("b", "imessage", supported=False)
+
+    assert (cache.supports("a", "imessage"), cache.supports("b", "imessage")) == (True, False)
+    assert cache.supports("a", "whatsapp") is None
+    now = 1.0
+    assert (cache.supports("a", "imessage"), cache.supports("b", "imessage")) == (True, None)
+    assert tuple(cache.info()) == (3, 2, 1)
+
+
+def test_send_or_text() -> None:
+    """Test that unreachable recipients fall back to text once and are then texted directly."""
+    client = MockApiClient(_api)
+    imessage = IMessage(client=client, capabilities=CapabilityCache())
+    text = Text(client=client)
+
+    for _ in range(2):
+        imessage.send_or_text(text, to=REACHABLE, message="Hi")
+        imessage.send_or_text(text, to=UNREACHABLE, message="Hi")
+    paths = [(request.url.path, msgspec.json.decode(request.content)["to"]) for request in client.requests]
+
+    assert paths == [
+        ("/imessage", REACHABLE),
+        ("/imessage", UNREACHABLE),
+        ("/send/text", UNREACHABLE),
+        ("/imessage", REACHABLE),
+        ("/send/text", UNREACHABLE),
+    ]
+    with pytest.raises(ContiguityApiError) as exc_info:
+        imessage.send_or_text(text, to="+14155550000", message="Hi")
+    assert exc_info.value.status_code == 429  # noqa: PLR2004
@@ -0,0 +1,150 @@
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+from contiguity.catalog import CatalogChanges, CatalogWatcher, NumberCatalog
+from contiguity.leases import Leases
+from tests import MockApiClient, api_response, number_data
+
+NUMBERS = [
+    number_data("+14155550001", city="San Francisco", monthly_rate=5.0, reputation=0.9),
+    number_data("+14155550002", city="Los Angeles", carrier="AT&T", monthly_rate=3.0, reputation=0.7),
+    number_data("+12125550003", region="NY", city="New York", monthly_rate=8.0, channels=["sms", "imessage"]),
+    number_data("+442075550004", country="GB", region="ENG", city="London", monthly_rate=4.0, reputation=0.5),
+]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_catalog(clock: FakeClock | None = None) -> tuple[NumberCatalog, MockApiClient]:
+    client = MockApiClient(lambda _: api_response(NUMBERS))
+    return NumberCatalog(Leases(client=client), ttl=60, clock=clock or FakeClock()), client
+
+
+def ids(numbers: list) -> list[str]:
+    return [number.id for number in numbers]
+
+
+def test_catalog_filters() -> None:
+    catalog, _ = make_catalog()
+
+    assert ids(catalog.find()) == [n["id"] for n in NUMBERS]
+    assert ids(catalog.find(country="US", region="CA")) == ["+14155550001", "+14155550002"]
+    assert ids(catalog.find(country="US", region="CA", city="Los Angeles")) == ["+14155550002"]
+    assert ids(catalog.find(carrier="AT&T")) == ["+14155550002"]
+    assert ids(catalog.find(channels=["sms", "imessage"])) == ["+12125550003"]
+    assert ids(catalog.find(country="US", max_monthly_rate=5.0)) == ["+14155550001", "+14155550002"]
+    assert ids(catalog.find(min_reputation=0.8, min_monthly_rate=5.0)) == ["+14155550001", "+12125550003"]
+    assert catalog.find(country="FR") == []
+    london = catalog.get("+442075550004")
+    assert london is not None
+    assert london.location.city == "London"
+    assert catalog.get("+10000000000") is None
+
+
+def test_catalog_sorting() -> None:
+    catalog, _ = make_catalog()
+
+    assert ids(catalog.find(sort_by="monthly_rate", limit=2)) == ["+14155550002", "+442075550004"]
+    assert ids(catalog.find(country="US", sort_by="monthly_rate", descending=True)) == [
+        "+12125550003",
+        "+14155550001",
+        "+14155550002",
+    ]
+    assert ids(catalog.find(sort_by="reputation", descending=True, max_monthly_rate=6.0, limit=2)) == [
+        "+14155550001",
+        "+14155550002",
+    ]
+
+
+def test_catalog_ttl() -> None:
+    """Test that the catalog is fetched once and again after it expires."""
+    clock = FakeClock()
+    catalog, client = make_catalog(clock)
+
+    assert len(catalog) == len(NUMBERS)
+    catalog.find(country="US")
+    assert len(client.requests) == 1
+    clock.now = 60
+    catalog.find(country="US")
+    assert len(client.requests) == 2  # noqa: PLR2004
+
+
+def test_catalog_location_requires_parent() -> None:
+    catalog, _ = make_catalog()
+    with pytest.raises(ValueError, match="region requires country"):
+        catalog.find(region="CA")
+
+
+class CatalogServer:
+    """Serves `numbers` from `/leases`, answering 304 while the ETag matches."""
+
+    def __init__(self, numbers: list[dict]) -> None:
+        self.numbers = numbers
+        self.version = 1
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        etag = f'"{self.version}"'
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304)
+        response = api_response(self.numbers)
+        return httpx.Response(200, content=response.content, headers={"ETag": etag})
+
+    def update(self, numbers: list[dict]) -> None:
+        self.numbers = numbers
+        self.version += 1
+
+
+def test_watcher_diffs_by_id() -> None:
+    server = CatalogServer(NUMBERS)
+    client = MockApiClient(server)
+    watcher = CatalogWatcher(Leases(client=client), interval=60, min_interval=10, max_interval=120)
+
+    first = watcher.poll()
+    assert ids(first.added) == [n["id"] for n in NUMBERS]
+    assert watcher.interval == 30  # noqa: PLR2004
+
+    assert not watcher.poll()
+    assert client.requests[1].headers["If-None-Match"] == '"1"'
+    assert watcher.interval == 45  # noqa: PLR2004
+
+    reordered = dict(reversed(NUMBERS[1].items()))
+    repriced = {**NUMBERS[2], "pricing": {**NUMBERS[2]["pricing"], "monthly_rate": 2.0}}
+    server.update([NUMBERS[0], reordered, repriced, number_data("+14155550005")])
+    changes = watcher.poll()
+
+    assert ids(changes.added) == ["+14155550005"]
+    assert ids(changes.removed) == ["+442075550004"]
+    assert ids(changes.changed) == ["+12125550003"]
+    assert changes.changed[0].pricing.monthly_rate == 2.0  # noqa: PLR2004
+
+
+def test_watcher_thread_and_async_iterator() -> None:
+    server = CatalogServer(NUMBERS)
+    watcher = CatalogWatcher(Leases(client=MockApiClient(server)), interval=0.01, min_interval=0.01, max_interval=0.02)
+    received: list[CatalogChanges] = []
+    polled = threading.Event()
+
+    def on_changes(changes: CatalogChanges) -> None:
+        received.append(changes)
+        polled.set()
+
+    watcher.subscribe(on_changes)
+    watcher.start()
+    assert polled.wait(5)
+    watcher.stop()
+    assert len(received[0].added) == len(NUMBERS)
+
+    async def next_changes() -> CatalogChanges:
+        server.update(NUMBERS[:1])
+        return await anext(watcher.changes())
+
+    assert ids(asyncio.run(next_changes()).removed) == [n["id"] for n in NUMBERS[1:]]
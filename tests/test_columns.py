@@ -0,0 +1,52 @@
+import msgspec
+import pytest
+
+from contiguity import columns
+from contiguity.columns import NumberColumns
+from contiguity.leases import NumberDetails
+from tests import number_data
+
+NUMBERS = [
+    number_data("+14155550001", region="CA", monthly_rate=5.0, reputation=0.9, channels=["sms", "imessage"]),
+    number_data("+14155550002", region="CA", carrier="AT&T", monthly_rate=3.0, reputation=0.7),
+    number_data("+12125550003", region="NY", city="New York", monthly_rate=8.0, channels=["sms", "imessage"]),
+    number_data("+442075550004", country="GB", region="ENG", city="London", monthly_rate=4.0, reputation=0.5),
+]
+
+
+@pytest.fixture(params=["numpy", "python"])
+def number_columns(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> NumberColumns:
+    if request.param == "python":
+        monkeypatch.setattr(columns, "np", None)
+    elif columns.np is None:
+        pytest.skip("NumPy is not installed")
+    return NumberColumns.from_numbers(msgspec.convert(NUMBERS, list[NumberDetails]))
+
+
+def test_columns_filters(number_columns: NumberColumns) -> None:
+    """Test that filters select the numbers matching every condition."""
+    assert len(number_columns) == len(NUMBERS)
+    assert number_columns.where(country="US", region="CA").ids == ["+14155550001", "+14155550002"]
+    assert number_columns.where(channel="imessage", max_monthly_rate=6).ids == ["+14155550001"]
+    assert number_columns.where(min_reputation=0.8).ids == ["+14155550001", "+12125550003"]
+    assert number_columns.where(carrier="Verizon").ids == []
+    assert number_columns.where(carrier="AT&T").column("city") == ["San Francisco"]
+    assert list(number_columns.where(country="GB").column("monthly_rate")) == [4.0]
+
+
+def test_columns_aggregates(number_columns: NumberColumns) -> None:
+    """Test means and counts, overall and grouped by a string column."""
+    assert number_columns.mean("monthly_rate") == 5.0  # noqa: PLR2004
+    assert number_columns.mean_by("monthly_rate", "region") == {"CA": 4.0, "NY": 8.0, "ENG": 4.0}
+    assert number_columns.count_by("country") == {"US": 3, "GB": 1}
+    assert number_columns.where(country="FR").mean("monthly_rate") is None
+
+
+def test_columns_to_numpy() -> None:
+    """Test that numeric columns are exposed as read-only NumPy views."""
+    np = pytest.importorskip("numpy")
+    number_columns = NumberColumns.from_numbers(msgspec.convert(NUMBERS, list[NumberDetails]))
+    rates = number_columns.to_numpy("monthly_rate")
+    assert rates.dtype == np.float64
+    assert not rates.flags.writeable
+    assert rates.sum() == 20.0  # noqa: PLR2004
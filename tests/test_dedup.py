@@ -0,0 +1,77 @@
+from pathlib import Path
+
+import httpx
+import pytest
+
+from contiguity.dedup import DedupStore, MemoryDedupStore, SQLiteDedupStore
+from contiguity.text import Text
+from tests import MockApiClient, api_response, random_string
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request: pytest.FixtureRequest, tmp_path: Path) -> DedupStore:
+    if request.param == "memory":
+        return MemoryDedupStore(ttl=60, maxsize=3)
+    return SQLiteDedupStore(tmp_path / "dedup.sqlite3", ttl=60, maxsize=3)
+
+
+def _send_text(_: httpx.Request) -> httpx.Response:
+    return api_response({"message_id": random_string()})
+
+
+def test_dedup_store_get_put(store: DedupStore) -> None:
+    """Test remembering and looking up responses."""
+    assert store.get("a") is None
+    store.put("a", b"response")
+    assert store.get("a") == b"response"
+    assert tuple(store.info()) == (1, 1, 1)
+
+
+def test_dedup_store_expiry(store: DedupStore) -> None:
+    """Test that expired entries are not returned."""
+    store.ttl = -1
+    store.put("a", b"response")
+    assert store.get("a") is None
+
+
+def test_memory_dedup_store_bounded() -> None:
+    """Test that the in-memory store evicts the oldest entries."""
+    store = MemoryDedupStore(maxsize=3)
+    for key in "abcde":
+        store.put(key, key.encode())
+    assert len(store) == store.maxsize
+    assert store.get("a") is None
+    assert store.get("e") == b"e"
+
+
+def test_text_send_deduplicated(store: DedupStore) -> None:
+    """Test that repeated sends return the original message ID without a request."""
+    client = MockApiClient(_send_text)
+    text = Text(client=client, dedup=store)
+
+    first = text.send(to="+14155552671", message="Hello")
+    second = text.send(to="+1 415 555 2671", message="Hello")
+    other = text.send(to="+14155552671", message="Goodbye")
+
+    assert first.message_id == second.message_id != other.message_id
+    assert len(client.requests) == 2  # noqa: PLR2004
+    assert store.info().hits == 1
+
+
+def test_text_send_dedup_key(store: DedupStore) -> None:
+    """Test that a caller-supplied key identifies repeated sends."""
+    client = MockApiClient(_send_text)
+    text = Text(client=client, dedup=store)
+
+    first = text.send(to="+14155552671", message="Hello", dedup_key="job-1")
+    second = text.send(to="+14155552671", message="Hello again", dedup_key="job-1")
+
+    assert first.message_id == second.message_id
+    assert len(client.requests) == 1
+
+
+def test_dedup_key_requires_store() -> None:
+    """Test that passing a dedup key without a store fails."""
+    text = Text(client=MockApiClient(_send_text))
+    with pytest.raises(ValueError, match="dedup store"):
+        text.send(to="+14155552671", message="Hello", dedup_key="job-1")
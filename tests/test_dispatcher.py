@@ -0,0 +1,63 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from contiguity.dispatcher import ConversationDispatcher
+
+
+class RecordingSender:
+    def __init__(self, *, delay: float = 0.01) -> None:
+        self.delay = delay
+        self.sent: list[tuple[str, str]] = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, *, to: str, from_: str | None, message: str) -> str:  # noqa: ARG002
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+            self.sent.append((to, message))
+        if message == "fail":
+            msg = "send failed"
+            raise RuntimeError(msg)
+        return f"{to}:{message}"
+
+
+async def test_dispatcher_orders_per_conversation() -> None:
+    """Test that each conversation is sent in order while conversations run in parallel."""
+    sender = RecordingSender()
+    async with ConversationDispatcher(sender, max_concurrency=4) as dispatcher:
+        futures = [await dispatcher.submit(to=f"user{i % 8}", message=str(i // 8)) for i in range(80)]
+    results = await asyncio.gather(*futures)
+
+    assert results == [f"user{i % 8}:{i // 8}" for i in range(80)]
+    for user in range(8):
+        assert [message for to, message in sender.sent if to == f"user{user}"] == [str(i) for i in range(10)]
+    assert sender.max_active == 4  # noqa: PLR2004
+
+
+async def test_dispatcher_backpressure_and_errors() -> None:
+    """Test that submit waits when the dispatcher is full and errors only affect their own message."""
+    sender = RecordingSender(delay=0.05)
+    dispatcher = ConversationDispatcher(sender, max_pending=2)
+
+    first = await dispatcher.submit(to="user", message="fail")
+    await dispatcher.submit(to="user", message="a")
+    assert dispatcher.pending() == 2  # noqa: PLR2004
+    third = asyncio.create_task(dispatcher.submit(to="other", message="b"))
+    await asyncio.sleep(0.01)
+    assert not third.done()
+
+    with pytest.raises(RuntimeError, match="send failed"):
+        await first
+    assert await (await third) == "other:b"
+    await dispatcher.aclose()
+    assert [message for _, message in sender.sent] == ["fail", "a", "b"]
+    with pytest.raises(RuntimeError, match="closed"):
+        await dispatcher.submit(to="user", message="c")
@@ -0,0 +1,57 @@
+import httpx
+import pytest
+
+from contiguity.imessage import HistoryMessage, HistoryReaction, IMessage
+from tests import MockApiClient, api_response
+
+MESSAGES = 1000
+
+
+def _history_api(_: httpx.Request) -> httpx.Response:
+    message = {
+        "to": "+14155552671",
+        "from_": 14155550000,
+        "read": 0,
+        "delivery": {"status": "delivered", "delayed": False, "timestamp": 0},
+        "risk": {"auto_reported_as_spam": False, "marked_as_spam": False},
+        "attachments": [],
+    }
+    return api_response(
+        {
+            "conversation": [{**message, "message": f"message {i}", "timestamp": i} for i in range(MESSAGES)],
+            "reactions": [{"reaction": "love", "on": "message 0", "timestamp": 1, "action": "add", "from_": "x"}],
+            "chat": {
+                "filtered": False,
+                "chat_marked_as_spam": False,
+                "limit": MESSAGES,
+                "total": MESSAGES,
+                "count": 0,
+            },
+        },
+    )
+
+
+@pytest.fixture
+def imessage() -> IMessage:
+    return IMessage(client=MockApiClient(_history_api))
+
+
+def test_iter_history(imessage: IMessage) -> None:
+    """Test that streamed history items match the fully decoded history."""
+    items = list(imessage.iter_history(to="+14155552671", from_="+14155550000", limit=MESSAGES))
+    history = imessage.get_history(to="+14155552671", from_="+14155550000", limit=MESSAGES)
+
+    assert items == [*history.conversation, *history.reactions]
+    assert isinstance(items[0], HistoryMessage)
+    assert isinstance(items[-1], HistoryReaction)
+
+
+async def test_iter_history_async(imessage: IMessage) -> None:
+    """Test streaming history from async code."""
+    messages = [
+        item.message
+        async for item in imessage.iter_history_async(to="+14155552671", from_="+14155550000", limit=MESSAGES)
+        if isinstance(item, HistoryMessage)
+    ]
+
+    assert messages == [f"message {i}" for i in range(MESSAGES)]
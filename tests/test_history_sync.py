@@ -0,0 +1,114 @@
+from pathlib import Path
+
+import httpx
+import pytest
+
+from contiguity.history import HistoryStore, HistorySync
+from contiguity.imessage import IMessage
+from tests import MockApiClient, api_response
+
+
+class FakeHistoryApi:
+    def __init__(self) -> None:
+        self.messages: list[dict[str, object]] = []
+        self.limits: list[int] = []
+
+    def add(self, count: int) -> None:
+        for _ in range(count):
+            timestamp = len(self.messages)
+            self.messages.append(
+                {
+                    "to": "+14155552671",
+                    "from_": 14155550000,
+                    "message": f"message {timestamp}",
+                    "timestamp": timestamp,
+                    "read": 0,
+                    "delivery": {"status": "delivered", "delayed": False, "timestamp": timestamp},
+                    "risk": {"auto_reported_as_spam": False, "marked_as_spam": False},
+                    "attachments": [],
+                },
+            )
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        limit = int(request.url.path.rsplit("/", 1)[1])
+        self.limits.append(limit)
+        messages = self.messages[-limit:]
+        chat = {
+            "filtered": False,
+            "chat_marked_as_spam": False,
+            "limit": limit,
+            "total": len(self.messages),
+            "count": len(messages),
+        }
+        return api_response({"conversation": messages, "reactions": [], "chat": chat})
+
+
+@pytest.fixture
+def api() -> FakeHistoryApi:
+    api = FakeHistoryApi()
+    api.add(30)
+    return api
+
+
+def test_history_sync(api: FakeHistoryApi, tmp_path: Path) -> None:
+    """Test that fresh histories are served locally and stale ones only fetch new messages."""
+    now = 0.0
+    sync = HistorySync(
+        IMessage(client=MockApiClient(api)),
+        HistoryStore(tmp_path / "history.sqlite3"),
+        max_age=60,
+        fetch_limit=10,
+        clock=lambda: now,
+    )
+
+    history = sync.get_history(to="+14155552671", from_="+14155550000", limit=25)
+    assert [m.timestamp for m in history.conversation] == list(range(5, 30))
+    assert sync.get_history(to="+14155552671", from_="+14155550000", limit=5).conversation == history.conversation[-5:]
+    assert api.limits == [25]
+
+    api.add(25)
+    now = 60.0
+    history = sync.get_history(to="+14155552671", from_="+14155550000", limit=25)
+    assert [m.timestamp for m in history.conversation] == list(range(30, 55))
+    assert api.limits == [25, 10, 20, 40]
+
+    history = sync.get_history(to="+14155552671", from_="+14155550000", limit=50)
+    assert [m.timestamp for m in history.conversation] == list(range(5, 55))
+    assert history.chat.count == 50  # noqa: PLR2004
+    assert api.limits == [25, 10, 20, 40]
+
+    history = sync.get_history(to="+14155552671", from_="+14155550000", limit=100)
+    assert len(history.conversation) == 55  # noqa: PLR2004
+    assert api.limits == [25, 10, 20, 40, 100]
+
+
+def test_history_sync_new_messages(api: FakeHistoryApi, tmp_path: Path) -> None:
+    """Test that sync() reports the number of new messages."""
+    sync = HistorySync(IMessage(client=MockApiClient(api)), HistoryStore(tmp_path / "history.sqlite3"))
+
+    assert sync.sync(to="+14155552671", from_="+14155550000", limit=30) == 30  # noqa: PLR2004
+    assert sync.sync(to="+14155552671", from_="+14155550000") == 0
+    api.add(3)
+    assert sync.sync(to="+14155552671", from_="+14155550000") == 3  # noqa: PLR2004
+
+
+def test_history_sync_gap(api: FakeHistoryApi, tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    """Test that sync() records and warns about new messages beyond max_fetch_limit."""
+    store = HistoryStore(tmp_path / "history.sqlite3")
+    sync = HistorySync(IMessage(client=MockApiClient(api)), store, fetch_limit=10, max_fetch_limit=20)
+    conversation = "+14155552671:+14155550000"
+
+    sync.sync(to="+14155552671", from_="+14155550000", limit=30)
+    api.add(25)
+    assert sync.sync(to="+14155552671", from_="+14155550000") == 20  # noqa: PLR2004
+    assert api.limits == [30, 10, 20]
+    assert store.gaps(conversation) == [(29, 35)]
+    assert "has a gap" in caplog.text
+
+    api.add(1)
+    sync.sync(to="+14155552671", from_="+14155550000")
+    assert store.gaps(conversation) == [(29, 35)]
+
+    sync.sync(to="+14155552671", from_="+14155550000", limit=100)
+    assert store.gaps(conversation) == []
+    assert store.count(conversation) == 56  # noqa: PLR2004
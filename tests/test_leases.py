@@ -1 +1,85 @@
-# Not implemented yet.
+from collections.abc import Callable
+
+import httpx
+
+from contiguity._client import ContiguityApiError
+from contiguity.leases import Leases
+from tests import MockApiClient, api_response, number_data
+
+
+def test_get_available_numbers() -> None:
+    """Test that the available numbers are fetched and decoded."""
+    client = MockApiClient(lambda _: api_response([number_data("+14155550001"), number_data("+14155550002")]))
+    numbers = Leases(client=client).get_available_numbers()
+
+    assert client.requests[0].url.path == "/leases"
+    assert [number.id for number in numbers] == ["+14155550001", "+14155550002"]
+    assert numbers[0].location.region == "CA"
+
+
+def lease_handler(attempts: dict[str, int]) -> Callable[[httpx.Request], httpx.Response]:
+    """Fail the first lease of +14155550002 with a 503, and every lease of +14155550003 with a 409."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        number = request.url.path.rsplit("/", 1)[1]
+        attempts[number] = attempts.get(number, 0) + 1
+        if number == "+14155550002" and attempts[number] == 1:
+            return api_response({"error": "unavailable", "status": 503}, status_code=503)
+        if number == "+14155550003":
+            return api_response({"error": "already leased", "status": 409}, status_code=409)
+        if request.method == "DELETE":
+            return api_response({"lease_id": "lease", "number_id": number, "status": "terminated", "terminated_at": 0})
+        return api_response(number_data(number, lease_status="active"))
+
+    return handler
+
+
+def test_lease_numbers() -> None:
+    """Test that numbers are leased in bulk, retrying transient errors and reporting the rest."""
+    attempts: dict[str, int] = {}
+    leases = Leases(client=MockApiClient(lease_handler(attempts)))
+    numbers = ["+14155550001", "+14155550002", "+14155550003"]
+
+    results = {r.item: r for r in leases.lease_numbers(numbers, billing_method="monthly", retry_backoff=0)}
+
+    leased = results["+14155550001"].response
+    assert leased is not None
+    assert leased.lease_status == "active"
+    assert results["+14155550002"].ok
+    assert isinstance(results["+14155550003"].error, ContiguityApiError)
+    assert attempts == {"+14155550001": 1, "+14155550002": 2, "+14155550003": 1}
+
+
+def test_lease_numbers_retries_only_unprocessed_requests() -> None:
+    """Test that leases are only retried when the API cannot have acted on the request."""
+    attempts: dict[str, int] = {}
+    numbers = ["+14155550001", "+14155550002", "+14155550003"]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        number = request.url.path.rsplit("/", 1)[1]
+        attempts[number] = attempts.get(number, 0) + 1
+        if number == "+14155550002":
+            msg = "timed out"
+            raise httpx.ReadTimeout(msg, request=request)
+        if number == "+14155550003":
+            msg = "connection refused"
+            raise httpx.ConnectError(msg, request=request)
+        return api_response({"error": "internal error", "status": 500}, status_code=500)
+
+    leases = Leases(client=MockApiClient(handler))
+    results = list(leases.lease_numbers(numbers, billing_method="monthly", retries=2, retry_backoff=0))
+
+    assert not any(result.ok for result in results)
+    assert attempts == {"+14155550001": 1, "+14155550002": 1, "+14155550003": 3}
+
+
+async def test_terminate_leases_async() -> None:
+    """Test that leases are terminated in bulk from async code, reporting failures per number."""
+    attempts: dict[str, int] = {}
+    leases = Leases(client=MockApiClient(lease_handler(attempts)))
+    numbers = ["+14155550001", "+14155550002", "+14155550003"]
+
+    results = [r async for r in leases.terminate_leases_async(numbers, retries=0)]
+
+    assert sorted(r.item if isinstance(r.item, str) else r.item.id for r in results if r.ok) == ["+14155550001"]
+    assert attempts == {"+14155550001": 1, "+14155550002": 1, "+14155550003": 1}
@@ -0,0 +1,110 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import msgspec
+import pytest
+
+from contiguity.otp import OTP
+from contiguity.otp_sessions import OTPSessionBackend, OTPSessionStore
+from tests import MockApiClient, api_response, random_string
+
+NUMBER = "+14155552671"
+
+
+class DictBackend(OTPSessionBackend):
+    def __init__(self) -> None:
+        self.values: dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, /) -> bytes | None:
+        return self.values.get(key)
+
+    def set(self, key: str, value: bytes, /, *, ttl: float) -> None:  # noqa: ARG002
+        self.values[key] = value
+
+    def delete(self, key: str, /) -> None:
+        self.values.pop(key, None)
+
+    def increment(self, key: str, /, *, ttl: float) -> int:  # noqa: ARG002
+        with self._lock:
+            count = int(self.values.get(key, b"0")) + 1
+            self.values[key] = str(count).encode()
+            return count
+
+
+def _otp_api(request: httpx.Request) -> httpx.Response:
+    payload = msgspec.json.decode(request.content)
+    if request.url.path == "/otp/new":
+        return api_response({"otp_id": random_string()})
+    return api_response({"verified": payload["otp"] == "123456"})
+
+
+@pytest.fixture
+def client() -> MockApiClient:
+    return MockApiClient(_otp_api)
+
+
+def test_send_reuses_live_otp(client: MockApiClient) -> None:
+    """Test that a pending OTP is reused until it expires."""
+    now = 0.0
+    sessions = OTPSessionStore(OTP(client=client), ttl=60, clock=lambda: now)
+
+    first = sessions.send(NUMBER, session_id="session-1")
+    assert sessions.send("+1 415-555-2671").otp_id == first.otp_id
+    assert sessions.for_session("session-1") == first
+    assert len(client.requests) == 1
+
+    now = 60.0
+    assert sessions.live(NUMBER) is None
+    assert len(sessions) == 0
+    assert sessions.send(NUMBER).otp_id != first.otp_id
+
+
+def test_verify_attempts(client: MockApiClient) -> None:
+    """Test that attempts are counted and a verified session is discarded."""
+    sessions = OTPSessionStore(OTP(client=client), max_attempts=2)
+    sessions.send(NUMBER)
+
+    assert not sessions.verify(NUMBER, "000000").verified
+    assert sessions.verify(NUMBER, 123456).verified
+    assert sessions.live(NUMBER) is None
+    with pytest.raises(ValueError, match="no pending OTP"):
+        sessions.verify(NUMBER, 123456)
+
+    sessions.send(NUMBER)
+    for _ in range(2):
+        sessions.verify(NUMBER, "000000")
+    with pytest.raises(ValueError, match="too many verification attempts"):
+        sessions.verify(NUMBER, 123456)
+
+
+def test_shared_backend(client: MockApiClient) -> None:
+    """Test that sessions are shared between stores through the backend."""
+    backend = DictBackend()
+    first = OTPSessionStore(OTP(client=client), backend=backend)
+    second = OTPSessionStore(OTP(client=client), backend=backend)
+
+    session = first.send(NUMBER, session_id="session-1")
+    assert second.send(NUMBER) == session
+    assert second.for_session("session-1") == session
+    assert second.verify(NUMBER, 123456).verified
+    assert not backend.values
+    assert first.live(NUMBER) is None
+
+
+def test_concurrent_verify_attempts(client: MockApiClient) -> None:
+    """Test that concurrent verifications cannot exceed the attempt limit, with or without a backend."""
+    for backend in (None, DictBackend()):
+        sessions = OTPSessionStore(OTP(client=client), max_attempts=3, backend=backend)
+        sessions.send(NUMBER)
+
+        def verify(_: int, sessions: OTPSessionStore = sessions) -> bool:
+            try:
+                sessions.verify(NUMBER, "000000")
+            except ValueError:
+                return False
+            return True
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            assert sum(executor.map(verify, range(20))) == sessions.max_attempts
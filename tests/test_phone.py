@@ -0,0 +1,122 @@
+import random
+
+import phonenumbers
+import pytest
+
+from contiguity._phone import FORMATTING_FAILED, PARSING_FAILED, E164Index, PhoneNumberNormalizer
+
+
+@pytest.fixture
+def normalizer() -> PhoneNumberNormalizer:
+    return PhoneNumberNormalizer(maxsize=4)
+
+
+def test_normalize_formats_e164(normalizer: PhoneNumberNormalizer) -> None:
+    """Test that valid numbers are normalized to E.164."""
+    assert normalizer.normalize("+44 20 7946 0958") == "+442079460958"
+    assert normalizer.normalize("+14155552671") == "+14155552671"
+
+
+def test_normalize_invalid_number(normalizer: PhoneNumberNormalizer) -> None:
+    """Test that invalid numbers raise ValueError with the original messages."""
+    with pytest.raises(ValueError, match="parsing failed"):
+        normalizer.normalize("invalid_number")
+    with pytest.raises(ValueError, match="formatting failed"):
+        normalizer.normalize("+1234")
+
+
+def test_normalize_caches_results(normalizer: PhoneNumberNormalizer) -> None:
+    """Test that successes and failures are both served from the cache."""
+    for _ in range(3):
+        normalizer.normalize("+14155552671")
+        assert normalizer.is_valid("+1234") is False
+
+    info = normalizer.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (4, 2, 2)
+
+
+def test_normalize_cache_is_bounded(normalizer: PhoneNumberNormalizer) -> None:
+    """Test that the cache never grows beyond its maximum size."""
+    for suffix in range(10):
+        normalizer.is_valid(f"+1415555267{suffix}")
+
+    assert normalizer.cache_info().currsize == normalizer.maxsize
+    normalizer.cache_clear()
+    assert normalizer.cache_info().currsize == 0
+
+
+def _parse_reference(number: str) -> tuple[str | None, str | None]:
+    try:
+        parsed_number = phonenumbers.parse(number, None)
+    except phonenumbers.NumberParseException:
+        return None, PARSING_FAILED
+    if not phonenumbers.is_valid_number(parsed_number):
+        return None, FORMATTING_FAILED
+    return phonenumbers.format_number(parsed_number, phonenumbers.PhoneNumberFormat.E164), None
+
+
+def _example_numbers() -> list[str]:
+    numbers = []
+    for region in sorted(phonenumbers.SUPPORTED_REGIONS):
+        for number_type in (phonenumbers.PhoneNumberType.MOBILE, phonenumbers.PhoneNumberType.FIXED_LINE):
+            example = phonenumbers.example_number_for_type(region, number_type)
+            if example is not None:
+                numbers.append(phonenumbers.format_number(example, phonenumbers.PhoneNumberFormat.E164))
+    return numbers
+
+
+def test_e164_index_matches_phonenumbers() -> None:
+    """Test that the E.164 fast path agrees with a full phonenumbers parse."""
+    rng = random.Random(0)
+    numbers = _example_numbers()
+    for number in list(numbers):
+        for _ in range(5):
+            digits = list(number[2:])
+            digits[rng.randrange(len(digits))] = str(rng.randrange(10))
+            numbers.append(number[:2] + "".join(digits))
+
+    index = E164Index()
+    for number in numbers:
+        result = index.lookup(number)
+        if result is not None:
+            assert result == _parse_reference(number), number
+
+
+def test_normalize_matches_phonenumbers() -> None:
+    """Test that validation of loosely formatted input agrees with phonenumbers."""
+    normalizer = PhoneNumberNormalizer(maxsize=0)
+    for number in _example_numbers():
+        spaced = f"{number[:3]} {number[3:]}"
+        assert (normalizer.is_valid(spaced), normalizer.is_valid(spaced[:-2])) == (
+            _parse_reference(spaced)[0] is not None,
+            _parse_reference(spaced[:-2])[0] is not None,
+        ), number
+
+
+def test_e164_index_defers_non_canonical_input() -> None:
+    """Test that input which is not strict E.164 is left to phonenumbers."""
+    index = E164Index()
+    assert index.lookup("+14155552671") == ("+14155552671", None)
+    assert index.lookup("+1 415 555 2671") is None
+    assert index.lookup("4155552671") is None
+    assert index.lookup("+80012345678") is None
+
+
+def test_normalize_allowed_regions() -> None:
+    """Test that numbers outside the allowed regions are rejected early."""
+    normalizer = PhoneNumberNormalizer(regions=["CA"])
+    assert normalizer.normalize("+1 613 555 0123") == "+16135550123"
+    for number in ("+14155552671", "+442079460958", "+44 20 7946 0958"):
+        with pytest.raises(ValueError, match="region check failed"):
+            normalizer.normalize(number)
+
+
+def test_normalize_allowed_regions_sharing_a_calling_code() -> None:
+    """Test that numbers are matched to their own region before checking it, not to an allowed region."""
+    for region, allowed, other in (("CA", "+16135550123", "+15298380770"), ("GG", "+447781123456", "+447091434301")):
+        normalizer = PhoneNumberNormalizer(regions=[region])
+        assert normalizer.normalize(allowed) == allowed
+        assert phonenumbers.region_code_for_number(phonenumbers.parse(other)) != region
+        for number in (other, f"{other[:3]} {other[3:]}"):
+            with pytest.raises(ValueError, match="region check failed"):
+                normalizer.normalize(number)
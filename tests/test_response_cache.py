@@ -0,0 +1,90 @@
+import httpx
+
+from contiguity.domains import Domains
+from contiguity.leases import Leases
+from contiguity.response_cache import ResponseCache
+from tests import MockApiClient, api_response, number_data
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def cached_response(data: object, headers: dict[str, str]) -> httpx.Response:
+    response = api_response(data)
+    return httpx.Response(response.status_code, content=response.content, headers=headers)
+
+
+def test_response_cache_fresh_and_revalidated() -> None:
+    """Test that fresh responses skip the request and stale ones are revalidated without decoding."""
+    clock = FakeClock()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, headers={"Cache-Control": "max-age=30"})
+        return cached_response([number_data("+14155550001")], {"Cache-Control": "max-age=60", "ETag": '"v1"'})
+
+    client = MockApiClient(handler)
+    client.response_cache = ResponseCache(clock=clock)
+    leases = Leases(client=client)
+
+    first = leases.get_available_numbers()
+    assert leases.get_available_numbers() is first
+    assert len(client.requests) == 1
+
+    clock.now = 60
+    assert leases.get_available_numbers() is first
+    assert client.requests[1].headers["If-None-Match"] == '"v1"'
+    clock.now = 89
+    assert leases.get_available_numbers() is first
+    assert len(client.requests) == 2  # noqa: PLR2004
+    assert client.response_cache.info()[:3] == (2, 1, 1)
+
+
+def test_response_cache_no_store_and_invalidation() -> None:
+    """Test that no-store responses are not cached and writes invalidate cached reads."""
+    responses = {
+        "/leased": cached_response([number_data("+14155550001")], {"Cache-Control": "max-age=60"}),
+        "/domains": cached_response([], {"Cache-Control": "no-store"}),
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "DELETE":
+            return api_response(
+                {"lease_id": "lease", "number_id": "+14155550001", "status": "terminated", "terminated_at": 0},
+            )
+        return responses[request.url.path]
+
+    client = MockApiClient(handler)
+    client.response_cache = ResponseCache()
+    leases = Leases(client=client)
+    domains = Domains(client=client)
+
+    domains.list()
+    domains.list()
+    leases.get_leased_numbers()
+    leases.get_leased_numbers()
+    assert [request.url.path for request in client.requests] == ["/domains", "/domains", "/leased"]
+
+    leases.terminate_lease("+14155550001")
+    leases.get_leased_numbers()
+    assert len(client.requests) == 5  # noqa: PLR2004
+
+
+def test_response_cache_evicts_by_bytes() -> None:
+    cache = ResponseCache(max_bytes=100)
+    headers = {"cache-control": "max-age=60"}
+    cache.store("/a", "a", headers, nbytes=60)
+    cache.store("/b", "b", headers, nbytes=30)
+    assert cache.lookup("/a")[0] == "a"
+    cache.store("/c", "c", headers, nbytes=30)
+
+    assert cache.lookup("/b") == (None, {})
+    assert cache.lookup("/a")[0] == "a"
+    assert cache.info().nbytes == 90  # noqa: PLR2004
+    cache.store("/d", "d", headers, nbytes=200)
+    assert len(cache) == 2  # noqa: PLR2004
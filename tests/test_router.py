@@ -0,0 +1,103 @@
+import httpx
+import msgspec
+import pytest
+
+from contiguity._client import ContiguityApiError
+from contiguity.capabilities import CapabilityCache
+from contiguity.imessage import IMessage
+from contiguity.leases import NumberCapabilities
+from contiguity.router import MessageRouter, Recipient
+from contiguity.text import Text
+from contiguity.whatsapp import WhatsApp
+from tests import MockApiClient, api_response, random_string
+
+NO_IMESSAGE = "+14155552672"
+
+
+def _api(request: httpx.Request) -> httpx.Response:
+    payload = msgspec.json.decode(request.content)
+    if request.url.path == "/imessage" and payload["to"] == NO_IMESSAGE:
+        return api_response({"error": "recipient does not support iMessage", "status": 422}, status_code=422)
+    return api_response({"message_id": f"{request.url.path}:{payload['message']}:{random_string()}"})
+
+
+def _router(client: MockApiClient, **kwargs: object) -> MessageRouter:
+    return MessageRouter(
+        Text(client=client),
+        IMessage(client=client),
+        WhatsApp(client=client),
+        capabilities=CapabilityCache(),
+        **kwargs,  # type: ignore[arg-type]
+    )
+
+
+def test_route_policy() -> None:
+    """Test that channels are limited by the sender's capabilities and ordered by cost and capability."""
+    client = MockApiClient(_api)
+    router = _router(client, sender=NumberCapabilities(intl_sms=False, channels=["sms", "imessage"]))
+    assert router.route("+14155552671") == ["imessage", "text"]
+
+    router = _router(client, costs={"imessage": 1, "whatsapp": 1, "text": 2})
+    router._capabilities.record("+14155552671", "whatsapp", supported=True)  # noqa: SLF001
+    assert router.route("+14155552671") == ["whatsapp", "imessage", "text"]
+
+
+def test_router_send_falls_back() -> None:
+    """Test that a rejected channel is remembered and skipped on the next send."""
+    client = MockApiClient(_api)
+    router = _router(client, preference=("imessage", "text"))
+
+    first = router.send(to=NO_IMESSAGE, message="Hi")
+    second = router.send(to=NO_IMESSAGE, message="Hi")
+
+    assert (first.channel, first.rejected) == ("text", ("imessage",))
+    assert (second.channel, second.rejected) == ("text", ())
+    assert len(client.requests) == 3  # noqa: PLR2004
+
+
+def test_router_send_many() -> None:
+    """Test sending a templated message to many recipients on their best channels."""
+    client = MockApiClient(_api)
+    router = _router(client, preference=("imessage", "text"))
+    recipients = [Recipient(to=f"+1415555267{i}", variables={"name": f"User {i}"}) for i in range(1, 4)]
+
+    results = {result.item.to: result for result in router.send_many(recipients, message="Hi {name}")}
+
+    assert all(result.ok for result in results.values())
+    assert {to: result.response.channel for to, result in results.items() if result.response} == {
+        "+14155552671": "imessage",
+        "+14155552672": "text",
+        "+14155552673": "imessage",
+    }
+    assert results["+14155552673"].response
+    assert results["+14155552673"].response.message_id.startswith("/imessage:Hi User 3:")
+
+
+def test_router_bad_request_is_not_cached() -> None:
+    """Test that a bad request is raised rather than cached, and that entries are keyed by the E.164 number."""
+    client = MockApiClient(
+        lambda request: (
+            api_response({"error": "recipient does not support attachments", "status": 400}, status_code=400)
+            if msgspec.json.decode(request.content).get("attachments")
+            else _api(request)
+        ),
+    )
+    router = _router(client, preference=("imessage", "text"))
+
+    with pytest.raises(ContiguityApiError, match="does not support attachments"):
+        router.send(to="+14155552671", message="Hi", attachments=["file"])
+    assert router.route("+14155552671") == ["imessage", "text"]
+
+    router.send(to=NO_IMESSAGE, message="Hi")
+    assert router.route("+1 415 555 2672") == ["text"]
+
+
+def test_router_send_many_without_variables_is_not_templated() -> None:
+    """Test that braces in the message are sent as written to recipients without variables."""
+    client = MockApiClient(_api)
+    router = _router(client, preference=("imessage", "text"))
+
+    results = list(router.send_many(["+14155552671", NO_IMESSAGE], message="Use code {ABC}"))
+
+    assert all(result.ok for result in results)
+    assert {msgspec.json.decode(request.content)["message"] for request in client.requests} == {"Use code {ABC}"}
@@ -0,0 +1,88 @@
+from collections import Counter
+
+import msgspec
+import pytest
+
+from contiguity.leases import Leases, NumberDetails
+from contiguity.senders import SenderPool
+from tests import MockApiClient, api_response, number_data
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_numbers(*reputations: float) -> list[NumberDetails]:
+    return [
+        msgspec.convert(number_data(f"+1415555{i:04d}", reputation=reputation, lease_status="active"), NumberDetails)
+        for i, reputation in enumerate(reputations)
+    ]
+
+
+def test_sender_pool_from_leases() -> None:
+    """Test that the pool is built from the active leased numbers."""
+    numbers = [
+        number_data("+14155550001", lease_status="active"),
+        number_data("+14155550002", lease_status="terminated"),
+        number_data("+14155550003", lease_status="active", reputation=0.0),
+    ]
+    client = MockApiClient(lambda _: api_response(numbers))
+    pool = SenderPool.from_leases(Leases(client=client))
+
+    assert client.requests[0].url.path == "/leased"
+    assert pool.numbers == ("+14155550001",)
+
+
+def test_sender_pool_channel() -> None:
+    """Test that only numbers able to send on the pool's channel are used."""
+    numbers = [
+        number_data("+14155550001", lease_status="active", channels=["sms", "mms"]),
+        number_data("+14155550002", lease_status="active", channels=["sms", "imessage"]),
+    ]
+    leases = Leases(client=MockApiClient(lambda _: api_response(numbers)))
+
+    assert SenderPool.from_leases(leases, channel="imessage").numbers == ("+14155550002",)
+    assert SenderPool.from_leases(leases).numbers == ("+14155550001", "+14155550002")
+    with pytest.raises(ValueError, match="no leased numbers available to send from on whatsapp"):
+        SenderPool.from_leases(leases, channel="whatsapp")
+
+
+def test_sender_pool_weighted_round_robin() -> None:
+    """Test that new recipients are spread across numbers in proportion to their reputation."""
+    clock = FakeClock()
+    pool = SenderPool(make_numbers(0.75, 0.5, 0.25), rate=100, clock=clock)
+
+    counts = Counter(pool.acquire(f"user{i}") for i in range(60))
+
+    assert counts == {"+14155550000": 30, "+14155550001": 20, "+14155550002": 10}
+    # Smooth round-robin interleaves numbers instead of sending bursts from one.
+    assert [pool.sender_for(f"user{i}") for i in range(3)] == ["+14155550000", "+14155550001", "+14155550000"]
+
+
+def test_sender_pool_sticky_and_rate_limited() -> None:
+    """Test that recipients keep their number and new recipients skip numbers without throughput."""
+    clock = FakeClock()
+    pool = SenderPool(make_numbers(0.9, 0.1), rate=1, clock=clock)
+    sent: list[tuple[str, str]] = []
+
+    def send(*, to: str, from_: str, message: str) -> str:
+        sent.append((to, from_))
+        return message
+
+    assert pool.send(send, to="alice", message="hi") == "hi"
+    # The reputable number has no throughput left, so the next recipient is sent from the other one.
+    pool.send(send, to="bob", message="hi")
+    clock.now += 1
+    pool.send(send, to="bob", message="again")
+
+    assert sent == [("alice", "+14155550000"), ("bob", "+14155550001"), ("bob", "+14155550001")]
+    assert pool.info().sticky == 2  # noqa: PLR2004
+
+
+def test_sender_pool_requires_numbers() -> None:
+    with pytest.raises(ValueError, match="no leased numbers"):
+        SenderPool(make_numbers(0.0))
@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import msgspec
+import pytest
+
+from contiguity._singleflight import SingleFlight
+from contiguity.otp import OTP
+from tests import MockApiClient, api_response
+
+
+def _otp_api(request: httpx.Request) -> httpx.Response:
+    time.sleep(0.05)
+    payload = msgspec.json.decode(request.content)
+    if request.url.path == "/otp/resend":
+        return api_response({"resent": True})
+    return api_response({"verified": payload["otp"] == "123456"})
+
+
+def test_single_flight_shares_errors() -> None:
+    """Test that callers waiting on a failing call receive its exception."""
+    flight: SingleFlight[str, int] = SingleFlight()
+    started = threading.Event()
+
+    def fail() -> int:
+        started.set()
+        time.sleep(0.05)
+        msg = "failed"
+        raise RuntimeError(msg)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(flight.do, "key", fail)
+        started.wait()
+        follower = executor.submit(flight.do, "key", lambda: 1)
+        for future in (leader, follower):
+            with pytest.raises(RuntimeError, match="failed"):
+                future.result()
+    assert flight.do("key", lambda: 1) == 1
+
+
+def test_otp_verify_coalesced() -> None:
+    """Test that concurrent identical verifications share one request."""
+    client = MockApiClient(_otp_api)
+    otp = OTP(client=client)
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        results = list(executor.map(lambda _: otp.verify(123456, otp_id="otp-1"), range(5)))
+
+    assert all(result.verified for result in results)
+    assert len(client.requests) == 1
+
+
+async def test_otp_verify_async_coalesced() -> None:
+    """Test that concurrent identical async verifications share one request, but different codes do not."""
+    client = MockApiClient(_otp_api)
+    otp = OTP(client=client)
+
+    results = await asyncio.gather(
+        *(otp.verify_async("123456", otp_id="otp-1") for _ in range(5)),
+        otp.verify_async("000000", otp_id="otp-1"),
+    )
+
+    assert [result.verified for result in results] == [True] * 5 + [False]
+    assert len(client.requests) == 2  # noqa: PLR2004
+
+
+async def test_otp_resend_cooldown() -> None:
+    """Test that resends within the cooldown reuse the previous response."""
+    client = MockApiClient(_otp_api)
+    otp = OTP(client=client, resend_cooldown=60)
+
+    await asyncio.gather(*(otp.resend_async("otp-1") for _ in range(3)))
+    assert otp.resend("otp-1").resent
+    otp.resend("otp-2")
+    assert len(client.requests) == 2  # noqa: PLR2004
+
+    otp = OTP(client=client, resend_cooldown=None)
+    otp.resend("otp-1")
+    otp.resend("otp-1")
+    assert len(client.requests) == 4  # noqa: PLR2004
@@ -0,0 +1,112 @@
+from pathlib import Path
+
+import pytest
+
+from contiguity.email import Email
+from contiguity.imessage import IMessage
+from contiguity.router import MessageRouter
+from contiguity.suppression import SuppressedRecipientError, SuppressionIndex, SuppressionList
+from contiguity.text import Text
+from contiguity.whatsapp import WhatsApp
+from tests import MockApiClient, api_response, random_string
+
+
+def test_suppression_index(tmp_path: Path) -> None:
+    """Test that the index contains exactly the suppressed recipients, ignoring case."""
+    suppressed = [f"user{i}@example.com" for i in range(1000)]
+    index = SuppressionIndex.build(tmp_path / "suppressed.idx", [*suppressed, "", "+14155552671"])
+
+    assert len(index) == len(suppressed) + 1
+    assert all(recipient in index for recipient in suppressed)
+    assert "USER1@example.com " in index
+    assert "+14155552671" in index
+    assert not any(f"other{i}@example.com" in index for i in range(1000))
+
+
+def test_suppression_index_invalid_file(tmp_path: Path) -> None:
+    """Test that loading a file that is not an index fails."""
+    path = tmp_path / "bounces.txt"
+    path.write_text("user@example.com\n")
+    with pytest.raises(ValueError, match="not a suppression index"):
+        SuppressionIndex(path)
+
+
+def test_suppression_list_reload(tmp_path: Path) -> None:
+    """Test that a rebuilt index is picked up by reload()."""
+    path = tmp_path / "suppressed.idx"
+    SuppressionIndex.build(path, ["a@example.com"])
+    suppression = SuppressionList(path)
+    assert suppression.is_suppressed("a@example.com")
+
+    SuppressionIndex.build(path, ["b@example.com"])
+    suppression.reload()
+    assert not suppression.is_suppressed("a@example.com")
+    assert suppression.is_suppressed("b@example.com")
+    assert tuple(suppression.info()) == (3, 2, 1)
+
+
+def test_send_to_suppressed_recipient(tmp_path: Path) -> None:
+    """Test that sends to suppressed recipients are rejected without a request."""
+    client = MockApiClient(lambda _: api_response({"message_id": random_string(), "email_id": random_string()}))
+    suppression = SuppressionList(
+        SuppressionIndex.build(tmp_path / "suppressed.idx", ["bounce@example.com", "+14155552671"]),
+    )
+    text = Text(client=client, suppression=suppression)
+    email = Email(client=client, suppression=suppression)
+
+    with pytest.raises(SuppressedRecipientError):
+        text.send(to="+1 (415) 555-2671", message="Hi")
+    with pytest.raises(SuppressedRecipientError):
+        email.send(to="bounce@example.com", from_="Contiguity", subject="Hi", body_text="Hi")
+    assert not client.requests
+
+    email.send(to="ok@example.com", from_="Contiguity", subject="Hi", body_text="Hi")
+    assert len(client.requests) == 1
+    assert tuple(suppression.info()) == (3, 2, 2)
+
+
+def test_bulk_sends_skip_suppressed_recipients(tmp_path: Path) -> None:
+    """Test that templates, bulk email, BCC batches and routed sends reject suppressed recipients."""
+    client = MockApiClient(lambda _: api_response({"message_id": random_string(), "email_id": random_string()}))
+    suppression = SuppressionList(
+        SuppressionIndex.build(tmp_path / "suppressed.idx", ["bounce@example.com", "+14155552671"]),
+    )
+    text = Text(client=client, suppression=suppression)
+    email = Email(client=client, suppression=suppression)
+    router = MessageRouter(text, IMessage(client=client), WhatsApp(client=client))
+
+    with pytest.raises(SuppressedRecipientError):
+        text.template(message="Hi {name}").send(to="+1 415 555 2671", variables={"name": "A"})
+    with pytest.raises(SuppressedRecipientError):
+        router.send(to="+14155552671", message="Hi")
+    with pytest.raises(SuppressedRecipientError):
+        email.send(to="ok@example.com", from_="Contiguity", subject="Hi", body_text="Hi", cc=["Bounce@example.com"])
+    assert not client.requests
+
+    results = list(
+        email.send_many(["ok@example.com", "bounce@example.com"], from_="Contiguity", subject="Hi", body_text="Hi"),
+    )
+    assert {r.item.to: type(r.error) for r in results} == {
+        "ok@example.com": type(None),
+        "bounce@example.com": SuppressedRecipientError,
+    }
+    routed = list(router.send_many(["+14155552671", "+14155552672"], message="Hi"))
+    assert sorted((r.item.to, r.ok) for r in routed) == [("+14155552671", False), ("+14155552672", True)]
+
+    client.requests.clear()
+    batches = list(
+        email.send_bcc_batches(
+            ["a@example.com", "bounce@example.com", "b@example.com"],
+            to="list@example.com",
+            from_="Contiguity",
+            subject="Hi",
+            body_text="Hi",
+            batch_size=2,
+        ),
+    )
+    assert sorted((r.item, r.ok) for r in batches) == [
+        (("a@example.com", "b@example.com"), True),
+        (("bounce@example.com",), False),
+    ]
+    assert isinstance(next(r.error for r in batches if not r.ok), SuppressedRecipientError)
+    assert len(client.requests) == 1
@@ -0,0 +1,108 @@
+import msgspec
+import pytest
+
+from contiguity import Contiguity
+from contiguity.email import Email, EmailMessage
+from tests import MockApiClient, api_response
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch) -> Contiguity:
+    monkeypatch.setenv("CONTIGUITY_TOKEN", "test")
+    return Contiguity()
+
+
+def test_text_template_render(client: Contiguity) -> None:
+    """Test that a rendered text template matches the regular payload."""
+    template = client.text.template(message='Hi {name}, your code is {code:>06}. "Thanks"', from_="+14155552670")
+
+    body = template.render(to="+1 415 555 2671", variables={"name": "Ann\n", "code": 42})
+
+    assert template.fields == {"name", "code"}
+    assert msgspec.json.decode(body) == {
+        "to": "+14155552671",
+        "message": 'Hi Ann\n, your code is 000042. "Thanks"',
+        "from": "+14155552670",
+    }
+
+
+def test_email_template_render(client: Contiguity) -> None:
+    """Test that a rendered email template matches the regular payload."""
+    template = client.email.template(
+        from_="Contiguity",
+        subject="Hello {user.name}",
+        body_html="<style>b {{ color: red }}</style><b>{items[0]}</b>",
+        cc=["cc@example.com"],
+    )
+
+    class User:
+        name = "Ann"
+
+    body = template.render(to="ann@example.com", variables={"user": User(), "items": ["<3"]})
+
+    assert msgspec.json.decode(body) == {
+        "to": "ann@example.com",
+        "from": "Contiguity",
+        "subject": "Hello Ann",
+        "body": {"text": None, "html": "<style>b { color: red }</style><b><3</b>"},
+        "cc": ["cc@example.com"],
+    }
+
+
+def test_imessage_template_render(client: Contiguity) -> None:
+    """Test that a rendered instant message template matches the regular payload."""
+    template = client.imessage.template(message="{greeting}!", fallback_when=["imessage_unsupported"])
+
+    body = template.render(to="+14155552671", variables={"greeting": "Hello"})
+
+    assert msgspec.json.decode(body) == {
+        "to": "+14155552671",
+        "message": "Hello!",
+        "fallback_when": ["imessage_unsupported"],
+    }
+
+
+def test_template_missing_variable(client: Contiguity) -> None:
+    """Test that rendering without a required variable fails."""
+    template = client.whatsapp.template(message="Hi {name}")
+    with pytest.raises(KeyError):
+        template.render(to="+14155552671")
+
+
+def test_template_positional_field(client: Contiguity) -> None:
+    """Test that positional fields are rejected."""
+    with pytest.raises(ValueError, match="positional fields"):
+        client.text.template(message="Hi {}")
+
+
+def test_email_message_encode() -> None:
+    """Test that a pre-encoded email message matches the regular payload."""
+    message = EmailMessage(from_="Contiguity", subject="News", body_html="<p>{not a field}</p>", bcc=["a@example.com"])
+
+    assert msgspec.json.decode(message.encode(to="ann@example.com")) == {
+        "to": "ann@example.com",
+        "from": "Contiguity",
+        "subject": "News",
+        "body": {"text": None, "html": "<p>{not a field}</p>"},
+        "bcc": ["a@example.com"],
+    }
+
+
+def test_email_message_immutable() -> None:
+    """Test that email messages cannot be modified after they are encoded."""
+    message = EmailMessage(from_="Contiguity", subject="News", body_text="Hello")
+    with pytest.raises(AttributeError, match="immutable"):
+        message.subject = "Other"
+    with pytest.raises(ValueError, match="body must be provided"):
+        EmailMessage(from_="Contiguity", subject="News")
+
+
+def test_email_send_message() -> None:
+    """Test sending a pre-encoded email message."""
+    client = MockApiClient(lambda _: api_response({"email_id": "email-1"}))
+    message = EmailMessage(from_="Contiguity", subject="News", body_text="Hello")
+
+    result = Email(client=client).send_message(message, to="ann@example.com")
+
+    assert result.email_id == "email-1"
+    assert client.requests[0].content == message.encode(to="ann@example.com")
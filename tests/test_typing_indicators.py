@@ -0,0 +1,126 @@
+import asyncio
+import threading
+from collections import Counter
+
+import httpx
+import msgspec
+import pytest
+
+from contiguity.imessage import IMessage
+from contiguity.typing_indicators import TypingCoalescer
+from tests import MockApiClient, api_response
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _typing_api(_: httpx.Request) -> httpx.Response:
+    return api_response({"status": "ok"})
+
+
+@pytest.fixture
+def client() -> MockApiClient:
+    return MockApiClient(_typing_api)
+
+
+def _actions(client: MockApiClient) -> Counter[tuple[str, str]]:
+    return Counter(
+        (payload["to"], payload["action"])
+        for payload in map(msgspec.json.decode, (r.content for r in client.requests))
+    )
+
+
+def test_typing_context_manager() -> None:
+    """Test that the indicator is refreshed while the block runs and stopped afterwards."""
+    refreshed = threading.Event()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if len(client.requests) >= 2:  # noqa: PLR2004
+            refreshed.set()
+        return _typing_api(request)
+
+    client = MockApiClient(handler)
+    with IMessage(client=client).typing(to="+14155552671", refresh_interval=0.001):
+        assert refreshed.wait(timeout=10)
+
+    actions = _actions(client)
+    assert actions["+14155552671", "start"] >= 2  # noqa: PLR2004
+    assert actions["+14155552671", "stop"] == 1
+    assert msgspec.json.decode(client.requests[-1].content)["action"] == "stop"
+
+
+def test_typing_context_manager_logs_stop_failures(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that a failure to stop the indicator is logged instead of replacing the block's exception."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if msgspec.json.decode(request.content)["action"] == "stop":
+            return api_response({"error": "unavailable", "status": 503}, status_code=503)
+        return _typing_api(request)
+
+    imessage = IMessage(client=MockApiClient(handler))
+
+    def reply() -> None:
+        with imessage.typing(to="+14155552671"):
+            msg = "reply failed"
+            raise RuntimeError(msg)
+
+    with pytest.raises(RuntimeError, match="reply failed"):
+        reply()
+
+    assert "failed to stop typing indicator" in caplog.text
+
+
+async def test_typing_coalescer() -> None:
+    """Test that many conversations are multiplexed and only refreshed once the interval has passed."""
+    refreshed = threading.Event()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if _actions(client)["+14155550000", "start"] >= 2:  # noqa: PLR2004
+            refreshed.set()
+        return _typing_api(request)
+
+    client = MockApiClient(handler)
+    imessage = IMessage(client=client)
+    clock = FakeClock()
+    coalescer = TypingCoalescer(refresh_interval=10, stop_delay=1, clock=clock)
+
+    async def reply(to: str) -> None:
+        for _ in range(5):
+            async with coalescer.typing(imessage, to=to):
+                await asyncio.sleep(0)
+
+    await asyncio.gather(*(reply(f"+1415555{i:04}") for i in range(10)))
+    async with coalescer.typing(imessage, to="+14155550000"):
+        clock.now += 10
+        # Starting another conversation wakes the background task, which refreshes the held one.
+        async with coalescer.typing(imessage, to="+14155550100"):
+            assert await asyncio.to_thread(refreshed.wait, 10)
+    await coalescer.aclose()
+
+    actions = _actions(client)
+    assert actions["+14155550000", "start"] == 2  # noqa: PLR2004
+    for i in range(1, 10):
+        assert actions[f"+1415555{i:04}", "start"] == 1
+    for i in range(10):
+        assert actions[f"+1415555{i:04}", "stop"] == 1
+
+
+async def test_typing_coalescer_drops_redundant_pairs(client: MockApiClient) -> None:
+    """Test that a start and stop with no await in between send nothing."""
+    imessage = IMessage(client=client)
+    coalescer = TypingCoalescer()
+
+    for _ in range(10):
+        coalescer.start(imessage, to="+14155552671")
+        coalescer.stop(imessage, to="+14155552671")
+    await asyncio.sleep(0.01)
+    await coalescer.aclose()
+
+    assert not client.requests
+    with pytest.raises(ValueError, match="not started"):
+        coalescer.stop(imessage, to="+14155552671")
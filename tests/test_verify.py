@@ -28,6 +28,21 @@ def test_verify_malformed_number(verify: Verify) -> None:
     assert verify.number("+1-415-555-2671-extra") is False
 
 
+def test_verify_allowed_regions() -> None:
+    """Test that numbers outside the allowed regions are rejected."""
+    verify = Verify(allowed_regions={"us", "GB"})
+    assert verify.number("+14155552671") is True
+    assert verify.number("+44 20 7946 0958") is True
+    assert verify.number("+49 30 901820") is False
+    assert verify.number("+4930901820") is False
+
+
+def test_verify_unknown_allowed_region() -> None:
+    """Test that unknown region codes are rejected."""
+    with pytest.raises(ValueError, match="unknown region code"):
+        Verify(allowed_regions={"XX"})
+
+
 def test_verify_valid_email(verify: Verify) -> None:
     """Test verifying valid email addresses."""
     assert verify.email("test@example.com") is True
@@ -52,3 +67,22 @@ def test_verify_edge_case_emails(verify: Verify) -> None:
     assert verify.email("user@@example.com") is False
     assert verify.email("user@.") is False
     assert verify.email("@") is False
+
+
+def test_verify_numbers_in_chunks(verify: Verify) -> None:
+    """Test validating many phone numbers in chunks."""
+    numbers = ["+14155552671", "invalid", "+14155552671", "+44 20 7946 0958", "1234"]
+    assert list(verify.numbers(iter(numbers), chunk_size=2)) == [b"\x01\x00", b"\x01\x01", b"\x00"]
+
+
+def test_verify_numbers_process_pool(verify: Verify) -> None:
+    """Test validating many phone numbers in a process pool."""
+    numbers = ["+14155552671", "invalid", "+49 30 901820"] * 10
+    results = b"".join(verify.numbers(numbers, chunk_size=4, max_workers=2))
+    assert list(results) == [verify.number(number) for number in numbers]
+
+
+def test_verify_emails_in_chunks(verify: Verify) -> None:
+    """Test validating many email addresses in chunks."""
+    emails = ["test@example.com", "invalid", "test@example.com"]
+    assert list(verify.emails(emails, chunk_size=2)) == [b"\x01\x00", b"\x01"]